@@ -0,0 +1,61 @@
+"""Compare being late certificates parser with the former one, built on BeautifulSoup and pd.read_html.
+
+Usage:
+    PYTHONPATH=src python benchmarks/being_late_certificates_parser.py
+"""
+import json
+import pathlib
+import timeit
+
+import pandas as pd
+from bs4 import BeautifulSoup
+from pydantic import parse_obj_as
+
+import models
+from core.config import ROOT_PATH
+from services.parsers.html import BeingLateCertificatesParser
+
+ITERATIONS = 200
+HTML_FILES_PATH = pathlib.Path.joinpath(ROOT_PATH, 'tests', 'test_parsers', 'html')
+FIXTURES = (
+    ('no_being_late_certificates.html', None),
+    ('single_unit_being_late_certificates.html', 389),
+    ('multiple_being_late_certificates.html', None),
+)
+
+
+def parse_with_pandas(html: str, request_unit_id: int, units: list[models.UnitIdAndName]) -> list[tuple[int, int]]:
+    """Former parser: soup is built to find message of empty page, then the page is parsed again by pandas."""
+    if 'данные не найдены' in BeautifulSoup(html, 'lxml').text.strip().lower():
+        return []
+    df = pd.read_html(html)[1]
+    if len(df.columns) == 7:
+        return [(request_unit_id, len(df.index))]
+    unit_name_to_unit = {unit.name: unit for unit in units}
+    return [(unit_name_to_unit[unit_name].id, len(group.index)) for unit_name, group in df.groupby('Пиццерия')]
+
+
+def parse(html: str, request_unit_id: int, units: list[models.UnitIdAndName]) -> list[tuple[int, int]]:
+    return [
+        (unit.unit_id, unit.being_late_certificates_count)
+        for unit in BeingLateCertificatesParser(html, request_unit_id, units).parse()
+    ]
+
+
+def main():
+    with open(ROOT_PATH / 'tests' / 'units.json', encoding='utf-8') as file:
+        units = parse_obj_as(list[models.UnitIdAndName], json.load(file))
+    print(f'{"fixture":<44}{"former, us":>12}{"one pass, us":>14}')
+    for file_name, request_unit_id in FIXTURES:
+        with open(HTML_FILES_PATH / file_name, encoding='utf-8') as file:
+            html = file.read()
+        assert parse(html, request_unit_id, units) == parse_with_pandas(html, request_unit_id, units)
+        times = [
+            timeit.timeit(lambda: func(html, request_unit_id, units), number=ITERATIONS) / ITERATIONS * 1e6
+            for func in (parse_with_pandas, parse)
+        ]
+        print(f'{file_name:<44}{times[0]:>12.1f}{times[1]:>14.1f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,118 @@
+"""Compare cache codecs with pickle: bytes per entry, encode and decode time.
+
+Usage:
+    PYTHONPATH=src python benchmarks/cache_codecs.py
+"""
+import pickle
+import random
+import timeit
+import uuid
+from datetime import datetime, timedelta
+from typing import Any
+
+import pandas as pd
+
+import models
+from db import codecs
+from services.api.dodo_is_api.restaurant_orders import to_unit_restaurant_orders
+from services.convert_models.orders import restaurant_orders_to_bonus_system_statistics
+
+ITERATIONS = 2000
+
+
+def build_samples() -> tuple[dict[str, Any], tuple[str, pd.DataFrame]]:
+    operational_statistics = {
+        'stationaryRevenue': 35400, 'stationaryOrderCount': 41, 'deliveryRevenue': 61200,
+        'deliveryOrderCount': 52, 'revenue': 96600, 'orderCount': 93, 'avgCheck': 1038.7,
+    }
+    orders_count = 300
+    started_at = datetime(2022, 7, 13, 9)
+    restaurant_orders = pd.DataFrame({
+        'Отдел': ['Москва 4-1'] * orders_count,
+        '№ заказа': [f'{i}-{random.randint(1, 9)}' for i in range(orders_count)],
+        'Дата и время': [(started_at + timedelta(minutes=3 * i)).strftime('%d.%m.%Y %H:%M')
+                         for i in range(orders_count)],
+        '№ телефона': [f'7999{random.randint(1000000, 9999999)}' if random.random() > 0.4 else None
+                       for _ in range(orders_count)],
+        'Сумма': [float(random.randint(300, 3000)) for _ in range(orders_count)],
+        'Тип заказа': [random.choice(('Самовывоз', 'Ресторан')) for _ in range(orders_count)],
+        'Сотрудник': [random.choice(('Иванов И.', 'Петров П.', 'Сидоров С.')) for _ in range(orders_count)],
+    })
+    unit_name, group = next(iter(restaurant_orders.groupby('Отдел')))
+    return {
+        'kitchen_statistics@389': models.KitchenWorkPartial(
+            unit_id=389,
+            revenue={'per_hour': 5400, 'delta_from_week_before': 12},
+            product_spending={'per_hour': 3.5, 'delta_from_week_before': -4},
+            average_cooking_time=421,
+            tracking={'postponed': 0, 'in_queue': 2, 'in_work': 5},
+        ),
+        'delivery_statistics@389': models.DeliveryWorkPartial(
+            unit_id=389,
+            performance={'orders_for_courier_count_per_hour_today': 2.1,
+                         'orders_for_courier_count_per_hour_week_before': 1.8, 'delta_from_week_before': 16},
+            heated_shelf={'orders_count': 1, 'orders_awaiting_time': 321},
+            couriers={'in_queue_count': 4, 'total_count': 9},
+        ),
+        f'private_delivery_statistics@{uuid.uuid4().hex}@2022-07-13T00:00:00': models.UnitDeliveryStatisticsExtended(
+            unitId=uuid.uuid4(), unitName='Москва 4-1', avgCookingTime=421, avgDeliveryOrderFulfillmentTime=1900,
+            avgHeatedShelfTime=120, avgOrderTripTime=700, couriersShiftsDuration=86400, deliveryOrdersCount=120,
+            deliverySales=240000, lateOrdersCount=3, ordersWithCourierAppCount=110, tripsCount=80,
+            tripsDuration=56000, orders_for_courier_count_per_hour=5.0, delivery_with_courier_app_percent=91.67,
+            couriers_workload=64.81,
+        ),
+        'operational_statistics@389': models.UnitOperationalStatisticsForTodayAndWeekBefore(
+            unitId=389, date=datetime(2022, 7, 13), today=operational_statistics,
+            weekBefore=operational_statistics, yesterdayToThisTime=operational_statistics,
+            yesterday=operational_statistics, weekBeforeToThisTime=operational_statistics,
+        ),
+        'being_late_certificates_today@389': models.UnitBeingLateCertificates(
+            unit_id=389, unit_name='Москва 4-1', being_late_certificates_count=2),
+        'restaurant_orders@389': to_unit_restaurant_orders(
+            unit_name,
+            numbers=group['№ заказа'].tolist(),
+            created_at=group['Дата и время'].tolist(),
+            phone_numbers=group['№ телефона'].fillna('').tolist(),
+        ),
+    }, (unit_name, group)
+
+
+def measure(encode, decode, value) -> tuple[int, float, float]:
+    obj_bytes = encode(value)
+    encode_time = timeit.timeit(lambda: encode(value), number=ITERATIONS) / ITERATIONS
+    decode_time = timeit.timeit(lambda: decode(obj_bytes), number=ITERATIONS) / ITERATIONS
+    return len(obj_bytes), encode_time * 1e6, decode_time * 1e6
+
+
+def main():
+    print(f'{"dataset":<36}{"codec":<10}{"bytes":>10}{"encode, us":>14}{"decode, us":>14}')
+    samples, restaurant_orders_group = build_samples()
+    for name, value in samples.items():
+        dataset = name.split('@', 1)[0]
+        # Restaurant orders used to be cached as pickled group of DataFrame with all report columns.
+        pickled_value = restaurant_orders_group if dataset == 'restaurant_orders' else value
+        results = {
+            'pickle': measure(pickle.dumps, pickle.loads, pickled_value),
+            'codec': measure(
+                lambda obj: codecs.encode(name, obj, created_at=0, fresh_until=0),
+                lambda obj_bytes: codecs.decode(name, obj_bytes),
+                value,
+            ),
+        }
+        for codec_name, (size, encode_time, decode_time) in results.items():
+            print(f'{dataset:<36}{codec_name:<10}{size:>10}{encode_time:>14.1f}{decode_time:>14.1f}')
+
+    name = 'restaurant_orders@389'
+    obj_bytes = codecs.encode(name, samples[name], created_at=0, fresh_until=0)
+    pickled_group = pickle.dumps(restaurant_orders_group)
+    # Bonus system statistics of the old DataFrame group, as converted before.
+    old_convert_time = timeit.timeit(lambda: (lambda df: len(df[df['№ телефона'].notnull()].index))(
+        pickle.loads(pickled_group)[1]), number=ITERATIONS) / ITERATIONS
+    new_convert_time = timeit.timeit(lambda: restaurant_orders_to_bonus_system_statistics(
+        [codecs.decode(name, obj_bytes)[0]]), number=ITERATIONS) / ITERATIONS
+    print(f'bonus system statistics from cache: pickle {old_convert_time * 1e6:.1f} us, '
+          f'codec {new_convert_time * 1e6:.1f} us')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,124 @@
+"""Compare HTTP/1.1 and HTTP/2 on fan-out of 100 parallel requests to one host.
+
+Stand-in upstream is a local hypercorn server with self-signed certificate,
+which answers after a delay like public API answers operational statistics.
+Server counts TLS connections by client port.
+
+Usage:
+    PYTHONPATH=src python benchmarks/http2_fan_out.py
+"""
+import asyncio
+import os
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import httpx
+
+from services.api.http_clients import HTTPClients
+
+UNITS_COUNT = 100
+BATCHES_COUNT = 20
+PORT = 8443
+BASE_URL = f'https://localhost:{PORT}'
+
+client_ports: set[int] = set()
+
+
+async def app(scope, receive, send):
+    """Stand-in upstream application served by hypercorn."""
+    if scope['type'] != 'http':
+        return
+    if scope['path'] == '/connections':
+        body = str(len(client_ports)).encode()
+        client_ports.clear()
+    else:
+        client_ports.add(scope['client'][1])
+        await asyncio.sleep(random.uniform(0.02, 0.06))
+        body = b'{"unitId": 389, "revenue": 96600, "orderCount": 93}'
+    await send({'type': 'http.response.start', 'status': 200, 'headers': [(b'content-type', b'application/json')]})
+    await send({'type': 'http.response.body', 'body': body})
+
+
+def generate_certificate(directory: Path) -> tuple[Path, Path]:
+    cert_path, key_path = directory / 'cert.pem', directory / 'key.pem'
+    subprocess.run(
+        ['openssl', 'req', '-x509', '-newkey', 'rsa:2048', '-nodes', '-days', '1', '-subj', '/CN=localhost',
+         '-addext', 'subjectAltName=DNS:localhost', '-keyout', key_path, '-out', cert_path],
+        check=True, capture_output=True,
+    )
+    return cert_path, key_path
+
+
+def start_server(cert_path: Path, key_path: Path) -> subprocess.Popen:
+    server = subprocess.Popen(
+        [sys.executable, '-m', 'hypercorn', '--bind', f'localhost:{PORT}', '--certfile', cert_path,
+         '--keyfile', key_path, '--workers', '1', 'http2_fan_out:app'],
+        cwd=Path(__file__).parent,
+        env=os.environ | {'PYTHONPATH': os.pathsep.join(map(os.path.abspath, sys.path[1:]))},
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    for _ in range(100):
+        try:
+            httpx.get(f'{BASE_URL}/connections', verify=str(cert_path))
+            return server
+        except httpx.TransportError:
+            time.sleep(0.1)
+    server.kill()
+    raise RuntimeError('Stand-in server has not started')
+
+
+async def run_batches(http2: bool) -> tuple[list[float], list[float], int, str]:
+    http_clients = HTTPClients(limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+                               timeout=30, max_concurrent_requests=UNITS_COUNT, http2=http2)
+    client = http_clients.get(BASE_URL)
+    latencies: list[float] = []
+    batch_durations: list[float] = []
+    http_version = ''
+
+    async def request(unit_id: int):
+        nonlocal http_version
+        started_at = time.perf_counter()
+        response = await client.get(f'/api/v1/OperationalStatisticsForTodayAndWeekBefore/{unit_id}')
+        latencies.append(time.perf_counter() - started_at)
+        http_version = response.http_version
+
+    for _ in range(BATCHES_COUNT):
+        started_at = time.perf_counter()
+        await asyncio.gather(*(request(unit_id) for unit_id in range(UNITS_COUNT)))
+        batch_durations.append(time.perf_counter() - started_at)
+    await http_clients.close()
+    connections_count = int(httpx.get(f'{BASE_URL}/connections').text)
+    return latencies, batch_durations, connections_count, http_version
+
+
+def percentile(values: list[float], percent: int) -> float:
+    return statistics.quantiles(values, n=100)[percent - 1] * 1000
+
+
+def main():
+    with tempfile.TemporaryDirectory() as directory:
+        cert_path, key_path = generate_certificate(Path(directory))
+        os.environ['SSL_CERT_FILE'] = str(cert_path)
+        server = start_server(cert_path, key_path)
+        try:
+            httpx.get(f'{BASE_URL}/connections')
+            print(f'{UNITS_COUNT} parallel requests x {BATCHES_COUNT} batches')
+            print(f'{"protocol":<10}{"connections":>12}{"p50, ms":>10}{"p95, ms":>10}{"p99, ms":>10}'
+                  f'{"batch p50, ms":>15}{"batch max, ms":>15}')
+            for http2 in (False, True):
+                latencies, batch_durations, connections_count, http_version = asyncio.run(run_batches(http2))
+                print(f'{http_version:<10}{connections_count:>12}{percentile(latencies, 50):>10.1f}'
+                      f'{percentile(latencies, 95):>10.1f}{percentile(latencies, 99):>10.1f}'
+                      f'{statistics.median(batch_durations) * 1000:>15.1f}{max(batch_durations) * 1000:>15.1f}')
+        finally:
+            server.terminate()
+            server.wait()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,84 @@
+"""Compare order by UUID parser with the former one, which built soup of the whole page.
+
+Order page fixture is wrapped into navigation menu, order composition and scripts,
+so that it has the size of a real shift manager page.
+
+Usage:
+    PYTHONPATH=src python benchmarks/order_by_uuid_parser.py
+"""
+import pathlib
+import timeit
+import uuid
+
+from bs4 import BeautifulSoup
+
+import models
+from core.config import ROOT_PATH
+from services.parsers.html import OrderByUUIDParser
+
+ITERATIONS = 200
+ORDER_UUID = uuid.UUID('0a1b2c3d-4e5f-6789-abcd-ef0123456789')
+HTML_FILES_PATH = pathlib.Path.joinpath(ROOT_PATH, 'tests', 'test_parsers', 'html')
+
+
+def build_page() -> str:
+    with open(HTML_FILES_PATH / 'order_by_uuid.html', encoding='utf-8') as file:
+        order = file.read()
+    menu = ''.join(
+        f'<li class="menu_item"><a href="/Managment/Section{i}">'
+        f'<span class="icon icon-{i}"></span>Раздел {i}</a></li>'
+        for i in range(150)
+    )
+    composition = ''.join(
+        f'<tr><td><div class="product"><span>Продукт {i}</span></div></td><td>1</td><td>{100 + i}</td></tr>'
+        for i in range(40)
+    )
+    script = '<script>var orderData = {%s};</script>' % ', '.join(f'"field{i}": {i}' for i in range(2000))
+    return (
+        f'<html><head><title>Заказ</title></head><body><nav><ul>{menu}</ul></nav>'
+        f'{order}<div id="composition-details"><table>{composition}</table></div>{script}</body></html>'
+    )
+
+
+def parse_with_soup(html: str) -> models.OrderByUUID:
+    """Former parser: soup of the whole page, history is walked twice."""
+    soup = BeautifulSoup(html, 'lxml')
+    order_no = soup.find('span', id='orderNumber').text
+    department = soup.find('div', class_='headerDepartment').text
+    trs = soup.find('div', id='history').find_all('tr')[1:]
+    order_created_at = receipt_printed_at = None
+    is_receipt_printed = False
+    for tr in trs:
+        _, msg, _ = tr.find_all('td')
+        if 'закрыт чек на возврат' in msg.text.lower().strip():
+            is_receipt_printed = True
+            break
+    for tr in trs:
+        dt, msg, _ = tr.find_all('td')
+        msg = msg.text.lower().strip()
+        if 'has been accepted' in msg:
+            order_created_at = dt.text
+        elif 'has been rejected' in msg and is_receipt_printed:
+            receipt_printed_at = dt.text
+    return models.OrderByUUID(
+        number=order_no, unit_name=department, created_at=order_created_at, receipt_printed_at=receipt_printed_at,
+        uuid=ORDER_UUID, price=789, type='Доставка',
+    )
+
+
+def main():
+    html = build_page()
+    parsers = {
+        'former, soup of whole page': parse_with_soup,
+        'subtrees only': lambda page: OrderByUUIDParser(page, ORDER_UUID, 789, 'Доставка').parse(),
+    }
+    expected = parse_with_soup(html)
+    print(f'page of {len(html)} characters')
+    for name, parse in parsers.items():
+        assert parse(html) == expected
+        parse_time = timeit.timeit(lambda: parse(html), number=ITERATIONS) / ITERATIONS
+        print(f'{name:<30}{parse_time * 1e6:>10.1f} us')
+
+
+if __name__ == '__main__':
+    main()
@@ -1,7 +1,16 @@
+import math
+
 from fastapi import FastAPI
 from fastapi.responses import JSONResponse
 
 import endpoints
+from core.config import app_settings
+from db import redis_db
+from middlewares import ResponseAgeMiddleware
+from services.api.http_clients import http_clients
+from services.api.transports import CircuitOpenError
+from services.cache_warmer import cache_warmer
+from services.parse_executor import parse_executor
 from utils import exceptions
 
 __all__ = (
@@ -9,6 +18,7 @@ __all__ = (
 )
 
 app = FastAPI()
+app.add_middleware(ResponseAgeMiddleware)
 app.include_router(endpoints.v2.statistics.router)
 app.include_router(endpoints.v1.statistics.router)
 app.include_router(endpoints.v1.canceled_orders.router)
@@ -17,8 +27,35 @@ app.include_router(endpoints.v2.stop_sales.router)
 app.include_router(endpoints.v1.stop_sales.router)
 app.include_router(endpoints.v1.stocks.router)
 app.include_router(endpoints.ping.router)
+app.include_router(endpoints.monitoring.router)
 
 
 @app.exception_handler(exceptions.PrivateDodoAPIError)
 async def on_private_dodo_api_error(request, exc: exceptions.PrivateDodoAPIError):
     return JSONResponse({'error': 'error'}, status_code=exc.status_code)
+
+
+@app.exception_handler(CircuitOpenError)
+async def on_circuit_open_error(request, exc: CircuitOpenError):
+    return JSONResponse(
+        {'error': 'Upstream is unavailable'},
+        status_code=503,
+        headers={'Retry-After': str(math.ceil(exc.retry_after))},
+    )
+
+
+@app.on_event('startup')
+async def on_startup():
+    http_clients.start()
+    if app_settings.is_parse_executor_enabled:
+        parse_executor.start()
+    if app_settings.is_cache_warmer_enabled:
+        cache_warmer.start()
+
+
+@app.on_event('shutdown')
+async def on_shutdown():
+    await cache_warmer.stop()
+    await http_clients.close()
+    await parse_executor.close()
+    await redis_db.close_redis_connection()
@@ -1,7 +1,8 @@
 import pathlib
+from typing import Literal
 
 from dotenv import load_dotenv
-from pydantic import BaseSettings, Field
+from pydantic import BaseSettings, Field, PositiveInt, PositiveFloat, NonNegativeInt
 
 __all__ = (
     'app_settings',
@@ -20,6 +21,139 @@ class AppSettings(BaseSettings):
     host: str = Field(..., env='APP_HOST')
     is_debug: bool = Field(..., env='IS_DEBUG')
     redis_url: str = Field(..., env='REDIS_URL')
+    default_cache_ttl: PositiveInt = Field(60, env='DEFAULT_CACHE_TTL')
+    cache_ttl: dict[str, PositiveInt] = Field(
+        {
+            'kitchen_statistics': 30,
+            'delivery_statistics': 60,
+            'private_delivery_statistics': 60,
+            'operational_statistics': 60,
+            'restaurant_orders': 60,
+            'restaurant_orders_archive': 7 * 24 * 60 * 60,
+            'being_late_certificates_today': 60,
+            'being_late_certificates_week_before': 6 * 60 * 60,
+        },
+        env='CACHE_TTL',
+        description='Expiration time in seconds by dataset prefix of cache key',
+    )
+    cache_stale_ttl: dict[str, NonNegativeInt] = Field(
+        {
+            'kitchen_statistics': 5 * 60,
+            'delivery_statistics': 5 * 60,
+            'private_delivery_statistics': 5 * 60,
+            'operational_statistics': 5 * 60,
+            'restaurant_orders': 5 * 60,
+        },
+        env='CACHE_STALE_TTL',
+        description=(
+            'Time in seconds by dataset prefix of cache key, during which expired object'
+            ' is still served while being refreshed in background'
+        ),
+    )
+    local_cache_ttl: PositiveInt = Field(5, env='LOCAL_CACHE_TTL')
+    local_cache_max_entries: PositiveInt = Field(10_000, env='LOCAL_CACHE_MAX_ENTRIES')
+    local_cache_max_bytes: PositiveInt = Field(64 * 1024 * 1024, env='LOCAL_CACHE_MAX_BYTES')
+    fetch_lock_lease_time: PositiveFloat = Field(30, env='FETCH_LOCK_LEASE_TIME')
+    fetch_lock_wait_timeout: PositiveFloat = Field(5, env='FETCH_LOCK_WAIT_TIMEOUT')
+    http_timeout: PositiveFloat = Field(30, env='HTTP_TIMEOUT')
+    http_max_connections_per_host: PositiveInt = Field(100, env='HTTP_MAX_CONNECTIONS_PER_HOST')
+    http_max_keepalive_connections_per_host: PositiveInt = Field(20, env='HTTP_MAX_KEEPALIVE_CONNECTIONS_PER_HOST')
+    http_keepalive_expiry: PositiveFloat = Field(30, env='HTTP_KEEPALIVE_EXPIRY')
+    http_max_concurrent_requests_per_host: PositiveInt = Field(20, env='HTTP_MAX_CONCURRENT_REQUESTS_PER_HOST')
+    http_max_concurrent_requests: dict[str, PositiveInt] = Field(
+        {
+            'publicapi.dodois.io': 50,
+        },
+        env='HTTP_MAX_CONCURRENT_REQUESTS',
+        description='Max number of requests in flight by upstream host, shared by all requests to the app',
+    )
+    is_http2_enabled: bool = Field(
+        False,
+        env='IS_HTTP2_ENABLED',
+        description='Multiplex requests to upstream hosts supporting HTTP/2 over few connections',
+    )
+    private_dodo_api_shard_size: PositiveInt = Field(
+        30,
+        env='PRIVATE_DODO_API_SHARD_SIZE',
+        description='Max number of units per request to private Dodo API, larger unit lists are requested by shards',
+    )
+    orders_handover_time_overlap: PositiveInt = Field(
+        60 * 60,
+        env='ORDERS_HANDOVER_TIME_OVERLAP',
+        description=(
+            'Time in seconds before the last fetch, from which orders handover time is fetched again,'
+            ' so that orders handed over after tracking start are not missed'
+        ),
+    )
+    pagination_window: PositiveInt = Field(
+        4,
+        env='PAGINATION_WINDOW',
+        description='Number of pages of paginated report requested concurrently',
+    )
+    html_parser_backend: Literal['beautifulsoup', 'lxml'] = Field(
+        'beautifulsoup',
+        env='HTML_PARSER_BACKEND',
+        description='Library used to parse office manager pages, lxml is several times faster',
+    )
+    is_parse_executor_enabled: bool = Field(True, env='IS_PARSE_EXECUTOR_ENABLED')
+    parse_executor_max_workers: PositiveInt = Field(2, env='PARSE_EXECUTOR_MAX_WORKERS')
+    parse_executor_queue_size: NonNegativeInt = Field(
+        16,
+        env='PARSE_EXECUTOR_QUEUE_SIZE',
+        description='Number of pages waiting for free worker process, beyond which parsing waits for a slot',
+    )
+    parse_executor_inline_threshold: NonNegativeInt = Field(
+        64 * 1024,
+        env='PARSE_EXECUTOR_INLINE_THRESHOLD',
+        description='Length of page in characters, below which it is parsed in event loop process',
+    )
+    is_circuit_breaker_enabled: bool = Field(True, env='IS_CIRCUIT_BREAKER_ENABLED')
+    circuit_breaker_failure_rate_threshold: float = Field(
+        0.5,
+        gt=0,
+        le=1,
+        env='CIRCUIT_BREAKER_FAILURE_RATE_THRESHOLD',
+        description='Share of failed requests to upstream host within window, at which its circuit opens',
+    )
+    circuit_breaker_min_calls: PositiveInt = Field(
+        10,
+        env='CIRCUIT_BREAKER_MIN_CALLS',
+        description='Min number of requests within window, so that failure rate is considered',
+    )
+    circuit_breaker_window: PositiveFloat = Field(60, env='CIRCUIT_BREAKER_WINDOW')
+    circuit_breaker_open_time: PositiveFloat = Field(
+        15,
+        env='CIRCUIT_BREAKER_OPEN_TIME',
+        description='Time in seconds during which open circuit rejects requests before probing upstream host',
+    )
+    upstream_retry_max_attempts: PositiveInt = Field(3, env='UPSTREAM_RETRY_MAX_ATTEMPTS')
+    upstream_retry_base_delay: PositiveFloat = Field(0.5, env='UPSTREAM_RETRY_BASE_DELAY')
+    upstream_retry_max_delay: PositiveFloat = Field(5, env='UPSTREAM_RETRY_MAX_DELAY')
+    upstream_retry_max_total_delay: PositiveFloat = Field(
+        10,
+        env='UPSTREAM_RETRY_MAX_TOTAL_DELAY',
+        description='Max time in seconds spent waiting between retries of one batch, including Retry-After',
+    )
+    canceled_orders_workers_count: PositiveInt = Field(
+        20,
+        env='CANCELED_ORDERS_WORKERS_COUNT',
+        description='Number of canceled orders whose details are fetched concurrently by one request',
+    )
+    canceled_orders_queue_size: PositiveInt = Field(100, env='CANCELED_ORDERS_QUEUE_SIZE')
+    is_cache_warmer_enabled: bool = Field(True, env='IS_CACHE_WARMER_ENABLED')
+    cache_warmer_max_concurrency: PositiveInt = Field(4, env='CACHE_WARMER_MAX_CONCURRENCY')
+    cache_warmer_idle_timeout: PositiveFloat = Field(
+        10 * 60,
+        env='CACHE_WARMER_IDLE_TIMEOUT',
+        description='Time in seconds since last request after which unit set is no longer warmed up',
+    )
+    cache_warmer_refresh_ahead_ratio: float = Field(
+        0.25,
+        gt=0,
+        lt=1,
+        env='CACHE_WARMER_REFRESH_AHEAD_RATIO',
+        description='Part of expiration time before soft expiry, during which warmer refreshes object',
+    )
 
 
 app_settings = AppSettings()
@@ -1,18 +1,378 @@
-import pickle
-from typing import Any
+import asyncio
+import logging
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any, Iterable, Mapping, Callable, Awaitable, TypeVar
 
-from db import redis_db
+from core.config import app_settings
+from db import redis_db, codecs
+from db.local_cache import local_cache
+from db.locks import FetchLease, acquire_fetch_leases, get_leased_names, release_fetch_leases, set_with_fetch_leases
 from utils import exceptions
 
+__all__ = (
+    'CacheEntry',
+    'ResponseAge',
+    'response_age',
+    'refresh_ahead_time',
+    'get_expire_time',
+    'get_stale_time',
+    'set_in_cache',
+    'get_from_cache',
+    'set_many',
+    'get_many',
+    'get_entries_many',
+    'get_entries_from_redis',
+    'get_or_fetch_many',
+)
 
-async def set_in_cache(name: str, value: Any, expire_time: int = 60):
-    obj_bytes = pickle.dumps(value)
-    await redis_db.connection.set(name, obj_bytes)
-    await redis_db.connection.expire(name, expire_time)
+logger = logging.getLogger(__name__)
+
+K = TypeVar('K')
+
+
+@dataclass(frozen=True, slots=True)
+class CacheEntry:
+    """Cached object with its freshness.
+
+    Entry is fresh until ``fresh_until`` (soft expiry), and then may be served stale
+    until the key expires in Redis (hard expiry).
+    """
+    value: Any
+    created_at: float
+    fresh_until: float
+
+    @property
+    def age(self) -> float:
+        return max(time.time() - self.created_at, 0)
+
+    @property
+    def is_stale(self) -> bool:
+        return time.time() >= self.fresh_until
+
+
+class ResponseAge:
+    """Age of the oldest cached object used to build the current response."""
+
+    def __init__(self):
+        self.max_age: float | None = None
+
+    def record(self, age: float):
+        if self.max_age is None or age > self.max_age:
+            self.max_age = age
+
+
+response_age: ContextVar[ResponseAge | None] = ContextVar('response_age', default=None)
+
+# Entries expiring in that many seconds are refreshed before returning, instead of in background.
+# Set by cache warmer, so that entries never become stale for user requests.
+refresh_ahead_time: ContextVar[float] = ContextVar('refresh_ahead_time', default=0)
+
+# Names of keys being refreshed in background by this worker.
+refreshing_names: set[str] = set()
+refresh_tasks: set[asyncio.Task] = set()
+
+
+def get_expire_time(name: str) -> int:
+    """Get expiration time of key by its dataset prefix.
+
+    Args:
+        name: Cache key in ``{dataset}@{...}`` format.
+
+    Returns:
+        Expiration time in seconds from ``app_settings.cache_ttl``
+        or ``app_settings.default_cache_ttl`` for unknown datasets.
+    """
+    dataset = name.split('@', 1)[0]
+    return app_settings.cache_ttl.get(dataset, app_settings.default_cache_ttl)
+
+
+def get_stale_time(name: str) -> int:
+    """Get time in seconds during which expired object still may be served
+    while being refreshed in background. Zero for datasets without stale-while-revalidate.
+    """
+    dataset = name.split('@', 1)[0]
+    return app_settings.cache_stale_ttl.get(dataset, 0)
+
+
+async def set_in_cache(name: str, value: Any, expire_time: int | None = None):
+    await set_many({name: value}, expire_time)
 
 
 async def get_from_cache(name: str) -> Any:
-    obj_bytes = await redis_db.connection.get(name)
-    if obj_bytes is None:
+    try:
+        return (await get_many([name]))[name]
+    except KeyError:
         raise exceptions.DoesNotExistInCache(key=name)
-    return pickle.loads(obj_bytes)
+
+
+async def set_many(
+        name_to_value: Mapping[str, Any],
+        expire_time: int | None = None,
+        leases: Mapping[str, FetchLease] | None = None,
+):
+    """Store several objects in one pipelined round trip.
+    Objects are also put in the in-process cache.
+
+    Args:
+        name_to_value: Mapping of cache keys to objects.
+        expire_time: Expiration time of every key in seconds.
+                     Taken from the dataset policy of each key unless specified.
+                     Key is kept in Redis for the stale time of its dataset longer.
+        leases: Fetch leases of keys. Keys with lease are written only if the lease is still held,
+                so that a worker whose lease has expired doesn't overwrite a newer object.
+    """
+    if not name_to_value:
+        return
+    leases = leases or {}
+    now = time.time()
+    name_to_entry: dict[str, CacheEntry] = {}
+    name_to_obj_bytes: dict[str, bytes] = {}
+    name_to_hard_expire_time: dict[str, int] = {}
+    for name, value in name_to_value.items():
+        key_expire_time = expire_time or get_expire_time(name)
+        entry = CacheEntry(value=value, created_at=now, fresh_until=now + key_expire_time)
+        name_to_entry[name] = entry
+        name_to_obj_bytes[name] = codecs.encode(name, value, created_at=entry.created_at, fresh_until=entry.fresh_until)
+        name_to_hard_expire_time[name] = key_expire_time + get_stale_time(name)
+
+    names_to_set = [name for name in name_to_value if name not in leases]
+    written_names = await set_with_fetch_leases(
+        {name: name_to_obj_bytes[name] for name in name_to_value if name in leases},
+        leases, name_to_hard_expire_time)
+    if names_to_set:
+        async with redis_db.connection.pipeline(transaction=False) as pipeline:
+            for name in names_to_set:
+                pipeline.set(name, name_to_obj_bytes[name], ex=name_to_hard_expire_time[name])
+            await pipeline.execute()
+        written_names.update(names_to_set)
+
+    for name in written_names:
+        local_cache.set(name, name_to_entry[name], size=len(name_to_obj_bytes[name]),
+                        expire_time=name_to_hard_expire_time[name])
+
+
+async def get_many(names: Iterable[str]) -> dict[str, Any]:
+    """Get several objects, including stale ones.
+
+    Args:
+        names: Cache keys.
+
+    Returns:
+        Mapping of found keys to objects. Missing keys are omitted.
+    """
+    return {name: entry.value for name, entry in (await get_entries_many(names)).items()}
+
+
+async def get_entries_many(names: Iterable[str]) -> dict[str, CacheEntry]:
+    """Get several entries from the in-process cache,
+    and the rest of them from Redis with a single round trip.
+
+    Args:
+        names: Cache keys.
+
+    Returns:
+        Mapping of found keys to entries. Missing keys are omitted.
+    """
+    name_to_entry: dict[str, CacheEntry] = {}
+    names_to_get_from_redis: list[str] = []
+    for name in names:
+        try:
+            name_to_entry[name] = local_cache.get(name)
+        except KeyError:
+            names_to_get_from_redis.append(name)
+    return name_to_entry | await get_entries_from_redis(names_to_get_from_redis)
+
+
+async def get_entries_from_redis(names: Iterable[str]) -> dict[str, CacheEntry]:
+    """Get several entries from Redis with a single round trip, bypassing the in-process cache.
+    Found entries are put in the in-process cache.
+
+    Args:
+        names: Cache keys.
+
+    Returns:
+        Mapping of found keys to entries. Missing keys are omitted.
+    """
+    names = list(names)
+    if not names:
+        return {}
+
+    async with redis_db.connection.pipeline(transaction=False) as pipeline:
+        pipeline.mget(names)
+        for name in names:
+            pipeline.pttl(name)
+        objs_bytes, *names_ttl_in_ms = await pipeline.execute()
+
+    name_to_entry: dict[str, CacheEntry] = {}
+    for name, obj_bytes, ttl_in_ms in zip(names, objs_bytes, names_ttl_in_ms):
+        if obj_bytes is None:
+            continue
+        try:
+            value, created_at, fresh_until = codecs.decode(name, obj_bytes)
+        except ValueError:
+            # Entry written by another schema version is treated as missing.
+            logger.warning('Could not decode cached object', exc_info=True)
+            continue
+        entry = CacheEntry(value=value, created_at=created_at, fresh_until=fresh_until)
+        name_to_entry[name] = entry
+        # Negative TTL means that key has expired in between or has no expiration.
+        if ttl_in_ms > 0:
+            local_cache.set(name, entry, size=len(obj_bytes), expire_time=ttl_in_ms / 1000)
+    return name_to_entry
+
+
+async def wait_for_many(names: Iterable[str], timeout: float) -> dict[str, Any]:
+    """Poll cache until all keys are filled by another worker or timeout expires.
+
+    Keys whose leases have been released without filling them, e.g. since fetch has failed,
+    are not waited for any longer.
+
+    Returns:
+        Mapping of keys filled in time to objects.
+    """
+    names = set(names)
+    name_to_value: dict[str, Any] = {}
+    deadline = time.monotonic() + timeout
+    delay = 0.05
+    while names and time.monotonic() < deadline:
+        await asyncio.sleep(min(delay, max(deadline - time.monotonic(), 0)))
+        # Leases are read before keys, since key is filled before its lease is released.
+        leased_names = await get_leased_names(names)
+        filled = await get_many(names)
+        name_to_value |= filled
+        names -= filled.keys()
+        names &= leased_names
+        delay = min(delay * 2, 0.5)
+    return name_to_value
+
+
+async def refresh_many(
+        id_to_name: Mapping[K, str],
+        fetch: Callable[[list[K]], Awaitable[Mapping[str, Any]]],
+):
+    """Fetch and cache objects whose leases this worker has managed to acquire.
+    Keys being refreshed by another worker are skipped, and so are keys
+    that have already been refreshed by another worker while this one saw them stale in its in-process cache.
+    """
+    leases = await acquire_fetch_leases(id_to_name.values(), app_settings.fetch_lock_lease_time)
+    try:
+        leased_id_to_name = {id_: name for id_, name in id_to_name.items() if name in leases}
+        refreshed = await get_refreshed_entries(leased_id_to_name.values())
+        ids_to_fetch = [id_ for id_, name in leased_id_to_name.items() if name not in refreshed]
+        if ids_to_fetch:
+            await set_many(await fetch(ids_to_fetch), leases=leases)
+    finally:
+        await release_fetch_leases(leases.values())
+
+
+async def get_refreshed_entries(names: Iterable[str]) -> dict[str, CacheEntry]:
+    """Re-read keys from Redis after their leases have been acquired.
+
+    Returns:
+        Entries that don't need to be fetched: fresh ones,
+        beyond ``refresh_ahead_time`` when warming up.
+    """
+    refresh_from = time.time() + refresh_ahead_time.get()
+    return {name: entry for name, entry in (await get_entries_from_redis(names)).items()
+            if entry.fresh_until > refresh_from}
+
+
+def schedule_refresh_many(
+        id_to_name: Mapping[K, str],
+        fetch: Callable[[list[K]], Awaitable[Mapping[str, Any]]],
+):
+    """Refresh stale objects in background."""
+    id_to_name = {id_: name for id_, name in id_to_name.items() if name not in refreshing_names}
+    if not id_to_name:
+        return
+    refreshing_names.update(id_to_name.values())
+
+    def on_done(task: asyncio.Task):
+        refreshing_names.difference_update(id_to_name.values())
+        refresh_tasks.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.error('Could not refresh cache', exc_info=task.exception())
+
+    task = asyncio.create_task(refresh_many(id_to_name, fetch))
+    refresh_tasks.add(task)
+    task.add_done_callback(on_done)
+
+
+async def get_or_fetch_many(
+        id_to_name: Mapping[K, str],
+        fetch: Callable[[list[K]], Awaitable[Mapping[str, Any]]],
+) -> dict[str, Any]:
+    """Get objects from cache and fetch missing ones from upstream.
+
+    Stale objects are returned at once and refreshed in background.
+    Objects expiring within ``refresh_ahead_time`` are refreshed before returning.
+    Only one worker in the fleet fetches a missing or stale key at a time.
+    The others wait for the missing key to be filled, and fetch it themselves
+    only if its lease has been released without filling it
+    or it hasn't been filled in ``app_settings.fetch_lock_wait_timeout``.
+    Age of the oldest returned object is recorded in ``response_age``.
+
+    Args:
+        id_to_name: Mapping of ids (e.g. unit ids) to their cache keys.
+        fetch: Coroutine function that fetches objects by ids and returns them by cache keys.
+               Objects missing in its result are treated as errors and are not cached.
+
+    Returns:
+        Mapping of cache keys to objects.
+    """
+    name_to_entry = await get_entries_many(id_to_name.values())
+    name_to_value = {name: entry.value for name, entry in name_to_entry.items()}
+
+    current_response_age = response_age.get()
+    if current_response_age is not None:
+        current_response_age.record(0)
+        for entry in name_to_entry.values():
+            current_response_age.record(entry.age)
+
+    current_refresh_ahead_time = refresh_ahead_time.get()
+    refresh_from = time.time() + current_refresh_ahead_time
+    stale_id_to_name = {id_: name for id_, name in id_to_name.items()
+                        if name in name_to_entry and name_to_entry[name].fresh_until <= refresh_from}
+    if stale_id_to_name and current_refresh_ahead_time:
+        await refresh_many(stale_id_to_name, fetch)
+    elif stale_id_to_name:
+        schedule_refresh_many(stale_id_to_name, fetch)
+
+    missing_ids = [id_ for id_, name in id_to_name.items() if name not in name_to_entry]
+    if not missing_ids:
+        return name_to_value
+
+    leases = await acquire_fetch_leases([id_to_name[id_] for id_ in missing_ids], app_settings.fetch_lock_lease_time)
+    try:
+        # Key may have been filled by another worker in between reading it and acquiring its lease.
+        filled_name_to_entry = await get_entries_from_redis(leases.keys())
+    except BaseException:
+        await release_fetch_leases(leases.values())
+        raise
+    name_to_value |= {name: entry.value for name, entry in filled_name_to_entry.items()}
+    ids_to_fetch = [id_ for id_ in missing_ids
+                    if id_to_name[id_] in leases and id_to_name[id_] not in filled_name_to_entry]
+    ids_to_wait = [id_ for id_ in missing_ids if id_to_name[id_] not in leases]
+
+    async def fetch_and_cache(ids: list[K], fetch_leases: Mapping[str, FetchLease] | None = None) -> Mapping[str, Any]:
+        if not ids:
+            return {}
+        fetched = await fetch(ids)
+        await set_many(fetched, leases=fetch_leases)
+        return fetched
+
+    async def fetch_and_release() -> Mapping[str, Any]:
+        try:
+            return await fetch_and_cache(ids_to_fetch, leases)
+        finally:
+            await release_fetch_leases(leases.values())
+
+    async def wait_or_fetch() -> Mapping[str, Any]:
+        filled = await wait_for_many([id_to_name[id_] for id_ in ids_to_wait], app_settings.fetch_lock_wait_timeout)
+        not_filled_ids = [id_ for id_ in ids_to_wait if id_to_name[id_] not in filled]
+        return filled | await fetch_and_cache(not_filled_ids)
+
+    fetched, waited = await asyncio.gather(fetch_and_release(), wait_or_fetch())
+    return name_to_value | fetched | waited
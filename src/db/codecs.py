@@ -0,0 +1,170 @@
+"""Serialization of cached objects.
+
+Every cached object is stored as a fixed-size header followed by a payload::
+
+    | codec tag (4 bytes) | schema version (uint32) | created at (double) | fresh until (double) | payload |
+
+Schema version of pydantic models is derived from their JSON schema,
+so entries written by a deploy with another model definition are treated as cache misses.
+"""
+import json
+import struct
+import zlib
+from abc import ABC, abstractmethod
+from typing import Any, Type
+
+import numpy as np
+from pydantic import BaseModel
+
+import models
+
+__all__ = (
+    'Codec',
+    'JSONCodec',
+    'PydanticCodec',
+    'RestaurantOrdersCodec',
+    'get_codec',
+    'encode',
+    'decode',
+)
+
+HEADER = struct.Struct('!4sIdd')
+
+
+class Codec(ABC):
+    tag: bytes
+    version: int = 1
+
+    @abstractmethod
+    def encode(self, value: Any) -> bytes:
+        pass
+
+    @abstractmethod
+    def decode(self, payload: memoryview) -> Any:
+        pass
+
+
+class JSONCodec(Codec):
+    """Default codec for plain JSON-serializable objects."""
+    tag = b'JSON'
+
+    def encode(self, value: Any) -> bytes:
+        return json.dumps(value, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+    def decode(self, payload: memoryview) -> Any:
+        return json.loads(bytes(payload))
+
+
+class PydanticCodec(Codec):
+    tag = b'PYDN'
+
+    def __init__(self, model: Type[BaseModel]):
+        self._model = model
+        self.version = zlib.crc32(model.schema_json().encode('utf-8'))
+
+    def encode(self, value: BaseModel) -> bytes:
+        return value.json(by_alias=True, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+    def decode(self, payload: memoryview) -> BaseModel:
+        return self._model.parse_raw(bytes(payload))
+
+
+class RestaurantOrdersCodec(Codec):
+    """Packed arrays of ``models.UnitRestaurantOrders``.
+
+    Payload layout (little-endian)::
+
+        | orders count, numbers size, phone numbers size, unit name size (uint32 each) |
+        | created at (int64 seconds) | numbers offsets (uint32) | phone numbers offsets (uint32) |
+        | numbers | phone numbers | unit name |
+
+    Decoded arrays are views of the payload, so nothing is copied.
+    """
+    tag = b'RORD'
+    sizes = struct.Struct('<IIII')
+
+    def encode(self, value: models.UnitRestaurantOrders) -> bytes:
+        unit_name = value.unit_name.encode('utf-8')
+        return b''.join((
+            self.sizes.pack(len(value), len(value.numbers.data), len(value.phone_numbers.data), len(unit_name)),
+            value.created_at.astype('datetime64[s]').astype('<i8').tobytes(),
+            value.numbers.offsets.astype('<u4').tobytes(),
+            value.phone_numbers.offsets.astype('<u4').tobytes(),
+            value.numbers.data,
+            value.phone_numbers.data,
+            unit_name,
+        ))
+
+    def decode(self, payload: memoryview) -> models.UnitRestaurantOrders:
+        count, numbers_size, phone_numbers_size, unit_name_size = self.sizes.unpack_from(payload)
+        # Created at, then offsets of numbers and phone numbers, then strings.
+        expected_size = (self.sizes.size + count * 8 + (count + 1) * 4 * 2
+                         + numbers_size + phone_numbers_size + unit_name_size)
+        if len(payload) != expected_size:
+            raise ValueError(f'Payload size is {len(payload)}, expected {expected_size}')
+        offset = self.sizes.size
+        created_at = np.frombuffer(payload, dtype='<i8', count=count, offset=offset).view('datetime64[s]')
+        offset += created_at.nbytes
+        numbers_offsets = np.frombuffer(payload, dtype='<u4', count=count + 1, offset=offset)
+        offset += numbers_offsets.nbytes
+        phone_numbers_offsets = np.frombuffer(payload, dtype='<u4', count=count + 1, offset=offset)
+        offset += phone_numbers_offsets.nbytes
+        numbers = payload[offset:offset + numbers_size]
+        offset += numbers_size
+        phone_numbers = payload[offset:offset + phone_numbers_size]
+        offset += phone_numbers_size
+        unit_name = str(payload[offset:offset + unit_name_size], 'utf-8')
+        return models.UnitRestaurantOrders(
+            unit_name=unit_name,
+            numbers=models.PackedStrings(offsets=numbers_offsets, data=numbers),
+            created_at=created_at,
+            phone_numbers=models.PackedStrings(offsets=phone_numbers_offsets, data=phone_numbers),
+        )
+
+
+DEFAULT_CODEC = JSONCodec()
+
+DATASET_CODECS: dict[str, Codec] = {
+    'kitchen_statistics': PydanticCodec(models.KitchenWorkPartial),
+    'delivery_statistics': PydanticCodec(models.DeliveryWorkPartial),
+    'private_delivery_statistics': PydanticCodec(models.UnitDeliveryStatisticsExtended),
+    'operational_statistics': PydanticCodec(models.UnitOperationalStatisticsForTodayAndWeekBefore),
+    'restaurant_orders': RestaurantOrdersCodec(),
+    'restaurant_orders_archive': RestaurantOrdersCodec(),
+    'being_late_certificates_today': PydanticCodec(models.UnitBeingLateCertificates),
+    'being_late_certificates_week_before': PydanticCodec(models.UnitBeingLateCertificates),
+}
+
+
+def get_codec(name: str) -> Codec:
+    """Get codec of key by its dataset prefix."""
+    dataset = name.split('@', 1)[0]
+    return DATASET_CODECS.get(dataset, DEFAULT_CODEC)
+
+
+def encode(name: str, value: Any, created_at: float, fresh_until: float) -> bytes:
+    codec = get_codec(name)
+    return HEADER.pack(codec.tag, codec.version, created_at, fresh_until) + codec.encode(value)
+
+
+def decode(name: str, obj_bytes: bytes) -> tuple[Any, float, float]:
+    """Decode cached object.
+
+    Returns:
+        Object, its creation time and soft expiry time.
+
+    Raises:
+        ValueError: if object has been encoded by another codec or another schema version, or is corrupted.
+    """
+    codec = get_codec(name)
+    try:
+        tag, version, created_at, fresh_until = HEADER.unpack_from(obj_bytes)
+    except struct.error:
+        raise ValueError(f'Invalid header of {name=}')
+    if tag != codec.tag or version != codec.version:
+        raise ValueError(f'Codec mismatch of {name=}: {tag=}, {version=}')
+    try:
+        obj = codec.decode(memoryview(obj_bytes)[HEADER.size:])
+    except Exception as error:
+        raise ValueError(f'Invalid payload of {name=}') from error
+    return obj, created_at, fresh_until
@@ -0,0 +1,104 @@
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any
+
+from core.config import app_settings
+
+__all__ = (
+    'LocalCache',
+    'local_cache',
+)
+
+
+@dataclass(frozen=True, slots=True)
+class LocalCacheEntry:
+    value: Any
+    size: int
+    expires_at: float
+
+
+class LocalCache:
+    """In-process LRU cache with TTL, placed in front of Redis.
+
+    Values are stored deserialized, so hits cost neither network I/O nor unpickling.
+    Size of entry is the length of its serialized form and is used to respect memory cap.
+    """
+
+    def __init__(self, max_entries: int, max_bytes: int, ttl: float):
+        self._max_entries = max_entries
+        self._max_bytes = max_bytes
+        self._ttl = ttl
+        self._entries: OrderedDict[str, LocalCacheEntry] = OrderedDict()
+        self._total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, name: str) -> Any:
+        """Get object by key.
+
+        Raises:
+            KeyError: if key is missing or expired.
+        """
+        entry = self._entries.get(name)
+        if entry is None:
+            self.misses += 1
+            raise KeyError(name)
+        if entry.expires_at <= time.monotonic():
+            self._remove(name)
+            self.misses += 1
+            raise KeyError(name)
+        self._entries.move_to_end(name)
+        self.hits += 1
+        return entry.value
+
+    def set(self, name: str, value: Any, size: int, expire_time: float):
+        """Store object.
+
+        Args:
+            name: Cache key.
+            value: Object to store.
+            size: Size of serialized object in bytes.
+            expire_time: Remaining lifetime of key in Redis in seconds.
+                         Local lifetime never exceeds it.
+        """
+        if name in self._entries:
+            self._remove(name)
+        ttl = min(self._ttl, expire_time)
+        if ttl <= 0 or size > self._max_bytes:
+            return
+        self._entries[name] = LocalCacheEntry(value=value, size=size, expires_at=time.monotonic() + ttl)
+        self._total_bytes += size
+        while len(self._entries) > self._max_entries or self._total_bytes > self._max_bytes:
+            _, evicted_entry = self._entries.popitem(last=False)
+            self._total_bytes -= evicted_entry.size
+            self.evictions += 1
+
+    def delete(self, name: str):
+        if name in self._entries:
+            self._remove(name)
+
+    def clear(self):
+        self._entries.clear()
+        self._total_bytes = 0
+
+    def stats(self) -> dict[str, int]:
+        return {
+            'entries': len(self._entries),
+            'bytes': self._total_bytes,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+        }
+
+    def _remove(self, name: str):
+        entry = self._entries.pop(name)
+        self._total_bytes -= entry.size
+
+
+local_cache = LocalCache(
+    max_entries=app_settings.local_cache_max_entries,
+    max_bytes=app_settings.local_cache_max_bytes,
+    ttl=app_settings.local_cache_ttl,
+)
@@ -0,0 +1,143 @@
+from dataclasses import dataclass
+from typing import Iterable, Mapping
+
+from db import redis_db
+
+__all__ = (
+    'FetchLease',
+    'acquire_fetch_leases',
+    'release_fetch_leases',
+    'get_leased_names',
+    'set_with_fetch_leases',
+)
+
+FENCING_TOKEN_KEY = 'fetch_lock_fencing_token'
+
+# KEYS[1]: fencing token counter, KEYS[2..]: lock keys, ARGV[1]: lease time in milliseconds.
+# Returns fencing token for each acquired lock and 0 for locks held by someone else.
+ACQUIRE_SCRIPT = """
+local tokens = {}
+for i = 2, #KEYS do
+    local token = redis.call('INCR', KEYS[1])
+    if redis.call('SET', KEYS[i], token, 'NX', 'PX', ARGV[1]) then
+        tokens[i - 1] = token
+    else
+        tokens[i - 1] = 0
+    end
+end
+return tokens
+"""
+
+# KEYS: lock keys, ARGV: fencing tokens.
+# Lock is deleted only if it's still held with the same token, i.e. lease has not expired and been taken over.
+RELEASE_SCRIPT = """
+for i, key in ipairs(KEYS) do
+    if redis.call('GET', key) == ARGV[i] then
+        redis.call('DEL', key)
+    end
+end
+return 0
+"""
+
+# KEYS: pairs of lock key and cache key, ARGV: triples of fencing token, object and expiration time in seconds.
+# Object is written only if lock is still held with the same token.
+# Returns 1 for each written object and 0 for each rejected one.
+SET_SCRIPT = """
+local written = {}
+for i = 1, #KEYS, 2 do
+    local j = (i - 1) / 2
+    if redis.call('GET', KEYS[i]) == ARGV[j * 3 + 1] then
+        redis.call('SET', KEYS[i + 1], ARGV[j * 3 + 2], 'EX', ARGV[j * 3 + 3])
+        written[j + 1] = 1
+    else
+        written[j + 1] = 0
+    end
+end
+return written
+"""
+
+
+@dataclass(frozen=True, slots=True)
+class FetchLease:
+    """Exclusive right of one worker to refresh cache key until lease expires.
+
+    Fencing token grows monotonically across the fleet. Lease is released and objects are written
+    under it only while the lock still holds the same token, so a worker whose lease has expired
+    and been taken over can neither release the new lease nor overwrite a newer object.
+    """
+    name: str
+    token: int
+
+    @property
+    def lock_name(self) -> str:
+        return get_lock_name(self.name)
+
+
+def get_lock_name(name: str) -> str:
+    return f'fetch_lock@{name}'
+
+
+async def acquire_fetch_leases(names: Iterable[str], lease_time: float) -> dict[str, FetchLease]:
+    """Try to acquire leases for refreshing cache keys in one round trip.
+
+    Args:
+        names: Cache keys to refresh.
+        lease_time: Lease lifetime in seconds.
+
+    Returns:
+        Mapping of cache keys to leases. Keys being refreshed by another worker are omitted.
+    """
+    names = list(names)
+    if not names:
+        return {}
+    lock_names = [get_lock_name(name) for name in names]
+    tokens = await redis_db.connection.eval(
+        ACQUIRE_SCRIPT, len(lock_names) + 1, FENCING_TOKEN_KEY, *lock_names, int(lease_time * 1000))
+    return {name: FetchLease(name=name, token=token) for name, token in zip(names, tokens) if token}
+
+
+async def release_fetch_leases(leases: Iterable[FetchLease]):
+    leases = list(leases)
+    if not leases:
+        return
+    await redis_db.connection.eval(
+        RELEASE_SCRIPT, len(leases),
+        *[lease.lock_name for lease in leases],
+        *[lease.token for lease in leases],
+    )
+
+
+async def get_leased_names(names: Iterable[str]) -> set[str]:
+    """Cache keys whose leases are currently held by some worker."""
+    names = list(names)
+    if not names:
+        return set()
+    tokens = await redis_db.connection.mget([get_lock_name(name) for name in names])
+    return {name for name, token in zip(names, tokens) if token is not None}
+
+
+async def set_with_fetch_leases(
+        name_to_obj_bytes: dict[str, bytes],
+        leases: Mapping[str, FetchLease],
+        name_to_expire_time: Mapping[str, int],
+) -> set[str]:
+    """Write objects in one round trip, only if their leases are still held.
+
+    Args:
+        name_to_obj_bytes: Mapping of cache keys to serialized objects.
+        leases: Mapping of the same cache keys to leases.
+        name_to_expire_time: Mapping of the same cache keys to expiration time in seconds.
+
+    Returns:
+        Keys that have been written.
+    """
+    if not name_to_obj_bytes:
+        return set()
+    keys = []
+    args = []
+    for name, obj_bytes in name_to_obj_bytes.items():
+        lease = leases[name]
+        keys += [lease.lock_name, name]
+        args += [lease.token, obj_bytes, name_to_expire_time[name]]
+    written = await redis_db.connection.eval(SET_SCRIPT, len(keys), *keys, *args)
+    return {name for name, is_written in zip(name_to_obj_bytes, written) if is_written}
@@ -0,0 +1,132 @@
+import uuid
+from datetime import date, datetime
+from typing import Iterable
+
+import models
+from db import redis_db
+
+__all__ = (
+    'get_fetched_until',
+    'add_orders_handover_time',
+    'get_units_orders_handover_time',
+)
+
+METRICS = ('tracking_pending_time', 'cooking_time', 'heated_shelf_time')
+
+# KEYS[1]: aggregates hash, KEYS[2]: set of added order ids,
+# ARGV[1]: expiration time in seconds, ARGV[2]: unit name, ARGV[3]: time until which orders have been fetched,
+# ARGV[4..]: quintuples of order id, sales channel and metrics of order.
+# Order is added to sums only once, so that overlapping fetches are not double counted.
+# Returns number of added orders.
+ADD_SCRIPT = """
+local added_count = 0
+for i = 4, #ARGV, 5 do
+    if redis.call('SADD', KEYS[2], ARGV[i]) == 1 then
+        local channel = ARGV[i + 1]
+        redis.call('HINCRBY', KEYS[1], channel .. ':count', 1)
+        redis.call('HINCRBY', KEYS[1], channel .. ':tracking_pending_time', ARGV[i + 2])
+        redis.call('HINCRBY', KEYS[1], channel .. ':cooking_time', ARGV[i + 3])
+        redis.call('HINCRBY', KEYS[1], channel .. ':heated_shelf_time', ARGV[i + 4])
+        added_count = added_count + 1
+    end
+end
+if ARGV[2] ~= '' then
+    redis.call('HSET', KEYS[1], 'unit_name', ARGV[2])
+end
+local fetched_until = redis.call('HGET', KEYS[1], 'fetched_until')
+if not fetched_until or ARGV[3] > fetched_until then
+    redis.call('HSET', KEYS[1], 'fetched_until', ARGV[3])
+end
+redis.call('EXPIRE', KEYS[1], ARGV[1])
+redis.call('EXPIRE', KEYS[2], ARGV[1])
+return added_count
+"""
+
+
+def get_aggregates_name(unit_uuid: uuid.UUID, business_date: date) -> str:
+    return f'orders_handover_time@{unit_uuid.hex}@{business_date.isoformat()}'
+
+
+def get_order_ids_name(unit_uuid: uuid.UUID, business_date: date) -> str:
+    return f'orders_handover_time_ids@{unit_uuid.hex}@{business_date.isoformat()}'
+
+
+async def get_fetched_until(unit_uuids: Iterable[uuid.UUID], business_date: date) -> dict[uuid.UUID, datetime]:
+    """Time until which orders of units have been fetched. Units never fetched are omitted."""
+    unit_uuids = list(unit_uuids)
+    async with redis_db.connection.pipeline(transaction=False) as pipeline:
+        for unit_uuid in unit_uuids:
+            pipeline.hget(get_aggregates_name(unit_uuid, business_date), 'fetched_until')
+        values = await pipeline.execute()
+    return {unit_uuid: datetime.fromisoformat(value.decode())
+            for unit_uuid, value in zip(unit_uuids, values) if value is not None}
+
+
+async def add_orders_handover_time(
+        unit_uuids: Iterable[uuid.UUID],
+        business_date: date,
+        orders_handover_time: Iterable[models.OrdersHandoverTime],
+        fetched_until: datetime,
+        expire_time: int,
+):
+    """Add orders to running sums of units in one round trip, skipping already added ones.
+
+    Args:
+        unit_uuids: Units whose orders have been fetched, including ones without orders.
+        business_date: Date of orders.
+        orders_handover_time: Fetched orders.
+        fetched_until: Time until which orders have been fetched.
+        expire_time: Expiration time of sums in seconds.
+    """
+    unit_uuid_to_orders: dict[uuid.UUID, list[models.OrdersHandoverTime]] = {
+        unit_uuid: [] for unit_uuid in unit_uuids}
+    for order_handover_time in orders_handover_time:
+        if order_handover_time.unit_id in unit_uuid_to_orders:
+            unit_uuid_to_orders[order_handover_time.unit_id].append(order_handover_time)
+
+    async with redis_db.connection.pipeline(transaction=False) as pipeline:
+        for unit_uuid, orders in unit_uuid_to_orders.items():
+            args = [expire_time, orders[0].unit_name if orders else '', fetched_until.isoformat()]
+            for order in orders:
+                args += [order.order_id.hex, order.sales_channel.value,
+                         order.tracking_pending_time, order.cooking_time, order.heated_shelf_time]
+            pipeline.eval(ADD_SCRIPT, 2, get_aggregates_name(unit_uuid, business_date),
+                          get_order_ids_name(unit_uuid, business_date), *args)
+        await pipeline.execute()
+
+
+async def get_units_orders_handover_time(
+        unit_uuids: Iterable[uuid.UUID],
+        business_date: date,
+        sales_channels: Iterable[models.SalesChannel],
+) -> list[models.UnitOrdersHandoverTime]:
+    """Average handover time of orders of units in given sales channels, calculated from running sums.
+
+    Units without orders in these sales channels are omitted.
+    """
+    unit_uuids = list(unit_uuids)
+    sales_channels = list(sales_channels)
+    async with redis_db.connection.pipeline(transaction=False) as pipeline:
+        for unit_uuid in unit_uuids:
+            pipeline.hgetall(get_aggregates_name(unit_uuid, business_date))
+        aggregates = await pipeline.execute()
+
+    units_orders_handover_time: list[models.UnitOrdersHandoverTime] = []
+    for unit_uuid, unit_aggregates in zip(unit_uuids, aggregates):
+        unit_aggregates = {field.decode(): value.decode() for field, value in unit_aggregates.items()}
+        count = sum(int(unit_aggregates.get(f'{channel.value}:count', 0)) for channel in sales_channels)
+        if not count:
+            continue
+        metric_to_sum = {
+            metric: sum(int(unit_aggregates.get(f'{channel.value}:{metric}', 0)) for channel in sales_channels)
+            for metric in METRICS
+        }
+        units_orders_handover_time.append(models.UnitOrdersHandoverTime(
+            unit_uuid=unit_uuid,
+            unit_name=unit_aggregates['unit_name'],
+            average_tracking_pending_time=metric_to_sum['tracking_pending_time'] / count,
+            average_cooking_time=metric_to_sum['cooking_time'] / count,
+            average_heated_shelf_time=metric_to_sum['heated_shelf_time'] / count,
+            sales_channels=sales_channels,
+        ))
+    return units_orders_handover_time
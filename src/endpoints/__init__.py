@@ -1,3 +1,3 @@
-from . import ping, v2
+from . import ping, monitoring, v2
 from .v2 import stop_sales
 from .v1 import statistics
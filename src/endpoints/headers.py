@@ -0,0 +1,15 @@
+import uuid
+from typing import Iterable
+
+from fastapi import Response
+
+__all__ = (
+    'set_error_unit_uuids_header',
+)
+
+
+def set_error_unit_uuids_header(response: Response, error_unit_uuids: Iterable[uuid.UUID]):
+    """Report units which couldn't be requested, keeping response body a plain list."""
+    error_unit_uuids = list(error_unit_uuids)
+    if error_unit_uuids:
+        response.headers['X-Error-Unit-UUIDs'] = ','.join(str(unit_uuid) for unit_uuid in error_unit_uuids)
@@ -0,0 +1,28 @@
+from fastapi import APIRouter
+
+from db.local_cache import local_cache
+from services.api.http_clients import http_clients
+from services.cache_warmer import cache_warmer
+from services.parse_executor import parse_executor
+
+router = APIRouter(prefix='/monitoring', tags=['Utils'])
+
+
+@router.get(path='/cache')
+async def get_cache_stats():
+    return local_cache.stats()
+
+
+@router.get(path='/cache-warmer')
+async def get_cache_warmer_stats():
+    return cache_warmer.stats()
+
+
+@router.get(path='/upstreams')
+async def get_upstreams_stats():
+    return http_clients.stats()
+
+
+@router.get(path='/parse-executor')
+async def get_parse_executor_stats():
+    return parse_executor.stats()
@@ -1,6 +1,9 @@
+import json
+import uuid
 from datetime import date, datetime
 
 from fastapi import APIRouter, Body
+from fastapi.responses import StreamingResponse
 
 import models
 from services.statistics import orders
@@ -11,7 +14,7 @@ router = APIRouter(prefix='/v1', tags=['Orders'])
 
 @router.post(
     path='/canceled-orders',
-    response_model=list[models.OrderByUUID],
+    response_model=models.CanceledOrders,
 )
 async def get_canceled_orders(
         cookies: dict = Body(),
@@ -19,3 +22,40 @@ async def get_canceled_orders(
 ):
     period = time_utils.Period(date, date)
     return await orders.get_canceled_orders(cookies, period)
+
+
+@router.post(
+    path='/canceled-orders/stream',
+    response_class=StreamingResponse,
+    responses={200: {'content': {'application/x-ndjson': {}}}},
+)
+async def stream_canceled_orders(
+        cookies: dict = Body(),
+        date: date | None = Body(None),
+):
+    """Canceled orders as newline-delimited JSON, one line per order as soon as it's fetched.
+
+    Orders which couldn't be fetched are sent as ``{"error_order_uuid": ...}`` lines.
+    """
+    period = time_utils.Period(date, date)
+    results = orders.iter_canceled_orders(cookies, period)
+    # The first result is awaited before response starts, so that upstream errors still get their status codes.
+    first_result = await anext(results, None)
+
+    async def iter_lines():
+        if first_result is None:
+            return
+        try:
+            yield to_line(first_result)
+            async for result in results:
+                yield to_line(result)
+        finally:
+            await results.aclose()
+
+    return StreamingResponse(iter_lines(), media_type='application/x-ndjson')
+
+
+def to_line(result: models.OrderByUUID | uuid.UUID) -> str:
+    if isinstance(result, uuid.UUID):
+        return json.dumps({'error_order_uuid': str(result)}) + '\n'
+    return result.json() + '\n'
@@ -20,6 +20,6 @@ async def get_canceled_orders(
         date: date | None = Body(None),
         repeated_phone_number_count_threshold: int = Body(3),
 ):
-    period = time_utils.Period(date, date)
-    restaurant_orders = await orders.get_restaurant_orders(cookies, units, period)
+    business_date = date or time_utils.Period.now().date()
+    restaurant_orders = await orders.get_restaurant_orders(cookies, units, business_date)
     return convert_models.restaurant_orders_to_cheated_orders(restaurant_orders, repeated_phone_number_count_threshold)
@@ -71,8 +71,7 @@ async def get_bonus_system_statistics(
         cookies: dict,
         units: list[models.UnitIdAndName],
 ):
-    period = time_utils.Period.new_today()
-    restaurant_orders = await orders.get_restaurant_orders(cookies, units, period)
+    restaurant_orders = await orders.get_restaurant_orders(cookies, units, time_utils.Period.now().date())
     return convert_models.restaurant_orders_to_bonus_system_statistics(restaurant_orders)
 
 
@@ -27,10 +27,9 @@ async def get_ingredient_stocks(
         days_left_threshold: int | None = Body(default=None),
         office_manager: OfficeManagerRepository = Depends(get_office_manager_repository),
 ):
-    async with office_manager:
-        tasks = (office_manager.get_stocks_balance(cookies, unit_id) for unit_id in unit_ids)
-        responses: tuple[list[models.StockBalance] | exceptions.StocksBalanceAPIError, ...] = await asyncio.gather(
-            *tasks, return_exceptions=True)
+    tasks = (office_manager.get_stocks_balance(cookies, unit_id) for unit_id in unit_ids)
+    responses: tuple[list[models.StockBalance] | exceptions.StocksBalanceAPIError, ...] = await asyncio.gather(
+        *tasks, return_exceptions=True)
     error_unit_ids: list[int] = []
     units: list[models.StockBalance] = []
     for units_responses in responses:
@@ -1,12 +1,12 @@
 from uuid import UUID
 
-from fastapi import APIRouter, Query
+from fastapi import APIRouter, Query, Response
 
 import models
 import models.private_dodo_api
+from endpoints.headers import set_error_unit_uuids_header
 from services import convert_models
-from services.api import private_dodo_api
-from services.statistics import delivery
+from services.statistics import delivery, production
 from utils import time_utils
 
 router = APIRouter(prefix='/v2/statistics', tags=['Statistics'])
@@ -17,12 +17,14 @@ router = APIRouter(prefix='/v2/statistics', tags=['Statistics'])
     response_model=list[models.UnitDeliverySpeed],
 )
 async def get_delivery_speed(
+        response: Response,
         token: str,
         unit_uuids: list[UUID] = Query(...),
 ):
     period_today = time_utils.Period.new_today()
     units_delivery_statistics = await delivery.get_delivery_statistics(token, unit_uuids, period_today)
-    return convert_models.delivery_statistics_to_delivery_speed(units_delivery_statistics)
+    set_error_unit_uuids_header(response, units_delivery_statistics.error_unit_uuids)
+    return convert_models.delivery_statistics_to_delivery_speed(units_delivery_statistics.items)
 
 
 @router.get(
@@ -30,11 +32,11 @@ async def get_delivery_speed(
     response_model=list[models.UnitOrdersHandoverTime],
 )
 async def get_orders_handover_time_statistics(
+        response: Response,
         token: str = Query(...),
         unit_uuids: list[UUID] = Query(...),
         sales_channels: list[models.private_dodo_api.SalesChannel] = Query(...),
 ):
-    period = time_utils.Period.new_today()
-    orders_handover_time = await private_dodo_api.get_orders_handover_time(token, unit_uuids, period)
-    filtered = convert_models.filter_orders_handover_time_by_sales_channels(orders_handover_time, sales_channels)
-    return convert_models.calculate_units_average_orders_handover_time(filtered, sales_channels)
+    orders_handover_time = await production.get_orders_handover_time_statistics(token, unit_uuids, sales_channels)
+    set_error_unit_uuids_header(response, orders_handover_time.error_unit_uuids)
+    return orders_handover_time.items
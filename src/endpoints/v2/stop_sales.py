@@ -1,9 +1,10 @@
 import uuid
 from datetime import datetime
 
-from fastapi import APIRouter, Query
+from fastapi import APIRouter, Query, Response
 
 import models
+from endpoints.headers import set_error_unit_uuids_header
 from services.api import private_dodo_api
 from utils import time_utils
 
@@ -16,13 +17,16 @@ router = APIRouter(prefix='/v2/stop-sales', tags=['Stop sales'])
     response_model=list[models.StopSalesByIngredients],
 )
 async def get_ingredient_stop_sales(
+        response: Response,
         token: str,
         unit_uuids: list[uuid.UUID] = Query(...),
         from_datetime: datetime | None = Query(None, description='Today unless specified'),
         to_datetime: datetime | None = Query(None, description='Current datetime unless specified'),
 ):
     period = time_utils.Period(from_datetime, to_datetime)
-    return await private_dodo_api.get_ingredient_stop_sales(token, unit_uuids, period)
+    stop_sales = await private_dodo_api.get_ingredient_stop_sales(token, unit_uuids, period)
+    set_error_unit_uuids_header(response, stop_sales.error_unit_uuids)
+    return stop_sales.items
 
 
 @router.get(
@@ -31,13 +35,16 @@ async def get_ingredient_stop_sales(
     response_model=list[models.StopSalesBySalesChannels],
 )
 async def get_channels_stop_sales(
+        response: Response,
         token: str,
         unit_uuids: list[uuid.UUID] = Query(...),
         from_datetime: datetime | None = Query(None, description='Today unless specified'),
         to_datetime: datetime | None = Query(None, description='Current datetime unless specified'),
 ):
     period = time_utils.Period(from_datetime, to_datetime)
-    return await private_dodo_api.get_channels_stop_sales(token, unit_uuids, period)
+    stop_sales = await private_dodo_api.get_channels_stop_sales(token, unit_uuids, period)
+    set_error_unit_uuids_header(response, stop_sales.error_unit_uuids)
+    return stop_sales.items
 
 
 @router.get(
@@ -46,10 +53,13 @@ async def get_channels_stop_sales(
     response_model=list[models.StopSalesByProduct],
 )
 async def get_products_stop_sales(
+        response: Response,
         token: str,
         unit_uuids: list[uuid.UUID] = Query(...),
         from_datetime: datetime | None = Query(None, description='Today unless specified'),
         to_datetime: datetime | None = Query(None, description='Current datetime unless specified'),
 ):
     period = time_utils.Period(from_datetime, to_datetime)
-    return await private_dodo_api.get_products_stop_sales(token, unit_uuids, period)
+    stop_sales = await private_dodo_api.get_products_stop_sales(token, unit_uuids, period)
+    set_error_unit_uuids_header(response, stop_sales.error_unit_uuids)
+    return stop_sales.items
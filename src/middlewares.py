@@ -0,0 +1,38 @@
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Scope, Receive, Send, Message
+
+from db.cache import ResponseAge, response_age
+
+__all__ = (
+    'ResponseAgeMiddleware',
+)
+
+
+class ResponseAgeMiddleware:
+    """Adds ``Age`` header with age in seconds of the oldest cached object used in response.
+
+    Implemented as pure ASGI middleware, so that endpoint runs in the same context
+    and records ages into the same ``ResponseAge`` object.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        current_response_age = ResponseAge()
+        token = response_age.set(current_response_age)
+
+        async def send_with_age(message: Message):
+            if message['type'] == 'http.response.start' and current_response_age.max_age is not None:
+                headers = MutableHeaders(scope=message)
+                headers.append('Age', str(int(current_response_age.max_age)))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_age)
+        finally:
+            response_age.reset(token)
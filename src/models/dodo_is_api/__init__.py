@@ -2,4 +2,5 @@ from .orders import *
 from .partial_statistics.delivery import *
 from .partial_statistics.kitchen import *
 from .partial_statistics.orders import *
+from .restaurant_orders import *
 from .stop_sales import *
@@ -8,6 +8,7 @@ from models.validators import get_or_none
 __all__ = (
     'OrderPartial',
     'OrderByUUID',
+    'CanceledOrders',
 )
 
 
@@ -41,3 +42,8 @@ class OrderByUUID(BaseModel):
         'receipt_printed_at',
         allow_reuse=True
     )(get_or_none)
+
+
+class CanceledOrders(BaseModel):
+    orders: list[OrderByUUID]
+    error_order_uuids: list[uuid.UUID]
@@ -0,0 +1,69 @@
+from dataclasses import dataclass
+from typing import Iterable
+
+import numpy as np
+
+__all__ = (
+    'PackedStrings',
+    'UnitRestaurantOrders',
+)
+
+
+@dataclass(frozen=True, slots=True)
+class PackedStrings:
+    """Sequence of strings packed into one UTF-8 buffer.
+
+    String ``i`` is ``data[offsets[i]:offsets[i + 1]]``.
+    Empty string stands for missing value.
+    """
+    offsets: np.ndarray
+    data: bytes | memoryview
+
+    @classmethod
+    def pack(cls, values: Iterable[str | None]) -> 'PackedStrings':
+        encoded_values = [(value or '').encode('utf-8') for value in values]
+        offsets = np.zeros(len(encoded_values) + 1, dtype='<u4')
+        np.cumsum([len(value) for value in encoded_values], out=offsets[1:])
+        return cls(offsets=offsets, data=b''.join(encoded_values))
+
+    @property
+    def lengths(self) -> np.ndarray:
+        return np.diff(self.offsets)
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, index: int) -> str | None:
+        start, end = self.offsets[index], self.offsets[index + 1]
+        if start == end:
+            return None
+        return str(self.data[start:end], 'utf-8')
+
+
+@dataclass(frozen=True, slots=True)
+class UnitRestaurantOrders:
+    """Restaurant orders of unit, column by column.
+
+    Only columns used to calculate statistics are kept.
+    """
+    unit_name: str
+    numbers: PackedStrings
+    created_at: np.ndarray
+    phone_numbers: PackedStrings
+
+    @classmethod
+    def new_empty(cls, unit_name: str) -> 'UnitRestaurantOrders':
+        return cls(
+            unit_name=unit_name,
+            numbers=PackedStrings.pack([]),
+            created_at=np.array([], dtype='datetime64[s]'),
+            phone_numbers=PackedStrings.pack([]),
+        )
+
+    @property
+    def with_phone_number(self) -> np.ndarray:
+        """Boolean mask of orders with phone number."""
+        return self.phone_numbers.lengths > 0
+
+    def __len__(self) -> int:
+        return len(self.created_at)
@@ -7,15 +7,5 @@ __all__ = (
 
 class APIClientRepository:
 
-    def __init__(self, base_url: str):
-        self._client = httpx.AsyncClient(base_url=base_url, timeout=60)
-
-    async def close(self):
-        if not self._client.is_closed:
-            await self._client.aclose()
-
-    async def __aenter__(self):
-        return self
-
-    async def __aexit__(self, exc_type, exc_val, exc_tb):
-        await self.close()
+    def __init__(self, client: httpx.AsyncClient):
+        self._client = client
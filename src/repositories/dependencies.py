@@ -1,4 +1,5 @@
 from repositories.office_manager import OfficeManagerRepository
+from services.api.http_clients import http_clients, OFFICE_MANAGER_URL
 
 __all__ = (
     'get_office_manager_repository',
@@ -6,4 +7,4 @@ __all__ = (
 
 
 def get_office_manager_repository() -> OfficeManagerRepository:
-    return OfficeManagerRepository('https://officemanager.dodopizza.ru/')
+    return OfficeManagerRepository(http_clients.get(OFFICE_MANAGER_URL))
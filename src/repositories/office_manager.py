@@ -1,5 +1,9 @@
+import httpx
+
 import models
 from services import parsers
+from services.api.http_clients import build_cookie_header
+from services.parse_executor import parse_executor
 from repositories.base import APIClientRepository
 
 __all__ = (
@@ -14,7 +18,10 @@ class OfficeManagerRepository(APIClientRepository):
     async def get_stocks_balance(self, cookies: dict[str, str], unit_id: int | str) -> list[models.StockBalance]:
         url = '/OfficeManager/StockBalance/Get'
         params = {'unitId': unit_id}
-        response = await self._client.get(url, params=params, cookies=cookies)
+        try:
+            response = await self._client.get(url, params=params, headers=build_cookie_header(cookies), timeout=60)
+        except httpx.TransportError as error:
+            raise exceptions.StocksBalanceAPIError(unit_id=unit_id) from error
         if response.is_server_error:
             raise exceptions.StocksBalanceAPIError(unit_id=unit_id)
-        return parsers.StockBalanceHTMLParser(response.text, unit_id).parse()
+        return await parse_executor.run(parsers.StockBalanceHTMLParser.parse_html, response.text, unit_id)
@@ -1,10 +1,10 @@
 from typing import Iterable
 
-import httpx
-
 import models
 from core import config
 from services import parsers
+from services.api.http_clients import http_clients, build_cookie_header
+from services.parse_executor import parse_executor
 from utils import time_utils
 
 __all__ = (
@@ -24,7 +24,6 @@ async def get_being_late_certificates(
         'beginDate': datetime_config.from_datetime.strftime('%d.%m.%Y'),
         'endDate': datetime_config.to_datetime.strftime('%d.%m.%Y'),
     }
-    headers = {'User-Agent': config.APP_USER_AGENT}
-    async with httpx.AsyncClient(cookies=cookies) as client:
-        response = await client.post(url, data=data, headers=headers, timeout=30)
-    return parsers.BeingLateCertificatesParser(response.text, unit_ids[0], units).parse()
+    headers = {'User-Agent': config.APP_USER_AGENT} | build_cookie_header(cookies)
+    response = await http_clients.get(url).post(url, data=data, headers=headers, timeout=30)
+    return await parse_executor.run(parsers.BeingLateCertificatesParser.parse_html, response.text, unit_ids[0], units)
@@ -1,12 +1,14 @@
-import asyncio
 import uuid
 from typing import AsyncGenerator
 
-import httpx
-
 import models
+from core.config import app_settings
 from services import parsers
+from services.api.http_clients import http_clients, build_cookie_header
+from services.api.pagination import paginate
+from services.parse_executor import parse_executor
 from utils import time_utils, exceptions
+from utils.retry import parse_retry_after
 
 __all__ = (
     'get_canceled_orders_partial',
@@ -18,30 +20,37 @@ async def get_canceled_orders_partial(
         cookies: dict, period: time_utils.Period
 ) -> AsyncGenerator[list[models.OrderPartial], None]:
     url = 'https://shiftmanager.dodopizza.ru/Managment/ShiftManagment/PartialShiftOrders'
-    params = {
-        'page': 1,
-        'date': period.to_datetime.date().isoformat(),
-        'orderStateFilter': 'Failure',
-    }
-    async with httpx.AsyncClient(cookies=cookies) as client:
-        while True:
-            response = await client.get(url, params=params, timeout=30)
-            if not response.is_success:
-                raise exceptions.OrdersPartialAPIError
-            orders = parsers.OrdersPartial(response.text).parse()
-            yield orders
-            if not orders:
-                break
-            params['page'] += 1
+    headers = build_cookie_header(cookies)
+    client = http_clients.get(url)
+
+    async def fetch_page(page: int) -> list[models.OrderPartial]:
+        params = {
+            'page': page,
+            'date': period.to_datetime.date().isoformat(),
+            'orderStateFilter': 'Failure',
+        }
+        response = await client.get(url, params=params, headers=headers, timeout=30)
+        if not response.is_success:
+            raise exceptions.OrdersPartialAPIError
+        return await parse_executor.run(parsers.OrdersPartial.parse_html, response.text)
+
+    async for orders in paginate(fetch_page, window=app_settings.pagination_window):
+        yield orders
 
 
 async def get_order_by_uuid(cookies: dict, order_uuid: uuid.UUID,
                             order_price: int, order_type: str) -> models.OrderByUUID:
     url = 'https://shiftmanager.dodopizza.ru/Managment/ShiftManagment/Order'
     params = {'orderUUId': order_uuid.hex}
-
-    async with httpx.AsyncClient(cookies=cookies) as client:
-        response = await client.get(url, params=params, timeout=30)
-        if not response.is_success:
-            raise exceptions.OrderByUUIDAPIError(order_uuid=order_uuid, order_price=order_price, order_type=order_type)
-        return parsers.OrderByUUIDParser(response.text, order_uuid, order_price, order_type).parse()
+    headers = build_cookie_header(cookies)
+    response = await http_clients.get(url).get(url, params=params, headers=headers, timeout=30)
+    if not response.is_success:
+        raise exceptions.OrderByUUIDAPIError(
+            order_uuid=order_uuid,
+            order_price=order_price,
+            order_type=order_type,
+            status_code=response.status_code,
+            retry_after=parse_retry_after(response.headers.get('Retry-After')),
+        )
+    return await parse_executor.run(
+        parsers.OrderByUUIDParser.parse_html, response.text, order_uuid, order_price, order_type)
@@ -6,7 +6,11 @@ import httpx
 import models
 from core import config
 from services import parsers
+from services.api.http_clients import http_clients, build_cookie_header
+from services.parse_executor import parse_executor
 from utils import exceptions
+from utils.credentials import get_credentials_ref
+from utils.single_flight import single_flight
 
 __all__ = (
     'get_kitchen_statistics',
@@ -42,12 +46,20 @@ async def request_partial_statistics(
         parser: Type[parsers.PartialStatisticsParser],
 ) -> Any:
     params = {'unitId': unit_id}
-    headers = {'User-Agent': config.APP_USER_AGENT}
-    async with httpx.AsyncClient(cookies=cookies) as client:
-        response = await client.get(url, params=params, timeout=30, headers=headers)
+    headers = {'User-Agent': config.APP_USER_AGENT} | build_cookie_header(cookies)
+
+    async def request():
+        try:
+            response = await http_clients.get(url).get(url, params=params, timeout=30, headers=headers)
+        except httpx.TransportError as error:
+            raise exceptions.PartialStatisticsAPIError(unit_id=unit_id) from error
         if not response.is_success:
             raise exceptions.PartialStatisticsAPIError(unit_id=unit_id)
-        return parser(response.text, unit_id).parse()
+        return await parse_executor.run(parser.parse_html, response.text, unit_id)
+
+    # Responses depend on user's permissions, so only requests with the same cookies are coalesced.
+    key = ('partial_statistics', url, unit_id, get_credentials_ref(cookies))
+    return await single_flight.do(key, request)
 
 
 async def request_partial_statistics_batch(
@@ -1,35 +1,82 @@
-from typing import Iterable
+from collections import defaultdict
+from typing import Iterable, Sequence
 
-import httpx
-import pandas as pd
+import numpy as np
 from fastapi import HTTPException, status
-from pandas.core.groupby import DataFrameGroupBy
 
+import models
 from core import config
+from services.api.http_clients import http_clients, build_cookie_header
+from services.parse_executor import parse_executor
+from services.parsers.tables import iter_table_rows
 from utils import time_utils
 
 __all__ = (
     'get_restaurant_orders',
 )
 
+COLUMNS = ('Отдел', '№ заказа', 'Дата и время', '№ телефона')
+
+
+def parse_created_at(values: Iterable[str]) -> np.ndarray:
+    """Array of ``datetime64[s]`` from dates formatted as ``%d.%m.%Y %H:%M``.
+
+    Dates are rearranged to ISO format, which numpy parses natively, instead of calling ``strptime`` per date.
+
+    Raises:
+        ValueError: if some date has another format.
+    """
+    iso_values = []
+    for value in values:
+        if len(value) != 16:
+            raise ValueError(f'Invalid date {value!r}, expected format is %d.%m.%Y %H:%M')
+        iso_values.append(f'{value[6:10]}-{value[3:5]}-{value[:2]}T{value[11:]}')
+    return np.array(iso_values, dtype='datetime64[s]')
+
+
+def to_unit_restaurant_orders(
+        unit_name: str,
+        numbers: Sequence[str],
+        created_at: Sequence[str],
+        phone_numbers: Sequence[str],
+) -> models.UnitRestaurantOrders:
+    return models.UnitRestaurantOrders(
+        unit_name=unit_name,
+        numbers=models.PackedStrings.pack(numbers),
+        created_at=parse_created_at(created_at),
+        phone_numbers=models.PackedStrings.pack(phone_numbers),
+    )
+
+
+def parse_restaurant_orders(html: str) -> list[models.UnitRestaurantOrders]:
+    """Orders of report grouped by unit name, in order of unit names.
+
+    Rows without unit name, e.g. totals, are skipped.
+    """
+    unit_name_to_rows: defaultdict[str, list[tuple[str, str, str]]] = defaultdict(list)
+    for unit_name, number, created_at, phone_number in iter_table_rows(html, columns=COLUMNS):
+        if unit_name:
+            unit_name_to_rows[unit_name].append((number, created_at, phone_number))
+    return [to_unit_restaurant_orders(unit_name, *zip(*unit_name_to_rows[unit_name]))
+            for unit_name in sorted(unit_name_to_rows)]
+
 
 async def get_restaurant_orders(
         cookies: dict,
         unit_ids: Iterable[int | str],
         datetime_config: time_utils.Period,
-) -> DataFrameGroupBy:
-    """Get DataFrame with orders."""
+) -> list[models.UnitRestaurantOrders]:
+    """Get restaurant orders of every unit."""
     url = 'https://officemanager.dodopizza.ru/Reports/Orders/Get'
-    headers = {'User-Agent': config.APP_USER_AGENT}
-    async with httpx.AsyncClient(cookies=cookies) as client:
-        response = await client.post(url, timeout=30, headers=headers, data={
-            'filterType': 'OrdersFromRestaurant',
-            'unitsIds': unit_ids,
-            'OrderSources': 'Restaurant',
-            'beginDate': datetime_config.from_datetime.strftime('%d.%m.%Y'),
-            'endDate': datetime_config.to_datetime.strftime('%d.%m.%Y'),
-            'orderTypes': ['Delivery', 'Pickup', 'Stationary']
-        })
-        if not response.is_success:
-            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST)
-        return pd.read_html(response.text)[0].groupby('Отдел')
+    headers = {'User-Agent': config.APP_USER_AGENT} | build_cookie_header(cookies)
+    response = await http_clients.get(url).post(url, timeout=30, headers=headers, data={
+        'filterType': 'OrdersFromRestaurant',
+        'unitsIds': unit_ids,
+        'OrderSources': 'Restaurant',
+        'beginDate': datetime_config.from_datetime.strftime('%d.%m.%Y'),
+        'endDate': datetime_config.to_datetime.strftime('%d.%m.%Y'),
+        'orderTypes': ['Delivery', 'Pickup', 'Stationary']
+    })
+    if not response.is_success:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST)
+    return await parse_executor.run(parse_restaurant_orders, response.text)
@@ -2,9 +2,9 @@ import asyncio
 from enum import Enum
 from typing import Iterable, Generic, TypeVar, Type
 
-import httpx
-
 from services import parsers
+from services.api.http_clients import http_clients, build_cookie_header
+from services.parse_executor import parse_executor
 from utils import time_utils, exceptions
 
 __all__ = (
@@ -35,11 +35,11 @@ class StopSalesByCookies(Generic[RM]):
             'beginDate': period.from_datetime,
             'endDate': period.to_datetime,
         }
-        async with httpx.AsyncClient(cookies=cookies) as client:
-            response = await client.post(self._url, data=body, timeout=30)
-            if not response.is_success:
-                raise exceptions.DodoISAPIError
-            return self._parser(response.text).parse()
+        headers = build_cookie_header(cookies)
+        response = await http_clients.get(self._url).post(self._url, data=body, headers=headers, timeout=30)
+        if not response.is_success:
+            raise exceptions.DodoISAPIError
+        return await parse_executor.run(self._parser.parse_html, response.text)
 
     def __call__(self, cookies: dict, unit_ids: Iterable[int], period: time_utils.Period):
         return self.request(cookies, unit_ids, period)
@@ -0,0 +1,152 @@
+import functools
+import logging
+from http.cookiejar import CookieJar, DefaultCookiePolicy
+from typing import Callable
+from urllib.parse import urlsplit
+
+import httpx
+
+from core.config import app_settings
+from services.api.transports import CircuitBreaker, CircuitBreakerTransport, ConcurrencyLimitedTransport
+
+__all__ = (
+    'OFFICE_MANAGER_URL',
+    'SHIFT_MANAGER_URL',
+    'PUBLIC_DODO_API_URL',
+    'PRIVATE_DODO_API_URL',
+    'HTTPClients',
+    'http_clients',
+    'build_cookie_header',
+)
+
+OFFICE_MANAGER_URL = 'https://officemanager.dodopizza.ru'
+SHIFT_MANAGER_URL = 'https://shiftmanager.dodopizza.ru'
+PUBLIC_DODO_API_URL = 'https://publicapi.dodois.io'
+PRIVATE_DODO_API_URL = 'https://api.dodois.io'
+
+logger = logging.getLogger(__name__)
+
+
+def is_http2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def build_cookie_header(cookies: dict[str, str]) -> dict[str, str]:
+    """Cookies of user are sent as header of exact request, since clients are shared between users."""
+    return {'Cookie': '; '.join(f'{name}={value}' for name, value in cookies.items())}
+
+
+class HTTPClients:
+    """Registry of pooled HTTP clients, one per upstream host.
+
+    Connections to host are kept alive and reused by all requests,
+    so that requests don't pay TCP and TLS handshakes.
+    Clients never store cookies set by responses, so credentials of one user can't leak to another.
+
+    With HTTP/2 enabled, protocol is negotiated with each host via ALPN,
+    and hosts not supporting it are still requested over HTTP/1.1.
+
+    Number of requests in flight to each host is limited across all callers,
+    so that big batches queue up here instead of being throttled by upstream.
+
+    With ``breaker_factory`` given, each host gets its own circuit breaker,
+    so that requests to unavailable host fail fast instead of waiting for timeouts.
+    """
+
+    def __init__(
+            self,
+            limits: httpx.Limits,
+            timeout: float,
+            max_concurrent_requests: int,
+            host_to_max_concurrent_requests: dict[str, int] | None = None,
+            http2: bool = False,
+            transport: httpx.AsyncBaseTransport | None = None,
+            breaker_factory: Callable[[], CircuitBreaker] | None = None,
+    ):
+        self._limits = limits
+        self._timeout = timeout
+        self._max_concurrent_requests = max_concurrent_requests
+        self._host_to_max_concurrent_requests = host_to_max_concurrent_requests or {}
+        self._http2 = http2
+        self._transport = transport
+        self._breaker_factory = breaker_factory
+        if http2 and not is_http2_available():
+            logger.warning('HTTP/2 is enabled, but "h2" package is not installed. Falling back to HTTP/1.1')
+            self._http2 = False
+        self._base_url_to_client: dict[str, httpx.AsyncClient] = {}
+        self._host_to_limited_transport: dict[str, ConcurrencyLimitedTransport] = {}
+        self._host_to_breaker: dict[str, CircuitBreaker] = {}
+
+    @property
+    def http2(self) -> bool:
+        return self._http2
+
+    def get(self, url: str) -> httpx.AsyncClient:
+        """Get client of URL's host, created on first use."""
+        scheme, host, *_ = urlsplit(url)
+        base_url = f'{scheme}://{host}'
+        client = self._base_url_to_client.get(base_url)
+        if client is None or client.is_closed:
+            client = self._build_client(base_url, host)
+            self._base_url_to_client[base_url] = client
+        return client
+
+    def start(self, urls: tuple[str, ...] = (
+            OFFICE_MANAGER_URL, SHIFT_MANAGER_URL, PUBLIC_DODO_API_URL, PRIVATE_DODO_API_URL)):
+        for url in urls:
+            self.get(url)
+
+    def stats(self) -> dict[str, dict]:
+        """Requests in flight and circuit breaker state by host."""
+        host_to_stats = {}
+        for host, limited_transport in self._host_to_limited_transport.items():
+            host_to_stats[host] = {'in_flight': limited_transport.in_flight_count}
+            if breaker := self._host_to_breaker.get(host):
+                host_to_stats[host] |= breaker.stats()
+        return host_to_stats
+
+    async def close(self):
+        clients = list(self._base_url_to_client.values())
+        self._base_url_to_client.clear()
+        for client in clients:
+            await client.aclose()
+
+    def _build_client(self, base_url: str, host: str) -> httpx.AsyncClient:
+        transport = self._transport or httpx.AsyncHTTPTransport(http2=self._http2, limits=self._limits)
+        max_concurrent_requests = self._host_to_max_concurrent_requests.get(host, self._max_concurrent_requests)
+        transport = ConcurrencyLimitedTransport(transport, max_concurrent_requests)
+        self._host_to_limited_transport[host] = transport
+        if self._breaker_factory is not None:
+            # Breaker outlives client, so that recreated client doesn't reset state of unavailable host.
+            breaker = self._host_to_breaker.setdefault(host, self._breaker_factory())
+            transport = CircuitBreakerTransport(transport, breaker)
+        return httpx.AsyncClient(
+            base_url=base_url,
+            timeout=self._timeout,
+            cookies=CookieJar(policy=DefaultCookiePolicy(allowed_domains=[])),
+            transport=transport,
+        )
+
+
+http_clients = HTTPClients(
+    limits=httpx.Limits(
+        max_connections=app_settings.http_max_connections_per_host,
+        max_keepalive_connections=app_settings.http_max_keepalive_connections_per_host,
+        keepalive_expiry=app_settings.http_keepalive_expiry,
+    ),
+    timeout=app_settings.http_timeout,
+    max_concurrent_requests=app_settings.http_max_concurrent_requests_per_host,
+    host_to_max_concurrent_requests=app_settings.http_max_concurrent_requests,
+    http2=app_settings.is_http2_enabled,
+    breaker_factory=functools.partial(
+        CircuitBreaker,
+        failure_rate_threshold=app_settings.circuit_breaker_failure_rate_threshold,
+        min_calls=app_settings.circuit_breaker_min_calls,
+        window=app_settings.circuit_breaker_window,
+        open_time=app_settings.circuit_breaker_open_time,
+    ) if app_settings.is_circuit_breaker_enabled else None,
+)
@@ -0,0 +1,41 @@
+import asyncio
+from collections import deque
+from typing import AsyncGenerator, Awaitable, Callable, TypeVar
+
+__all__ = (
+    'paginate',
+)
+
+T = TypeVar('T')
+
+
+async def paginate(
+        fetch_page: Callable[[int], Awaitable[list[T]]],
+        window: int,
+        first_page: int = 1,
+) -> AsyncGenerator[list[T], None]:
+    """Fetch pages of report speculatively, up to ``window`` pages at once.
+
+    Pages are yielded in order, and pagination stops at the first empty page.
+    Pages requested past the last one are cancelled, and their results or errors are discarded.
+
+    Args:
+        fetch_page: Coroutine function that fetches page by its number.
+        window: Max number of pages requested concurrently.
+        first_page: Number of the first page.
+    """
+    tasks: deque[asyncio.Task] = deque()
+    next_page = first_page
+    try:
+        while True:
+            while len(tasks) < window:
+                tasks.append(asyncio.create_task(fetch_page(next_page)))
+                next_page += 1
+            page = await tasks.popleft()
+            if not page:
+                return
+            yield page
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
@@ -1,67 +1,91 @@
-import statistics
+import asyncio
+import logging
 import uuid
-from typing import Iterable
+from dataclasses import dataclass
+from typing import Generic, Iterable, Type, TypeVar
 
-import httpx
-from pydantic import parse_obj_as
+from pydantic import BaseModel
 
 import models
 from core import config
+from core.config import app_settings
+from services.api.http_clients import http_clients
 from utils import time_utils, exceptions
+from utils.json_stream import iter_array_items
+from utils.single_flight import single_flight
+
+__all__ = (
+    'ShardedResponse',
+    'get_delivery_statistics',
+    'get_ingredient_stop_sales',
+    'get_channels_stop_sales',
+    'get_products_stop_sales',
+    'get_orders_handover_time',
+)
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar('T')
+M = TypeVar('M', bound=BaseModel)
+
+
+@dataclass(frozen=True, slots=True)
+class ShardedResponse(Generic[T]):
+    """Merged response of shards, with units of failed shards."""
+    items: list[T]
+    error_unit_uuids: list[uuid.UUID]
 
 
 async def get_delivery_statistics(
         token: str,
         unit_uuids: Iterable[uuid.UUID],
         datetime_config: time_utils.Period
-) -> list[models.UnitDeliveryStatistics]:
+) -> ShardedResponse[models.UnitDeliveryStatistics]:
     url = 'https://api.dodois.io/dodopizza/ru/delivery/statistics/'
-    response_json = await request_to_private_dodo_api(url, token, unit_uuids, datetime_config)
-    return parse_obj_as(list[models.UnitDeliveryStatistics],
-                        response_json['unitsStatistics'])
+    return await request_to_private_dodo_api(
+        url, token, unit_uuids, datetime_config, 'unitsStatistics', models.UnitDeliveryStatistics)
 
 
 async def get_ingredient_stop_sales(
         token: str,
         unit_uuids: Iterable[uuid.UUID],
         datetime_config: time_utils.Period,
-) -> list[models.StopSalesByIngredients]:
+) -> ShardedResponse[models.StopSalesByIngredients]:
     url = 'https://api.dodois.io/dodopizza/ru/production/stop-sales-ingredients'
-    ingredient_stop_sales = await request_to_private_dodo_api(url, token, unit_uuids, datetime_config)
-    return parse_obj_as(list[models.StopSalesByIngredients],
-                        ingredient_stop_sales['stopSalesByIngredients'])
+    return await request_to_private_dodo_api(
+        url, token, unit_uuids, datetime_config, 'stopSalesByIngredients', models.StopSalesByIngredients)
 
 
 async def get_channels_stop_sales(
         token: str,
         unit_uuids: Iterable[uuid.UUID],
         datetime_config: time_utils.Period,
-) -> list[models.StopSalesBySalesChannels]:
+) -> ShardedResponse[models.StopSalesBySalesChannels]:
     url = 'https://api.dodois.io/dodopizza/ru/production/stop-sales-channels'
-    channels_stop_sales = await request_to_private_dodo_api(url, token, unit_uuids, datetime_config)
-    return parse_obj_as(list[models.StopSalesBySalesChannels],
-                        channels_stop_sales['stopSalesBySalesChannels'])
+    return await request_to_private_dodo_api(
+        url, token, unit_uuids, datetime_config, 'stopSalesBySalesChannels', models.StopSalesBySalesChannels)
 
 
 async def get_products_stop_sales(
         token: str,
         unit_uuids: Iterable[uuid.UUID],
         datetime_config: time_utils.Period,
-) -> list[models.StopSalesByProduct]:
+) -> ShardedResponse[models.StopSalesByProduct]:
     url = 'https://api.dodois.io/dodopizza/ru/production/stop-sales-products'
-    products_stop_sales = await request_to_private_dodo_api(url, token, unit_uuids, datetime_config)
-    return parse_obj_as(list[models.StopSalesByProduct],
-                        products_stop_sales['stopSalesByProducts'])
+    return await request_to_private_dodo_api(
+        url, token, unit_uuids, datetime_config, 'stopSalesByProducts', models.StopSalesByProduct)
 
 
 async def get_orders_handover_time(
         token: str,
         unit_uuids: Iterable[uuid.UUID],
         datetime_config: time_utils.Period,
-) -> list[models.OrdersHandoverTime]:
+) -> ShardedResponse[models.OrdersHandoverTime]:
     url = 'https://api.dodois.io/dodopizza/ru/production/orders-handover-time'
-    response_json = await request_to_private_dodo_api(url, token, unit_uuids, datetime_config)
-    return parse_obj_as(list[models.OrdersHandoverTime], response_json['ordersHandoverTime'])
+    # Orders are fetched incrementally, so period may start at any time of day.
+    return await request_to_private_dodo_api(
+        url, token, unit_uuids, datetime_config, 'ordersHandoverTime', models.OrdersHandoverTime,
+        is_from_start_of_day=False)
 
 
 async def request_to_private_dodo_api(
@@ -69,21 +93,74 @@ async def request_to_private_dodo_api(
         token: str,
         unit_uuids: Iterable[uuid.UUID],
         datetime_config: time_utils.Period,
-) -> dict:
+        items_key: str,
+        item_model: Type[M],
+        is_from_start_of_day: bool = True,
+) -> ShardedResponse[M]:
+    """Request units by shards of ``private_dodo_api_shard_size`` units concurrently and merge items of responses.
+
+    Failed shard doesn't fail the others, and its units are reported as errors.
+
+    Raises:
+        exceptions.PrivateDodoAPIError: if every shard has failed.
+    """
+    # Units are sorted, so that the same units are sharded the same way and coalesced.
+    unit_uuids = sorted(set(unit_uuids))
+    shard_size = app_settings.private_dodo_api_shard_size
+    shards = [unit_uuids[i:i + shard_size] for i in range(0, len(unit_uuids), shard_size)]
+    tasks = (request_shard_to_private_dodo_api(
+        url, token, shard, datetime_config, items_key, item_model, is_from_start_of_day) for shard in shards)
+    responses = await asyncio.gather(*tasks, return_exceptions=True)
+
+    items: list[M] = []
+    error_unit_uuids: list[uuid.UUID] = []
+    errors: list[Exception] = []
+    for shard, response in zip(shards, responses):
+        if isinstance(response, Exception):
+            logger.warning('Could not request %d units from %s: %r', len(shard), url, response)
+            errors.append(response)
+            error_unit_uuids += shard
+        elif isinstance(response, BaseException):
+            raise response
+        else:
+            items += response
+    if errors and len(errors) == len(shards):
+        raise errors[0]
+    return ShardedResponse(items=items, error_unit_uuids=error_unit_uuids)
+
+
+async def request_shard_to_private_dodo_api(
+        url: str,
+        token: str,
+        unit_uuids: Iterable[uuid.UUID],
+        datetime_config: time_utils.Period,
+        items_key: str,
+        item_model: Type[M],
+        is_from_start_of_day: bool = True,
+) -> list[M]:
+    """Request shard of units, decoding items of response one by one while it's being received.
+
+    Neither the whole body nor its decoded tree is kept in memory, only validated items.
+    """
     headers = {
         'User-Agent': config.APP_USER_AGENT,
         'Authorization': f'Bearer {token}',
     }
     params = {
         'units': ','.join([i.hex for i in unit_uuids]),
-        'from': datetime_config.from_datetime.strftime('%Y-%m-%dT00:00:00'),
+        'from': datetime_config.from_datetime.strftime(
+            '%Y-%m-%dT00:00:00' if is_from_start_of_day else '%Y-%m-%dT%H:%M:%S'),
         'to': datetime_config.to_datetime.strftime('%Y-%m-%dT%H:%M:%S'),
     }
-    async with httpx.AsyncClient() as client:
-        response = await client.get(url, params=params, headers=headers)
-    if not response.is_success:
-        raise exceptions.PrivateDodoAPIError(status_code=response.status_code)
-    return response.json()
+
+    async def request():
+        async with http_clients.get(url).stream('GET', url, params=params, headers=headers) as response:
+            if not response.is_success:
+                raise exceptions.PrivateDodoAPIError(status_code=response.status_code)
+            return [item_model.parse_obj(item) async for item in iter_array_items(response.aiter_bytes(), items_key)]
+
+    # Token is a part of the key since responses of private API depend on access rights.
+    return await single_flight.do(('private_dodo_api', url, token, *params.values()), request)
 
 
 if __name__ == '__main__':
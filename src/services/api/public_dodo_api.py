@@ -5,7 +5,9 @@ import httpx
 
 import models
 from core import config
+from services.api.http_clients import http_clients, PUBLIC_DODO_API_URL
 from utils import exceptions
+from utils.single_flight import single_flight
 
 __all__ = (
     'get_operational_statistics_for_today_and_week_before',
@@ -22,21 +24,32 @@ async def get_operational_statistics_for_today_and_week_before(
 ) -> models.UnitOperationalStatisticsForTodayAndWeekBefore:
     """Get operational statistics for exact unit.
 
+    Concurrent calls for the same unit are coalesced into one request.
+
     Args:
+        client: HTTP client.
         unit_id: id of unit.
 
     Returns:
         ``models.OperationalStatisticsForTodayAndWeekBefore`` on success.
 
     Raises:
-        exceptions.OperationalStatisticsAPIError on error with unit id.
+        exceptions.OperationalStatisticsAPIError on error with unit id,
+        including unavailable upstream.
     """
     url = f'https://publicapi.dodois.io/ru/api/v1/OperationalStatisticsForTodayAndWeekBefore/{unit_id}'
     headers = {'User-Agent': config.APP_USER_AGENT}
-    response = await client.get(url=url, headers=headers)
-    if not response.is_success:
-        raise exceptions.OperationalStatisticsAPIError(unit_id=unit_id)
-    return models.UnitOperationalStatisticsForTodayAndWeekBefore.parse_obj(response.json())
+
+    async def request():
+        try:
+            response = await client.get(url=url, headers=headers, timeout=60)
+        except httpx.TransportError as error:
+            raise exceptions.OperationalStatisticsAPIError(unit_id=unit_id) from error
+        if not response.is_success:
+            raise exceptions.OperationalStatisticsAPIError(unit_id=unit_id)
+        return models.UnitOperationalStatisticsForTodayAndWeekBefore.parse_obj(response.json())
+
+    return await single_flight.do(('operational_statistics', unit_id), request)
 
 
 async def get_operational_statistics_for_today_and_week_before_batch(
@@ -51,9 +64,9 @@ async def get_operational_statistics_for_today_and_week_before_batch(
         Object that contains ``models.OperationalStatisticsForTodayAndWeekBefore``
         and unit ids of unsuccessful responses.
     """
-    async with httpx.AsyncClient(timeout=60) as client:
-        tasks = (get_operational_statistics_for_today_and_week_before(client, unit_id) for unit_id in unit_ids)
-        responses: tuple[OperationalStatisticsAPIResponse, ...] = await asyncio.gather(*tasks, return_exceptions=True)
+    client = http_clients.get(PUBLIC_DODO_API_URL)
+    tasks = (get_operational_statistics_for_today_and_week_before(client, unit_id) for unit_id in unit_ids)
+    responses: tuple[OperationalStatisticsAPIResponse, ...] = await asyncio.gather(*tasks, return_exceptions=True)
 
     units: list[models.UnitOperationalStatisticsForTodayAndWeekBefore] = []
     error_unit_ids: list[int] = []
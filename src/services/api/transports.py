@@ -0,0 +1,227 @@
+import asyncio
+import time
+from collections import deque
+from enum import Enum
+from typing import AsyncIterator, Callable
+
+import httpx
+
+__all__ = (
+    'ConcurrencyLimitedTransport',
+    'CircuitState',
+    'CircuitBreaker',
+    'CircuitOpenError',
+    'CircuitBreakerTransport',
+)
+
+
+class ReleasingByteStream(httpx.AsyncByteStream):
+    """Response stream that calls ``release`` once, when it's closed."""
+
+    def __init__(self, stream: httpx.AsyncByteStream, release: Callable[[], None]):
+        self._stream = stream
+        self._release = release
+        self._is_released = False
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        async for chunk in self._stream:
+            yield chunk
+
+    async def aclose(self):
+        try:
+            await self._stream.aclose()
+        finally:
+            if not self._is_released:
+                self._is_released = True
+                self._release()
+
+
+class ConcurrencyLimitedTransport(httpx.AsyncBaseTransport):
+    """Transport that limits number of requests in flight.
+
+    Request holds its slot until its response is read and closed,
+    so every caller sharing the transport shares the same limit.
+    Requests beyond the limit wait for a free slot in FIFO order.
+    """
+
+    def __init__(self, transport: httpx.AsyncBaseTransport, max_concurrent_requests: int):
+        self._transport = transport
+        self._max_concurrent_requests = max_concurrent_requests
+        self._semaphore = asyncio.Semaphore(max_concurrent_requests)
+        self._in_flight_count = 0
+
+    @property
+    def in_flight_count(self) -> int:
+        return self._in_flight_count
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        await self._semaphore.acquire()
+        self._in_flight_count += 1
+        try:
+            response = await self._transport.handle_async_request(request)
+        except BaseException:
+            self._release()
+            raise
+        # Response with in-memory body is already read and closed, so its stream is never closed by client.
+        if response.is_closed or isinstance(response.stream, httpx.ByteStream):
+            self._release()
+        else:
+            response.stream = ReleasingByteStream(response.stream, self._release)
+        return response
+
+    async def aclose(self):
+        await self._transport.aclose()
+
+    def _release(self):
+        self._in_flight_count -= 1
+        self._semaphore.release()
+
+
+class CircuitState(Enum):
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+
+class CircuitOpenError(httpx.TransportError):
+    """Request has not been sent, since upstream host is considered unavailable."""
+
+    def __init__(self, message: str, *, request: httpx.Request, retry_after: float):
+        super().__init__(message, request=request)
+        self.retry_after = retry_after
+
+
+class CircuitBreaker:
+    """Tracks failure rate of calls to upstream within sliding time window.
+
+    Circuit opens once at least ``min_calls`` calls have been made within ``window`` seconds
+    and share of failed ones reaches ``failure_rate_threshold``.
+    Open circuit rejects calls for ``open_time`` seconds, then lets one probe call through:
+    success of the probe closes the circuit, failure opens it again.
+
+    Every change of state starts new generation of circuit. Outcomes of calls admitted in earlier generations
+    are ignored, so that slow calls made before circuit has opened are not taken for the probe.
+    """
+
+    def __init__(
+            self,
+            failure_rate_threshold: float,
+            min_calls: int,
+            window: float,
+            open_time: float,
+    ):
+        self._failure_rate_threshold = failure_rate_threshold
+        self._min_calls = min_calls
+        self._window = window
+        self._open_time = open_time
+        self._outcomes: deque[tuple[float, bool]] = deque()
+        self._failures_count = 0
+        self._state = CircuitState.CLOSED
+        self._opened_at = 0.0
+        self._is_probing = False
+        self._generation = 0
+
+    @property
+    def state(self) -> CircuitState:
+        if self._state is CircuitState.OPEN and time.monotonic() - self._opened_at >= self._open_time:
+            return CircuitState.HALF_OPEN
+        return self._state
+
+    @property
+    def retry_after(self) -> float:
+        """Seconds until the next probe call is let through."""
+        return max(0.0, self._opened_at + self._open_time - time.monotonic())
+
+    def allow(self) -> int | None:
+        """Generation of circuit in which call is admitted, or None if call may not be made.
+
+        Caller must report outcome of admitted call with ``record`` or ``cancel``, passing the generation.
+        """
+        state = self.state
+        if state is CircuitState.CLOSED:
+            return self._generation
+        if state is CircuitState.HALF_OPEN and not self._is_probing:
+            self._state = CircuitState.HALF_OPEN
+            self._is_probing = True
+            self._generation += 1
+            return self._generation
+        return None
+
+    def record(self, generation: int, is_failure: bool):
+        if generation != self._generation:
+            return
+        now = time.monotonic()
+        if self._state is CircuitState.HALF_OPEN:
+            self._is_probing = False
+            if is_failure:
+                self._open(now)
+            else:
+                self._state = CircuitState.CLOSED
+                self._generation += 1
+            return
+        self._outcomes.append((now, is_failure))
+        self._failures_count += is_failure
+        while self._outcomes and now - self._outcomes[0][0] > self._window:
+            _, is_expired_failure = self._outcomes.popleft()
+            self._failures_count -= is_expired_failure
+        calls_count = len(self._outcomes)
+        if calls_count >= self._min_calls and self._failures_count / calls_count >= self._failure_rate_threshold:
+            self._open(now)
+
+    def cancel(self, generation: int):
+        """Forget call which has been allowed, but hasn't completed."""
+        if generation == self._generation and self._state is CircuitState.HALF_OPEN:
+            self._is_probing = False
+
+    def stats(self) -> dict[str, str | int | float]:
+        calls_count = len(self._outcomes)
+        return {
+            'state': self.state.value,
+            'calls': calls_count,
+            'failure_rate': self._failures_count / calls_count if calls_count else 0.0,
+            'retry_after': self.retry_after if self.state is CircuitState.OPEN else 0.0,
+        }
+
+    def _open(self, now: float):
+        self._state = CircuitState.OPEN
+        self._opened_at = now
+        self._generation += 1
+        self._outcomes.clear()
+        self._failures_count = 0
+
+
+class CircuitBreakerTransport(httpx.AsyncBaseTransport):
+    """Transport that fails fast with ``CircuitOpenError`` while upstream host is unavailable.
+
+    Transport errors and 5xx responses are counted as failures.
+    """
+
+    def __init__(self, transport: httpx.AsyncBaseTransport, breaker: CircuitBreaker):
+        self._transport = transport
+        self._breaker = breaker
+
+    @property
+    def breaker(self) -> CircuitBreaker:
+        return self._breaker
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        generation = self._breaker.allow()
+        if generation is None:
+            raise CircuitOpenError(
+                f'Circuit of {request.url.host} is open',
+                request=request,
+                retry_after=self._breaker.retry_after,
+            )
+        try:
+            response = await self._transport.handle_async_request(request)
+        except httpx.TransportError:
+            self._breaker.record(generation, is_failure=True)
+            raise
+        except BaseException:
+            self._breaker.cancel(generation)
+            raise
+        self._breaker.record(generation, is_failure=response.status_code >= 500)
+        return response
+
+    async def aclose(self):
+        await self._transport.aclose()
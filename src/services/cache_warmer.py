@@ -0,0 +1,154 @@
+import asyncio
+import logging
+import random
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Hashable, Iterable
+
+from core.config import app_settings
+from db.cache import get_expire_time, refresh_ahead_time
+from utils.credentials import get_credentials_ref
+
+__all__ = (
+    'WarmUpJob',
+    'CacheWarmer',
+    'cache_warmer',
+)
+
+logger = logging.getLogger(__name__)
+
+is_warming_up: ContextVar[bool] = ContextVar('is_warming_up', default=False)
+
+
+@dataclass(slots=True)
+class WarmUpJob:
+    dataset: str
+    refresh: Callable[[], Awaitable[Any]]
+    requested_at: float
+    next_run_at: float
+    is_running: bool = False
+
+
+class CacheWarmer:
+    """Refreshes cached datasets of recently requested unit sets ahead of their expiry,
+    so that user requests are cache hits.
+
+    Unit set is registered on every user request while warmer is running,
+    and is warmed up until it hasn't been requested for ``idle_timeout`` seconds.
+    Job runs once per expiration time of its dataset with jitter, so refreshes are spread evenly.
+    """
+
+    def __init__(
+            self,
+            max_concurrency: int,
+            idle_timeout: float,
+            refresh_ahead_ratio: float,
+            tick: float = 1,
+    ):
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._idle_timeout = idle_timeout
+        self._refresh_ahead_ratio = refresh_ahead_ratio
+        self._tick = tick
+        self._key_to_job: dict[Hashable, WarmUpJob] = {}
+        self._task: asyncio.Task | None = None
+        self._job_tasks: set[asyncio.Task] = set()
+        self.runs = 0
+        self.errors = 0
+
+    def register(
+            self,
+            dataset: str,
+            unit_ids: Iterable[Hashable],
+            credentials: str | dict | None,
+            refresh: Callable[[], Awaitable[Any]],
+    ):
+        """Register or prolong warming up of unit set.
+
+        Args:
+            dataset: Dataset prefix of cache keys.
+            unit_ids: Requested units.
+            credentials: Cookies or token used to request units.
+            refresh: Coroutine function that requests units the same way as the user did.
+        """
+        # Without running warmer, idle jobs would never be removed and would keep credentials in memory.
+        if self._task is None or is_warming_up.get():
+            return
+        key = (dataset, frozenset(unit_ids), get_credentials_ref(credentials))
+        now = time.monotonic()
+        job = self._key_to_job.get(key)
+        if job is None:
+            self._key_to_job[key] = WarmUpJob(
+                dataset=dataset,
+                refresh=refresh,
+                requested_at=now,
+                next_run_at=now + self._get_interval(dataset),
+            )
+        else:
+            job.refresh = refresh
+            job.requested_at = now
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self.run())
+
+    async def stop(self):
+        if self._task is None:
+            return
+        self._task.cancel()
+        for task in self._job_tasks:
+            task.cancel()
+        await asyncio.gather(self._task, *self._job_tasks, return_exceptions=True)
+        self._task = None
+        self._key_to_job.clear()
+
+    async def run(self):
+        while True:
+            self.run_pending_jobs()
+            await asyncio.sleep(self._tick)
+
+    def run_pending_jobs(self):
+        now = time.monotonic()
+        for key, job in list(self._key_to_job.items()):
+            if now - job.requested_at > self._idle_timeout:
+                del self._key_to_job[key]
+            elif job.next_run_at <= now and not job.is_running:
+                job.is_running = True
+                job.next_run_at = now + self._get_interval(job.dataset)
+                task = asyncio.create_task(self._run_job(job))
+                self._job_tasks.add(task)
+                task.add_done_callback(self._job_tasks.discard)
+
+    def stats(self) -> dict[str, int]:
+        return {
+            'jobs': len(self._key_to_job),
+            'running_jobs': len(self._job_tasks),
+            'runs': self.runs,
+            'errors': self.errors,
+        }
+
+    def _get_interval(self, dataset: str) -> float:
+        """Time until the next run, such that it falls within refresh ahead window of the next expiry."""
+        expire_time = get_expire_time(dataset)
+        refresh_ahead = expire_time * self._refresh_ahead_ratio
+        return expire_time - random.uniform(0, refresh_ahead)
+
+    async def _run_job(self, job: WarmUpJob):
+        try:
+            async with self._semaphore:
+                is_warming_up.set(True)
+                refresh_ahead_time.set(get_expire_time(job.dataset) * self._refresh_ahead_ratio)
+                await job.refresh()
+            self.runs += 1
+        except Exception:
+            self.errors += 1
+            logger.exception('Could not warm up %s', job.dataset)
+        finally:
+            job.is_running = False
+
+
+cache_warmer = CacheWarmer(
+    max_concurrency=app_settings.cache_warmer_max_concurrency,
+    idle_timeout=app_settings.cache_warmer_idle_timeout,
+    refresh_ahead_ratio=app_settings.cache_warmer_refresh_ahead_ratio,
+)
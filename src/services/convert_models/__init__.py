@@ -2,4 +2,3 @@ from .delivery import *
 from .kitchen import *
 from .revenue import *
 from .orders import *
-from .production import *
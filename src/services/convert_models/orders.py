@@ -1,6 +1,7 @@
-from typing import Sequence, Iterable
+from collections import defaultdict
+from typing import Iterable
 
-import pandas as pd
+import numpy as np
 
 import models
 import models.dodo_is_api.orders
@@ -8,12 +9,12 @@ from utils.calculations import calculate_orders_with_phone_number_percent
 
 
 def restaurant_orders_to_bonus_system_statistics(
-        units_restaurant_orders: Iterable[Sequence[tuple[str, pd.DataFrame]]],
+        units_restaurant_orders: Iterable[models.UnitRestaurantOrders],
 ) -> list[models.dodo_is_api.orders.UnitBonusSystem]:
     result = []
-    for unit_name, grouped_df in units_restaurant_orders:
-        orders_with_phone_numbers_count = len(grouped_df[grouped_df['№ телефона'].notnull()].index)
-        total_orders_count = len(grouped_df.index)
+    for unit_orders in units_restaurant_orders:
+        orders_with_phone_numbers_count = int(np.count_nonzero(unit_orders.with_phone_number))
+        total_orders_count = len(unit_orders)
         orders_with_phone_numbers_percent = calculate_orders_with_phone_number_percent(
             orders_with_phone_numbers_count, total_orders_count)
 
@@ -21,28 +22,32 @@ def restaurant_orders_to_bonus_system_statistics(
             orders_with_phone_numbers_count=orders_with_phone_numbers_count,
             orders_with_phone_numbers_percent=orders_with_phone_numbers_percent,
             total_orders_count=total_orders_count,
-            unit_name=unit_name,
+            unit_name=unit_orders.unit_name,
         ))
     return result
 
 
 def restaurant_orders_to_cheated_orders(
-        units_restaurant_orders: Iterable[Sequence[tuple[str, pd.DataFrame]]],
+        units_restaurant_orders: Iterable[models.UnitRestaurantOrders],
         repeated_phone_number_count_threshold: int,
 ) -> list[models.CheatedOrders]:
     result = []
-    for unit_name, grouped_df in units_restaurant_orders:
-        for phone_number, grouped_by_phone_number_df in grouped_df.groupby('№ телефона'):
-            if len(grouped_by_phone_number_df.index) < repeated_phone_number_count_threshold:
+    for unit_orders in units_restaurant_orders:
+        phone_number_to_indices: defaultdict[str, list[int]] = defaultdict(list)
+        for index in np.flatnonzero(unit_orders.with_phone_number):
+            phone_number_to_indices[unit_orders.phone_numbers[index]].append(index)
+        for phone_number in sorted(phone_number_to_indices):
+            indices = phone_number_to_indices[phone_number]
+            if len(indices) < repeated_phone_number_count_threshold:
                 continue
             cheated_orders = [
                 models.CheatedOrder(
-                    created_at=row[0],
-                    number=row[1],
-                ) for row in grouped_by_phone_number_df[['Дата и время', '№ заказа']].to_numpy()
+                    created_at=unit_orders.created_at[index].item(),
+                    number=unit_orders.numbers[index],
+                ) for index in indices
             ]
             result.append(models.CheatedOrders(
-                unit_name=unit_name,
+                unit_name=unit_orders.unit_name,
                 phone_number=phone_number,
                 orders=cheated_orders
             ))
@@ -0,0 +1,105 @@
+import asyncio
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable, TypeVar
+
+from core.config import app_settings
+
+__all__ = (
+    'ParseExecutor',
+    'parse_executor',
+)
+
+T = TypeVar('T')
+
+
+class ParseExecutor:
+    """Runs parsing of upstream pages in process pool, so that large pages don't block event loop.
+
+    Pages shorter than ``inline_threshold`` characters are parsed inline, since sending them
+    to another process costs more than parsing itself. So are all pages while executor isn't started.
+    At most ``max_workers + queue_size`` pages are submitted to pool at a time, the rest wait for a slot.
+    Pool broken by death of a worker is recreated, and pages it was parsing are parsed once again in the new one.
+    """
+
+    def __init__(self, max_workers: int, queue_size: int, inline_threshold: int):
+        self._max_workers = max_workers
+        self._semaphore = asyncio.Semaphore(max_workers + queue_size)
+        self._inline_threshold = inline_threshold
+        self._pool: ProcessPoolExecutor | None = None
+        self._pending = 0
+        self.inline_runs = 0
+        self.pool_runs = 0
+        self.pool_restarts = 0
+
+    def start(self):
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self._max_workers)
+
+    async def close(self):
+        if self._pool is None:
+            return
+        pool, self._pool = self._pool, None
+        await asyncio.to_thread(pool.shutdown, cancel_futures=True)
+
+    async def run(self, func: Callable[..., T], html: str, *args) -> T:
+        """Call ``func(html, *args)`` inline or in pool depending on page size.
+
+        Args:
+            func: Picklable function, e.g. ``parse_html`` of parser class, returning picklable result.
+            html: Page to parse.
+            args: Other picklable arguments of ``func``.
+
+        Raises:
+            BrokenProcessPool: if worker has died parsing the page in recreated pool as well.
+        """
+        if self._pool is None or len(html) < self._inline_threshold:
+            self.inline_runs += 1
+            return func(html, *args)
+        self._pending += 1
+        try:
+            async with self._semaphore:
+                try:
+                    return await self._run_in_pool(func, html, *args)
+                except BrokenProcessPool:
+                    return await self._run_in_pool(func, html, *args)
+        finally:
+            self._pending -= 1
+
+    async def _run_in_pool(self, func: Callable[..., T], html: str, *args) -> T:
+        pool = self._pool
+        # Executor may have been closed while waiting for a slot.
+        if pool is None:
+            self.inline_runs += 1
+            return func(html, *args)
+        self.pool_runs += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(pool, func, html, *args)
+        except BrokenProcessPool:
+            await self._restart(pool)
+            raise
+
+    async def _restart(self, broken_pool: ProcessPoolExecutor):
+        """Replace pool whose worker has died, since broken pool rejects all calls."""
+        # Calls broken by the same worker restart pool once, and closed executor isn't restarted.
+        if self._pool is not broken_pool:
+            return
+        self._pool = ProcessPoolExecutor(max_workers=self._max_workers)
+        self.pool_restarts += 1
+        await asyncio.to_thread(broken_pool.shutdown, cancel_futures=True)
+
+    def stats(self) -> dict[str, int | bool]:
+        return {
+            'is_running': self._pool is not None,
+            'pending': self._pending,
+            'inline_runs': self.inline_runs,
+            'pool_runs': self.pool_runs,
+            'pool_restarts': self.pool_restarts,
+        }
+
+
+parse_executor = ParseExecutor(
+    max_workers=app_settings.parse_executor_max_workers,
+    queue_size=app_settings.parse_executor_queue_size,
+    inline_threshold=app_settings.parse_executor_inline_threshold,
+)
@@ -1 +1,5 @@
+from core.config import app_settings
 from .html import *
+
+if app_settings.html_parser_backend == 'lxml':
+    from .lxml_html import *
@@ -0,0 +1,31 @@
+import re
+
+__all__ = (
+    'get_start_tag_pattern',
+    'find_element_html',
+)
+
+
+def get_start_tag_pattern(tag: str, attribute: str, value: str) -> re.Pattern:
+    """Pattern of start tag, whose attribute contains value among space separated ones, e.g. ``class``."""
+    return re.compile(
+        rf'<{tag}(?=[\s>])[^>]*?\s{attribute}\s*=\s*["\']?(?:[^"\'>]*?\s)?{re.escape(value)}(?=[\s"\'>])[^>]*>',
+        re.IGNORECASE,
+    )
+
+
+def find_element_html(html: str, tag: str, start_tag_pattern: re.Pattern) -> str | None:
+    """Outer HTML of the first element matching start tag pattern, found without parsing the page.
+
+    Elements with the same tag nested into the found one are skipped to find its end tag.
+    Element without end tag spans to the end of page, as HTML parser would treat it.
+    """
+    start_tag = start_tag_pattern.search(html)
+    if start_tag is None:
+        return None
+    depth = 1
+    for tag_match in re.compile(rf'<(/?){tag}(?=[\s/>])[^>]*>', re.IGNORECASE).finditer(html, start_tag.end()):
+        depth += -1 if tag_match.group(1) else 1
+        if not depth:
+            return html[start_tag.start():tag_match.end()]
+    return html[start_tag.start():]
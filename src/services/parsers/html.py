@@ -2,13 +2,16 @@ import re
 import unicodedata
 import uuid
 from abc import ABC, abstractmethod
+from collections import Counter
 from typing import Any, Iterable
 
-import pandas as pd
+import lxml.html
 from bs4 import BeautifulSoup
 
 import models.dodo_is_api.partial_statistics.delivery as delivery_models
 import models.dodo_is_api.partial_statistics.kitchen as kitchen_models
+from services.parsers.fragments import find_element_html, get_start_tag_pattern
+from services.parsers.tables import iter_table_rows
 
 __all__ = (
     'PartialStatisticsParser',
@@ -25,6 +28,11 @@ __all__ = (
 
 import models.dodo_is_api.partial_statistics.kitchen
 
+NO_DATA_PATTERN = re.compile(r'данные\s+не\s+найдены', re.IGNORECASE)
+ORDER_NUMBER_START_TAG = get_start_tag_pattern('span', 'id', 'orderNumber')
+HEADER_DEPARTMENT_START_TAG = get_start_tag_pattern('div', 'class', 'headerDepartment')
+HISTORY_START_TAG = get_start_tag_pattern('div', 'id', 'history')
+
 
 class HTMLParser(ABC):
 
@@ -36,6 +44,11 @@ class HTMLParser(ABC):
     def parse(self) -> Any:
         pass
 
+    @classmethod
+    def parse_html(cls, html: str, *args) -> Any:
+        """Parse page with new parser, as picklable function for ``ParseExecutor``."""
+        return cls(html, *args).parse()
+
     @staticmethod
     def clear_extra_symbols(text: str) -> str:
         text = unicodedata.normalize('NFKD', text)
@@ -93,31 +106,41 @@ class KitchenStatisticsParser(PartialStatisticsParser):
 
 
 class BeingLateCertificatesParser(HTMLParser):
+    """Counts being late certificates per unit in one pass over report, without building soup."""
 
     def __init__(self, html: str, request_unit_id: int, units: Iterable[models.UnitIdAndName]):
-        super().__init__(html)
+        self._html = html
         self._request_unit_id = request_unit_id
         self._unit_id_to_unit: dict[int, models.UnitIdAndName] = {unit.id: unit for unit in units}
         self._unit_name_to_unit: dict[str, models.UnitIdAndName] = {unit.name: unit for unit in units}
 
     def parse(self) -> list[models.UnitBeingLateCertificates]:
-        if 'данные не найдены' in self._soup.text.strip().lower():
-            return []
-        df = pd.read_html(self._html)[1]
-        if len(df.columns) == 7:
+        rows = iter_table_rows(self._html, table_index=1)
+        try:
+            header = next(rows, [])
+        except ValueError:
+            # Page without certificates has only a message instead of tables.
+            if NO_DATA_PATTERN.search(self._html):
+                return []
+            raise
+        # Report of single unit has no unit name column.
+        if 'Пиццерия' not in header:
             return [
                 models.UnitBeingLateCertificates(
                     unit_id=self._request_unit_id,
                     unit_name=self._unit_id_to_unit[self._request_unit_id].name,
-                    being_late_certificates_count=len(df.index),
+                    being_late_certificates_count=sum(1 for _ in rows),
                 )
             ]
+        unit_name_index = header.index('Пиццерия')
+        unit_name_to_count = Counter(
+            row[unit_name_index] for row in rows if len(row) > unit_name_index and row[unit_name_index])
         return [
             models.UnitBeingLateCertificates(
                 unit_id=self._unit_name_to_unit[unit_name].id,
                 unit_name=unit_name,
-                being_late_certificates_count=len(group.index)
-            ) for unit_name, group in df.groupby('Пиццерия')
+                being_late_certificates_count=count,
+            ) for unit_name, count in sorted(unit_name_to_count.items())
         ]
 
 
@@ -173,38 +196,44 @@ class OrdersPartial(HTMLParser):
 
 
 class OrderByUUIDParser(HTMLParser):
+    """Parses only order number, unit name and history of order page, found by scanning the page text.
+
+    Raises:
+        ValueError: if page has no such elements.
+    """
 
     def __init__(self, html: str, order_uuid: uuid.UUID, order_price: int, order_type: str):
-        super().__init__(html)
+        self._html = html
         self._order_uuid = order_uuid
         self._order_price = order_price
         self._order_type = order_type
 
+    def parse_element(self, tag: str, start_tag_pattern: re.Pattern) -> lxml.html.HtmlElement:
+        element_html = find_element_html(self._html, tag, start_tag_pattern)
+        if element_html is None:
+            raise ValueError(f'Order page has no {start_tag_pattern.pattern}')
+        return lxml.html.fragment_fromstring(element_html)
+
     def parse(self) -> models.OrderByUUID:
-        order_no = self._soup.find('span', id='orderNumber').text
-        department = self._soup.find('div', class_='headerDepartment').text
-        history = self._soup.find('div', id='history')
-        trs = history.find_all('tr')[1:]
-        order_created_at = receipt_printed_at = None
+        order_no = self.parse_element('span', ORDER_NUMBER_START_TAG).text_content()
+        department = self.parse_element('div', HEADER_DEPARTMENT_START_TAG).text_content()
+        history = self.parse_element('div', HISTORY_START_TAG)
+        order_created_at = rejected_at = None
         is_receipt_printed = False
-        for tr in trs:
-            _, msg, _ = tr.find_all('td')
-            msg = msg.text.lower().strip()
+        for tr in list(history.iter('tr'))[1:]:
+            dt, msg, _ = [td.text_content() for td in tr.iter('td')]
+            msg = msg.lower().strip()
             if 'закрыт чек на возврат' in msg:
                 is_receipt_printed = True
-                break
-        for tr in trs:
-            dt, msg, _ = tr.find_all('td')
-            msg = msg.text.lower().strip()
             if 'has been accepted' in msg:
-                order_created_at = dt.text
-            elif 'has been rejected' in msg and is_receipt_printed:
-                receipt_printed_at = dt.text
+                order_created_at = dt
+            elif 'has been rejected' in msg:
+                rejected_at = dt
         return models.OrderByUUID(
             number=order_no,
             unit_name=department,
             created_at=order_created_at,
-            receipt_printed_at=receipt_printed_at,
+            receipt_printed_at=rejected_at if is_receipt_printed else None,
             uuid=self._order_uuid,
             price=self._order_price,
             type=self._order_type,
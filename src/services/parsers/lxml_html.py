@@ -0,0 +1,181 @@
+"""Parsers of the same pages as ``services.parsers.html``, built on lxml tree with precompiled XPath selectors.
+
+Parsers have the same names, arguments and output as their BeautifulSoup counterparts,
+so that backend can be switched in config.
+"""
+import re
+from abc import ABC, abstractmethod
+from typing import Any
+
+import lxml.html
+from lxml import etree
+
+import models
+import models.dodo_is_api.partial_statistics.delivery as delivery_models
+import models.dodo_is_api.partial_statistics.kitchen as kitchen_models
+from services.parsers.html import HTMLParser
+
+__all__ = (
+    'KitchenStatisticsParser',
+    'DeliveryStatisticsHTMLParser',
+    'SectorStopSalesHTMLParser',
+    'StreetStopSalesHTMLParser',
+    'StockBalanceHTMLParser',
+)
+
+
+def has_class(class_name: str) -> str:
+    """XPath predicate matching element with class among others, like ``class_`` of BeautifulSoup."""
+    return f'contains(concat(" ", normalize-space(@class), " "), " {class_name} ")'
+
+
+PANEL_TITLES = etree.XPath(f'//h1[{has_class("operationalStatistics_panelTitle")}]')
+PRODUCTS_COUNT_VALUES = etree.XPath(f'//h1[{has_class("operationalStatistics_productsCountValue")}]')
+WEEK_AGO = etree.XPath(f'(//*[{has_class("operationalStatistics_weekAgo")}])[1]')
+BOOTGRID_TABLE = etree.XPath('(//table[@id="bootgrid-table"])[1]')
+FIRST_TBODY = etree.XPath('(.//tbody)[1]')
+ROWS = etree.XPath('.//tr')
+CELLS = etree.XPath('.//td')
+
+
+class LxmlHTMLParser(ABC):
+
+    clear_extra_symbols = staticmethod(HTMLParser.clear_extra_symbols)
+
+    def __init__(self, html: str):
+        self._html = html
+        self._tree = lxml.html.document_fromstring(html)
+
+    @abstractmethod
+    def parse(self) -> Any:
+        pass
+
+    @classmethod
+    def parse_html(cls, html: str, *args) -> Any:
+        """Parse page with new parser, as picklable function for ``ParseExecutor``."""
+        return cls(html, *args).parse()
+
+
+class LxmlPartialStatisticsParser(LxmlHTMLParser):
+
+    def __init__(self, html: str, unit_id: int | str):
+        super().__init__(html)
+        self._unit_id = unit_id
+        self._panel_titles = [self.clear_extra_symbols(h1.text_content()) for h1 in PANEL_TITLES(self._tree)]
+
+
+class KitchenStatisticsParser(LxmlPartialStatisticsParser):
+
+    def parse_kitchen_revenue(self) -> kitchen_models.KitchenRevenue:
+        per_hour, delta_from_week_before = self._panel_titles[0].split('\n')
+        return kitchen_models.KitchenRevenue(per_hour=per_hour, delta_from_week_before=delta_from_week_before)
+
+    def parse_product_spending(self) -> kitchen_models.ProductSpending:
+        per_hour, delta_from_week_before = self._panel_titles[1].split('\n')
+        return kitchen_models.ProductSpending(per_hour=per_hour, delta_from_week_before=delta_from_week_before)
+
+    def parse_tracking(self) -> kitchen_models.Tracking:
+        postponed, in_queue, in_work = [int(h1.text_content()) for h1 in PRODUCTS_COUNT_VALUES(self._tree)]
+        return kitchen_models.Tracking(postponed=postponed, in_queue=in_queue, in_work=in_work)
+
+    def parse_average_cooking_time(self) -> int:
+        minutes, seconds = map(int, self._panel_titles[3].split(':'))
+        return minutes * 60 + seconds
+
+    def parse(self) -> kitchen_models.KitchenWorkPartial:
+        return kitchen_models.KitchenWorkPartial(
+            unit_id=self._unit_id,
+            revenue=self.parse_kitchen_revenue(),
+            product_spending=self.parse_product_spending(),
+            average_cooking_time=self.parse_average_cooking_time(),
+            tracking=self.parse_tracking()
+        )
+
+
+class DeliveryStatisticsHTMLParser(LxmlPartialStatisticsParser):
+
+    def parse_delivery_performance(self) -> delivery_models.Performance:
+        deliveries_amount_per_hour, deliveries_percent = self._panel_titles[0].split('\n')
+        orders_week_before = WEEK_AGO(self._tree)[0].text_content().strip()
+        orders_week_before = re.findall(r'[0-9],[0-9]', orders_week_before)[0].replace(',', '.')
+        return delivery_models.Performance(
+            orders_for_courier_count_per_hour_today=deliveries_amount_per_hour,
+            delta_from_week_before=deliveries_percent,
+            orders_for_courier_count_per_hour_week_before=orders_week_before
+        )
+
+    def parse_couriers(self) -> delivery_models.Couriers:
+        couriers_total_count, couriers_in_queue_count = self._panel_titles[3].split('/')
+        return delivery_models.Couriers(in_queue_count=couriers_in_queue_count, total_count=couriers_total_count)
+
+    def parse_heated_shelf(self) -> delivery_models.HeatedShelf:
+        orders_on_heated_shelf_count = self._panel_titles[2]
+        minutes, seconds = map(int, self._panel_titles[5].split(':'))
+        orders_on_heated_shelf_time = minutes * 60 + seconds
+        return delivery_models.HeatedShelf(orders_count=orders_on_heated_shelf_count,
+                                           orders_awaiting_time=orders_on_heated_shelf_time)
+
+    def parse(self) -> delivery_models.DeliveryWorkPartial:
+        return delivery_models.DeliveryWorkPartial(
+            unit_id=self._unit_id,
+            performance=self.parse_delivery_performance(),
+            heated_shelf=self.parse_heated_shelf(),
+            couriers=self.parse_couriers(),
+        )
+
+
+class SectorStopSalesHTMLParser(LxmlHTMLParser):
+
+    def parse(self) -> list[models.StopSalesBySector]:
+        tbody = FIRST_TBODY(BOOTGRID_TABLE(self._tree)[0])[0]
+        nested_trs = [[td.text_content().strip() for td in CELLS(tr)] for tr in ROWS(tbody)]
+        return [
+            models.StopSalesBySector(
+                unit_name=tds[0],
+                sector=tds[1],
+                started_at=tds[2],
+                staff_name_who_stopped=tds[3],
+                staff_name_who_resumed=tds[5],
+            ) for tds in nested_trs
+        ]
+
+
+class StreetStopSalesHTMLParser(LxmlHTMLParser):
+
+    def parse(self) -> list[models.StopSalesByStreet]:
+        trs = ROWS(BOOTGRID_TABLE(self._tree)[0])[1:]
+        nested_trs = [[td.text_content().strip() for td in CELLS(tr)] for tr in trs]
+        return [
+            models.StopSalesByStreet(
+                unit_name=tds[0],
+                started_at=tds[3],
+                staff_name_who_stopped=tds[4],
+                staff_name_who_resumed=tds[6],
+                sector=tds[1],
+                street=tds[2],
+            ) for tds in nested_trs
+        ]
+
+
+class StockBalanceHTMLParser(LxmlHTMLParser):
+
+    def __init__(self, html: str, unit_id: int):
+        super().__init__(html)
+        self.unit_id = unit_id
+
+    def parse(self) -> list[models.StockBalance]:
+        result: list[models.StockBalance] = []
+        for tr in ROWS(FIRST_TBODY(self._tree)[0]):
+            tds = CELLS(tr)
+            if len(tds) != 6:
+                continue
+            ingredient_name, _, _, _, _, days_left = [td.text_content().strip() for td in tds]
+            if not days_left.isdigit():
+                continue
+            ingredient_name = ','.join(ingredient_name.split(',')[:-1])
+            result.append(models.StockBalance(
+                unit_id=self.unit_id,
+                ingredient_name=ingredient_name,
+                days_left=days_left,
+            ))
+        return result
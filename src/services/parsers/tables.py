@@ -0,0 +1,92 @@
+from typing import Iterator, Sequence
+
+from lxml import etree
+
+__all__ = (
+    'iter_table_rows',
+    'get_column_indices',
+)
+
+CELL_TAGS = ('th', 'td')
+
+
+class EncodedTextReader:
+    """File-like reader of text as UTF-8, encoding only the requested part, so that whole page is not copied."""
+
+    def __init__(self, text: str):
+        self._text = text
+        self._position = 0
+
+    def read(self, size: int = -1) -> bytes:
+        if size < 0:
+            end = len(self._text)
+        else:
+            # UTF-8 takes up to 4 bytes per character.
+            end = self._position + max(1, size // 4)
+        chunk = self._text[self._position:end]
+        self._position += len(chunk)
+        return chunk.encode('utf-8')
+
+
+def get_cell_text(cell: etree._Element) -> str:
+    """Text of cell with whitespace collapsed, the same as in ``pd.read_html``."""
+    text = cell.text if len(cell) == 0 else ''.join(cell.itertext())
+    return ' '.join(text.split()) if text else ''
+
+
+def iter_table_rows(html: str, table_index: int = 0, columns: Sequence[str] | None = None) -> Iterator[list[str]]:
+    """Texts of cells of every row of table, read in one pass over document.
+
+    Rows are dropped from the tree once read, and parsing stops at the end of the table,
+    so memory is bounded by one row rather than whole document.
+
+    Args:
+        html: Page with tables.
+        table_index: Index of table in document order, as in ``pd.read_html``.
+        columns: Names of columns to read, in order. If omitted, all cells are read and header row comes first.
+            Otherwise header row is skipped, and missing cells of short rows are empty.
+
+    Raises:
+        ValueError: if page has no such table or table has no such columns.
+    """
+    events = etree.iterparse(
+        EncodedTextReader(html),
+        events=('start', 'end'),
+        tag=('table', 'tr'),
+        html=True,
+        encoding='utf-8',
+    )
+    tables_count = 0
+    indices: list[int] | None = None
+    for event, element in events:
+        if element.tag == 'table':
+            if event == 'start':
+                tables_count += 1
+            elif tables_count == table_index + 1:
+                return
+            continue
+        if event == 'end':
+            if tables_count == table_index + 1:
+                cells = [cell for cell in element if cell.tag in CELL_TAGS]
+                if columns is None:
+                    yield [get_cell_text(cell) for cell in cells]
+                elif indices is None:
+                    indices = get_column_indices([get_cell_text(cell) for cell in cells], columns)
+                else:
+                    yield [get_cell_text(cells[index]) if index < len(cells) else '' for index in indices]
+            element.clear(keep_tail=True)
+            while element.getprevious() is not None:
+                del element.getparent()[0]
+    raise ValueError(f'Page has no table with index {table_index}')
+
+
+def get_column_indices(header: list[str], columns: Sequence[str]) -> list[int]:
+    """Indices of columns in header row.
+
+    Raises:
+        ValueError: if some column is absent.
+    """
+    missing_columns = [column for column in columns if column not in header]
+    if missing_columns:
+        raise ValueError(f'Table has no columns {missing_columns}, header is {header}')
+    return [header.index(column) for column in columns]
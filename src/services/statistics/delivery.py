@@ -3,9 +3,10 @@ import uuid
 from typing import Iterable
 
 import models
-from db.cache import set_in_cache, get_from_cache
+from db.cache import get_or_fetch_many
 from services.api import private_dodo_api
-from utils import time_utils, exceptions
+from services.cache_warmer import cache_warmer
+from utils import time_utils
 from services.convert_models import extend_unit_delivery_statistics
 
 
@@ -13,41 +14,36 @@ async def get_delivery_statistics(
         token: str,
         unit_uuids: Iterable[uuid.UUID],
         datetime_config: time_utils.Period,
-) -> list[models.UnitDeliveryStatisticsExtended]:
+) -> private_dodo_api.ShardedResponse[models.UnitDeliveryStatisticsExtended]:
+    """Delivery statistics of units, with units whose statistics couldn't be got neither from cache nor from API."""
     unit_uuids = set(unit_uuids)
+    # Only today's statistics change, so only they are warmed up.
+    if datetime_config.from_datetime == time_utils.Period.new_today().from_datetime:
+        cache_warmer.register('private_delivery_statistics', unit_uuids, token, lambda: get_delivery_statistics(
+            token, unit_uuids, time_utils.Period.new_today()))
 
-    unit_uuids_to_get_from_api = []
-    units_delivery_statistics = []
+    date = datetime_config.from_datetime.isoformat()
+    unit_uuid_to_key = {unit_uuid: f'private_delivery_statistics@{unit_uuid.hex}@{date}' for unit_uuid in unit_uuids}
 
-    for unit_uuid in unit_uuids:
-        key = f'delivery_statistics@{unit_uuid.hex}@{datetime_config.from_datetime.isoformat()}'
-        try:
-            unit_delivery_statistics: models.UnitDeliveryStatisticsExtended = await get_from_cache(key)
-        except exceptions.DoesNotExistInCache:
-            unit_uuids_to_get_from_api.append(unit_uuid)
-        else:
-            units_delivery_statistics.append(unit_delivery_statistics)
-
-    if unit_uuids_to_get_from_api:
+    async def fetch(unit_uuids_to_get_from_api: list[uuid.UUID]) -> dict[str, models.UnitDeliveryStatisticsExtended]:
         units_delivery_statistics_from_api = await private_dodo_api.get_delivery_statistics(
             token, unit_uuids_to_get_from_api, datetime_config)
-        units_delivery_statistics_from_api = [extend_unit_delivery_statistics(i) for i in
-                                              units_delivery_statistics_from_api]
-
-        for unit_delivery_statistics in units_delivery_statistics_from_api:
-            key = (f'delivery_statistics@{unit_delivery_statistics.unit_id.hex}'
-                   f'@{datetime_config.from_datetime.isoformat()}')
-            await set_in_cache(key, unit_delivery_statistics)
-
-        units_delivery_statistics += units_delivery_statistics_from_api
+        # Units of failed shards are left out of response and requested again next time.
+        return {unit_uuid_to_key[unit_delivery_statistics.unit_id]: extend_unit_delivery_statistics(
+            unit_delivery_statistics) for unit_delivery_statistics in units_delivery_statistics_from_api.items}
 
-    return units_delivery_statistics
+    key_to_unit_delivery_statistics = await get_or_fetch_many(unit_uuid_to_key, fetch)
+    return private_dodo_api.ShardedResponse(
+        items=list(key_to_unit_delivery_statistics.values()),
+        error_unit_uuids=[unit_uuid for unit_uuid, key in unit_uuid_to_key.items()
+                          if key not in key_to_unit_delivery_statistics],
+    )
 
 
 async def get_delivery_statistics_batch(
         token: str,
         unit_uuids: Iterable[uuid.UUID],
         datetime_configs: Iterable[time_utils.Period]
-) -> tuple[list[models.UnitDeliveryStatisticsExtended], ...]:
+) -> tuple[private_dodo_api.ShardedResponse[models.UnitDeliveryStatisticsExtended], ...]:
     tasks = (get_delivery_statistics(token, unit_uuids, datetime_config) for datetime_config in datetime_configs)
     return await asyncio.gather(*tasks)
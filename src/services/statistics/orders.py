@@ -1,43 +1,53 @@
 import asyncio
-from typing import Iterable, Sequence, TypeAlias
+import uuid
+from datetime import date
+from typing import AsyncGenerator, Iterable
 
-import pandas as pd
+import httpx
 
 import models
-from db.cache import set_in_cache, get_from_cache
+from core.config import app_settings
+from db.cache import get_or_fetch_many
 from services.api import dodo_is_api
+from services.api.transports import CircuitOpenError
 from utils import exceptions, time_utils
+from utils.retry import RETRYABLE_STATUS_CODES, RetryPolicy
 
-GroupedByUnitName: TypeAlias = Sequence[tuple[str, pd.DataFrame]]
+order_retry_policy = RetryPolicy(
+    max_attempts=app_settings.upstream_retry_max_attempts,
+    base_delay=app_settings.upstream_retry_base_delay,
+    max_delay=app_settings.upstream_retry_max_delay,
+    max_total_delay=app_settings.upstream_retry_max_total_delay,
+)
+
+
+def get_restaurant_orders_key(unit_id: int, business_date: date) -> str:
+    """Orders of past dates don't change anymore, so they are kept in the long-lived dataset."""
+    dataset = 'restaurant_orders' if business_date >= time_utils.Period.now().date() else 'restaurant_orders_archive'
+    return f'{dataset}@{unit_id}@{business_date.isoformat()}'
 
 
 async def get_restaurant_orders(
         cookies: dict,
         units: Iterable[models.UnitIdAndName],
-        datetime_config: time_utils.Period,
-) -> list[GroupedByUnitName]:
-    unit_name_to_unit_id = {unit.name: unit.id for unit in units}
-    units_restaurant_orders: list[GroupedByUnitName] = []
-    unit_ids_to_get_from_api = []
-    for unit in units:
-        key = f'restaurant_orders@{unit.id}'
-        try:
-            grouped_by_unit_name_df: GroupedByUnitName = await get_from_cache(key)
-        except exceptions.DoesNotExistInCache:
-            unit_ids_to_get_from_api.append(unit.id)
-        else:
-            units_restaurant_orders.append(grouped_by_unit_name_df)
-
-    if unit_ids_to_get_from_api:
-        responses = await dodo_is_api.get_restaurant_orders(cookies, unit_ids_to_get_from_api, datetime_config)
-
-        for grouped_by_unit_name_df in responses:
-            unit_id = unit_name_to_unit_id[grouped_by_unit_name_df[0]]
-            key = f'restaurant_orders@{unit_id}'
-            await set_in_cache(key, grouped_by_unit_name_df)
-        units_restaurant_orders += responses
-
-    return units_restaurant_orders
+        business_date: date,
+) -> list[models.UnitRestaurantOrders]:
+    unit_id_to_unit = {unit.id: unit for unit in units}
+    unit_id_to_key = {unit.id: get_restaurant_orders_key(unit.id, business_date) for unit in units}
+
+    async def fetch(unit_ids_to_get_from_api: list[int]) -> dict[str, models.UnitRestaurantOrders]:
+        period = time_utils.Period(business_date, business_date)
+        responses = await dodo_is_api.get_restaurant_orders(cookies, unit_ids_to_get_from_api, period)
+        unit_name_to_unit_orders = {unit_orders.unit_name: unit_orders for unit_orders in responses}
+        # Units without orders are absent in the report, so empty orders are cached explicitly.
+        return {
+            unit_id_to_key[unit_id]: unit_name_to_unit_orders.get(unit_id_to_unit[unit_id].name)
+            or models.UnitRestaurantOrders.new_empty(unit_id_to_unit[unit_id].name)
+            for unit_id in unit_ids_to_get_from_api
+        }
+
+    key_to_unit_orders = await get_or_fetch_many(unit_id_to_key, fetch)
+    return [unit_orders for unit_orders in key_to_unit_orders.values() if len(unit_orders)]
 
 
 def zip_certificates_today_and_week_before(
@@ -62,55 +72,123 @@ def zip_certificates_today_and_week_before(
     return result
 
 
+def get_being_late_certificates_key(key_name: str, unit_id: int, period: time_utils.Period) -> str:
+    """Key includes date of period, so that entry cached before midnight isn't served for the next day."""
+    return f'{key_name}@{unit_id}@{period.from_datetime.date().isoformat()}'
+
+
+async def get_being_late_certificates(
+        cookies: dict,
+        units: Iterable[models.UnitIdAndName],
+        key_name: str,
+        period: time_utils.Period,
+) -> list[models.UnitBeingLateCertificates]:
+    unit_id_to_unit = {unit.id: unit for unit in units}
+    unit_id_to_key = {unit.id: get_being_late_certificates_key(key_name, unit.id, period) for unit in units}
+
+    async def fetch(unit_ids_to_get_from_api: list[int]) -> dict[str, models.UnitBeingLateCertificates]:
+        units_to_get_from_api = [unit_id_to_unit[unit_id] for unit_id in unit_ids_to_get_from_api]
+        response = await dodo_is_api.get_being_late_certificates(cookies, units_to_get_from_api, period)
+        unit_id_to_certificates = {unit_certificates.unit_id: unit_certificates for unit_certificates in response}
+        # Units without certificates are absent in the report, so zero counts are cached explicitly.
+        return {
+            unit_id_to_key[unit.id]: unit_id_to_certificates.get(unit.id) or models.UnitBeingLateCertificates(
+                unit_id=unit.id,
+                unit_name=unit.name,
+                being_late_certificates_count=0,
+            ) for unit in units_to_get_from_api
+        }
+
+    key_to_unit_certificates = await get_or_fetch_many(unit_id_to_key, fetch)
+    return list(key_to_unit_certificates.values())
+
+
 async def get_being_late_certificates_statistics(
         cookies: dict,
         units: Iterable[models.UnitIdAndName],
 ) -> list[models.UnitBeingLateCertificatesTodayAndWeekBefore]:
-    period_today = time_utils.Period.new_today()
-    period_week_before = time_utils.Period.new_week_ago()
+    units = list(units)
+    task_today = get_being_late_certificates(
+        cookies, units, 'being_late_certificates_today', time_utils.Period.new_today())
+    task_week_before = get_being_late_certificates(
+        cookies, units, 'being_late_certificates_week_before', time_utils.Period.new_week_ago())
+    certificates_today, certificates_week_before = await asyncio.gather(task_today, task_week_before)
+    return zip_certificates_today_and_week_before(units, certificates_today, certificates_week_before)
 
-    units_to_get_from_api: list[models.UnitIdAndName] = []
-    all_certificates_for_today_and_week_before: list[models.UnitBeingLateCertificatesTodayAndWeekBefore] = []
 
-    for unit in units:
-        key = f'being_late_certificates@{unit.id}'
+def is_retryable_order_error(error: Exception) -> bool:
+    if isinstance(error, exceptions.OrderByUUIDAPIError):
+        return error.status_code in RETRYABLE_STATUS_CODES
+    # Open circuit won't close within retry budget, so order is reported as failed right away.
+    return isinstance(error, httpx.TransportError) and not isinstance(error, CircuitOpenError)
+
+
+async def iter_canceled_orders(
+        cookies: dict,
+        date: time_utils.Period,
+) -> AsyncGenerator[models.OrderByUUID | uuid.UUID, None]:
+    """Fetch canceled orders while pages of report are still being fetched.
+
+    Producer puts orders from pages into bounded queue, and pool of workers fetches their details,
+    so that slow details fetching holds back pagination instead of piling up orders in memory.
+
+    Yields:
+        Orders as soon as they are fetched, in order of completion,
+        and uuids of orders which couldn't be fetched.
+    """
+    workers_count = app_settings.canceled_orders_workers_count
+    order_partial_queue: asyncio.Queue[models.OrderPartial | None] = asyncio.Queue(
+        maxsize=app_settings.canceled_orders_queue_size)
+    # Unbounded, so that workers and producer never block on slow consumer of results.
+    result_queue: asyncio.Queue[models.OrderByUUID | uuid.UUID | Exception | None] = asyncio.Queue()
+
+    async def get_order(order_partial: models.OrderPartial) -> models.OrderByUUID:
+        return await dodo_is_api.get_order_by_uuid(cookies, order_partial.uuid, order_partial.price, order_partial.type)
+
+    async def produce():
         try:
-            unit_being_late_certificates = await get_from_cache(key)
-        except exceptions.DoesNotExistInCache:
-            units_to_get_from_api.append(unit)
+            async for orders_partial in dodo_is_api.get_canceled_orders_partial(cookies, date):
+                for order_partial in orders_partial:
+                    await order_partial_queue.put(order_partial)
+        except Exception as error:
+            await result_queue.put(error)
+            return
+        for _ in range(workers_count):
+            await order_partial_queue.put(None)
+
+    async def work():
+        while (order_partial := await order_partial_queue.get()) is not None:
+            canceled_orders, failed = await order_retry_policy.run_many(
+                [order_partial], get_order, is_retryable_order_error)
+            for canceled_order in canceled_orders:
+                await result_queue.put(canceled_order)
+            for failed_order_partial, _ in failed:
+                await result_queue.put(failed_order_partial.uuid)
+        await result_queue.put(None)
+
+    tasks = [asyncio.create_task(produce())] + [asyncio.create_task(work()) for _ in range(workers_count)]
+    try:
+        finished_workers_count = 0
+        while finished_workers_count < workers_count:
+            result = await result_queue.get()
+            if result is None:
+                finished_workers_count += 1
+            elif isinstance(result, Exception):
+                raise result
+            else:
+                yield result
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+async def get_canceled_orders(cookies: dict, date: time_utils.Period) -> models.CanceledOrders:
+    canceled_orders: list[models.OrderByUUID] = []
+    error_order_uuids: list[uuid.UUID] = []
+    async for result in iter_canceled_orders(cookies, date):
+        if isinstance(result, uuid.UUID):
+            error_order_uuids.append(result)
         else:
-            all_certificates_for_today_and_week_before.append(unit_being_late_certificates)
-
-    if units_to_get_from_api:
-        task_today = dodo_is_api.get_being_late_certificates(cookies, units, period_today)
-        task_week_before = dodo_is_api.get_being_late_certificates(cookies, units, period_week_before)
-        responses: tuple[models.UnitBeingLateCertificates, models.UnitBeingLateCertificates] = await asyncio.gather(
-            task_today, task_week_before)
-        certificates_today, certificates_week_before = responses
-        certificates_for_today_and_week_before = zip_certificates_today_and_week_before(
-            units, certificates_today, certificates_week_before)
-        for unit_certificates in certificates_for_today_and_week_before:
-            key = f'being_late_certificates@{unit_certificates.unit_id}'
-            await set_in_cache(key, unit_certificates)
-        all_certificates_for_today_and_week_before += certificates_for_today_and_week_before
-    return all_certificates_for_today_and_week_before
-
-
-async def get_canceled_orders(cookies: dict, date: time_utils.Period) -> list[models.OrderByUUID]:
-    tasks = []
-    all_canceled_orders = []
-    async for canceled_orders_partial in dodo_is_api.get_canceled_orders_partial(cookies, date):
-        if not canceled_orders_partial:
-            continue
-        for canceled_order_partial in canceled_orders_partial:
-            tasks.append(dodo_is_api.get_order_by_uuid(
-                cookies, canceled_order_partial.uuid,
-                canceled_order_partial.price, canceled_order_partial.type))
-    responses = await asyncio.gather(*tasks, return_exceptions=True)
-    all_canceled_orders += [response for response in responses if isinstance(response, models.OrderByUUID)]
-    error_responses = [response for response in responses if isinstance(response, exceptions.OrderByUUIDAPIError)]
-    while error_responses:
-        responses = await asyncio.gather(*tasks, return_exceptions=True)
-        all_canceled_orders += [response for response in responses if isinstance(response, models.OrderByUUID)]
-        error_responses = [response for response in responses if isinstance(response, exceptions.OrderByUUIDAPIError)]
-    return all_canceled_orders
+            canceled_orders.append(result)
+    return models.CanceledOrders(orders=canceled_orders, error_order_uuids=error_order_uuids)
@@ -1,9 +1,9 @@
 from typing import Iterable, TypeVar, Type, Callable
 
 import models
-from db.cache import set_in_cache, get_from_cache
+from db.cache import get_or_fetch_many
 from services import api
-from utils import exceptions
+from services.cache_warmer import cache_warmer
 
 UM = TypeVar('UM', bound=models.KitchenWorkPartial | models.DeliveryWorkPartial)
 RM = TypeVar('RM', bound=models.UnitsKitchenPartialStatistics | models.UnitsDeliveryPartialStatistics)
@@ -37,28 +37,18 @@ async def get_partial_statistics(
         api_method: Callable,
 ):
     unit_ids = set(unit_ids)
-
-    units_statistics: list[UM] = []
-    unit_ids_to_get_from_api: list[int] = []
     error_unit_ids: list[int] = []
+    cache_warmer.register(key_name, unit_ids, cookies, lambda: get_partial_statistics(
+        cookies, unit_ids, key_name, response_model, api_method))
 
-    for unit_id in unit_ids:
-        key = f'{key_name}@{unit_id}'
-        try:
-            unit_statistics: UM = await get_from_cache(key)
-        except exceptions.DoesNotExistInCache:
-            unit_ids_to_get_from_api.append(unit_id)
-        else:
-            units_statistics.append(unit_statistics)
+    unit_id_to_key = {unit_id: f'{key_name}@{unit_id}' for unit_id in unit_ids}
 
-    if unit_ids_to_get_from_api:
+    async def fetch(unit_ids_to_get_from_api: list[int]) -> dict[str, UM]:
         response = await api_method(cookies, unit_ids_to_get_from_api)
+        error_unit_ids.extend(response.error_unit_ids)
+        return {unit_id_to_key[unit_statistics.unit_id]: unit_statistics for unit_statistics in response.units}
 
-        for unit_statistics in response.units:
-            key = f'{key_name}@{unit_statistics.unit_id}'
-            await set_in_cache(key, unit_statistics)
-
-        units_statistics += response.units
-        error_unit_ids += response.error_unit_ids
+    key_to_unit_statistics: dict[str, UM] = await get_or_fetch_many(unit_id_to_key, fetch)
+    units_statistics = list(key_to_unit_statistics.values())
 
     return response_model(units=units_statistics, error_unit_ids=error_unit_ids)
@@ -0,0 +1,67 @@
+import asyncio
+import uuid
+from datetime import datetime, timedelta
+from typing import Iterable
+
+import models
+from core.config import app_settings
+from db import orders_handover_time as orders_handover_time_db
+from services.api import private_dodo_api
+from utils import time_utils
+
+__all__ = (
+    'get_orders_handover_time_statistics',
+)
+
+# Sums of today's orders are kept until the next day is over.
+ORDERS_HANDOVER_TIME_EXPIRE_TIME = 2 * 24 * 60 * 60
+
+
+async def get_orders_handover_time_statistics(
+        token: str,
+        unit_uuids: Iterable[uuid.UUID],
+        sales_channels: Iterable[models.SalesChannel],
+) -> private_dodo_api.ShardedResponse[models.UnitOrdersHandoverTime]:
+    """Today's average handover time of orders of units.
+
+    Only orders since the previous fetch are fetched, and they are added to running sums of units,
+    so that averages don't require fetching every order of the day.
+    Units are fetched on every call, so that units not accessible with token are reported as errors.
+    """
+    unit_uuids = set(unit_uuids)
+    period = time_utils.Period.new_today()
+    business_date = period.from_datetime.date()
+    unit_uuid_to_fetched_until = await orders_handover_time_db.get_fetched_until(unit_uuids, business_date)
+
+    # Units fetched before are fetched since the earliest of their previous fetches,
+    # so that units never fetched don't make the others fetch the whole day again.
+    overlap = timedelta(seconds=app_settings.orders_handover_time_overlap)
+    new_unit_uuids = unit_uuids - unit_uuid_to_fetched_until.keys()
+    from_datetime_to_unit_uuids: dict[datetime, list[uuid.UUID]] = {}
+    if new_unit_uuids:
+        from_datetime_to_unit_uuids[period.from_datetime] = list(new_unit_uuids)
+    if unit_uuid_to_fetched_until:
+        from_datetime = max(period.from_datetime, min(unit_uuid_to_fetched_until.values()) - overlap)
+        from_datetime_to_unit_uuids.setdefault(from_datetime, []).extend(unit_uuid_to_fetched_until)
+
+    responses = await asyncio.gather(*(
+        private_dodo_api.get_orders_handover_time(
+            token, group_unit_uuids, time_utils.Period(from_datetime, period.to_datetime))
+        for from_datetime, group_unit_uuids in from_datetime_to_unit_uuids.items()
+    ), return_exceptions=True)
+
+    error_unit_uuids: set[uuid.UUID] = set()
+    for group_unit_uuids, response in zip(from_datetime_to_unit_uuids.values(), responses):
+        if isinstance(response, BaseException):
+            if len(responses) == 1 or not isinstance(response, Exception):
+                raise response
+            error_unit_uuids.update(group_unit_uuids)
+            continue
+        error_unit_uuids.update(response.error_unit_uuids)
+        fetched_unit_uuids = set(group_unit_uuids) - set(response.error_unit_uuids)
+        await orders_handover_time_db.add_orders_handover_time(
+            fetched_unit_uuids, business_date, response.items, period.to_datetime, ORDERS_HANDOVER_TIME_EXPIRE_TIME)
+
+    units_orders_handover_time = await orders_handover_time_db.get_units_orders_handover_time(
+        unit_uuids - error_unit_uuids, business_date, sales_channels)
+    return private_dodo_api.ShardedResponse(items=units_orders_handover_time, error_unit_uuids=list(error_unit_uuids))
@@ -0,0 +1,13 @@
+import hashlib
+import json
+
+__all__ = (
+    'get_credentials_ref',
+)
+
+
+def get_credentials_ref(credentials: str | dict | None) -> str | None:
+    """Hash of credentials, so that they aren't kept in registry keys as is."""
+    if credentials is None:
+        return None
+    return hashlib.sha256(json.dumps(credentials, sort_keys=True).encode('utf-8')).hexdigest()
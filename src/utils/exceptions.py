@@ -78,8 +78,18 @@ class OrdersPartialAPIError(ShiftManagerAPIError):
 
 class OrderByUUIDAPIError(ShiftManagerAPIError):
 
-    def __init__(self, *args, order_uuid: uuid.UUID, order_price: int, order_type: str):
+    def __init__(
+            self,
+            *args,
+            order_uuid: uuid.UUID,
+            order_price: int,
+            order_type: str,
+            status_code: int | None = None,
+            retry_after: float | None = None,
+    ):
         super().__init__(*args)
         self.order_uuid = order_uuid
         self.order_price = order_price
         self.order_type = order_type
+        self.status_code = status_code
+        self.retry_after = retry_after
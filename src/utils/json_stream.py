@@ -0,0 +1,104 @@
+import codecs
+import json
+import re
+from typing import Any, AsyncGenerator, AsyncIterable
+
+__all__ = (
+    'iter_array_items',
+)
+
+WHITESPACE = re.compile(r'\s*')
+# Characters which may follow complete number or literal, as opposed to continuation of it, e.g. ``1.`` of ``1.5``.
+DELIMITERS = frozenset(' \t\n\r,]}')
+
+decoder = json.JSONDecoder()
+
+
+class JSONStream:
+    """Text of JSON document read chunk by chunk, consumed from the start."""
+
+    def __init__(self, chunks: AsyncIterable[bytes]):
+        self._chunks = aiter(chunks)
+        self._text_decoder = codecs.getincrementaldecoder('utf-8')()
+        self._buffer = ''
+        self._position = 0
+        self._is_exhausted = False
+
+    async def read_more(self) -> bool:
+        """Append the next chunk to buffer, dropping consumed text. Returns False at the end of document."""
+        if self._is_exhausted:
+            return False
+        try:
+            chunk = await anext(self._chunks)
+        except StopAsyncIteration:
+            self._is_exhausted = True
+            text = self._text_decoder.decode(b'', final=True)
+        else:
+            text = self._text_decoder.decode(chunk)
+        self._buffer = self._buffer[self._position:] + text
+        self._position = 0
+        return True
+
+    async def peek(self) -> str:
+        """Next non-whitespace character, or empty string at the end of document."""
+        while True:
+            self._position = WHITESPACE.match(self._buffer, self._position).end()
+            if self._position < len(self._buffer):
+                return self._buffer[self._position]
+            if not await self.read_more():
+                return ''
+
+    async def expect(self, characters: str) -> str:
+        character = await self.peek()
+        if not character or character not in characters:
+            raise ValueError(f'Expected one of {characters!r} at position {self._position}, got {character!r}')
+        self._position += 1
+        return character
+
+    async def read_value(self) -> Any:
+        """Decode the next complete JSON value."""
+        is_scalar = await self.peek() not in '{["'
+        while True:
+            try:
+                value, end = decoder.raw_decode(self._buffer, self._position)
+            except json.JSONDecodeError:
+                if not await self.read_more():
+                    raise
+                continue
+            # Number or literal not followed by delimiter may continue in the next chunk.
+            if is_scalar and (end == len(self._buffer) or self._buffer[end] not in DELIMITERS):
+                if await self.read_more():
+                    continue
+            self._position = end
+            return value
+
+
+async def iter_array_items(chunks: AsyncIterable[bytes], key: str) -> AsyncGenerator[Any, None]:
+    """Decode items of array under ``key`` of top-level JSON object one by one, while document is being read.
+
+    Only one item and the unread part of the current chunk are kept in memory at a time.
+    Other values of the object are decoded and discarded.
+
+    Raises:
+        ValueError: if document is not a valid JSON object.
+    """
+    stream = JSONStream(chunks)
+    await stream.expect('{')
+    if await stream.peek() == '}':
+        return
+    while True:
+        name = await stream.read_value()
+        await stream.expect(':')
+        if name == key:
+            await stream.expect('[')
+            if await stream.peek() != ']':
+                while True:
+                    yield await stream.read_value()
+                    if await stream.expect(',]') == ']':
+                        break
+            else:
+                await stream.expect(']')
+        else:
+            await stream.read_value()
+        if await stream.expect(',}') == '}':
+            return
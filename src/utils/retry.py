@@ -0,0 +1,88 @@
+import asyncio
+import email.utils
+import random
+import time
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Iterable, TypeVar
+
+__all__ = (
+    'RETRYABLE_STATUS_CODES',
+    'RetryPolicy',
+    'parse_retry_after',
+)
+
+T = TypeVar('T')
+R = TypeVar('R')
+
+RETRYABLE_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """Seconds to wait from ``Retry-After`` header, given either in seconds or as HTTP date."""
+    if not value:
+        return None
+    if value.isdigit():
+        return float(value)
+    try:
+        retry_at = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, retry_at.timestamp() - time.time())
+
+
+@dataclass(frozen=True, slots=True)
+class RetryPolicy:
+    """Retries failed calls of batch with exponential backoff and full jitter.
+
+    Only failed items are retried, at most ``max_attempts`` times including the first call.
+    Delay requested by upstream with ``retry_after`` attribute of exception is honored,
+    but retries stop once total delay would exceed ``max_total_delay``.
+    """
+    max_attempts: int
+    base_delay: float
+    max_delay: float
+    max_total_delay: float
+
+    def get_delay(self, attempt: int, retry_after: float | None = None) -> float:
+        """Delay before the next attempt after ``attempt`` failed attempts."""
+        delay = random.uniform(0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1)))
+        if retry_after is not None:
+            delay = max(delay, retry_after)
+        return delay
+
+    async def run_many(
+            self,
+            items: Iterable[T],
+            func: Callable[[T], Awaitable[R]],
+            is_retryable: Callable[[Exception], bool],
+    ) -> tuple[list[R], list[tuple[T, Exception]]]:
+        """Call ``func`` for every item concurrently, retrying failed items.
+
+        Returns:
+            Results of succeeded items and failed items with their last exceptions.
+        """
+        results: list[R] = []
+        failed: list[tuple[T, Exception]] = []
+        pending = list(items)
+        total_delay = 0.0
+        for attempt in range(1, self.max_attempts + 1):
+            responses = await asyncio.gather(*(func(item) for item in pending), return_exceptions=True)
+            retryable: list[tuple[T, Exception]] = []
+            for item, response in zip(pending, responses):
+                if isinstance(response, Exception):
+                    (retryable if is_retryable(response) else failed).append((item, response))
+                elif isinstance(response, BaseException):
+                    raise response
+                else:
+                    results.append(response)
+            if not retryable or attempt == self.max_attempts:
+                return results, failed + retryable
+
+            retry_after = max((getattr(error, 'retry_after', None) or 0 for _, error in retryable), default=0)
+            delay = self.get_delay(attempt, retry_after)
+            if total_delay + delay > self.max_total_delay:
+                return results, failed + retryable
+            total_delay += delay
+            await asyncio.sleep(delay)
+            pending = [item for item, _ in retryable]
+        return results, failed
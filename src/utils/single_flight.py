@@ -0,0 +1,42 @@
+import asyncio
+from typing import Awaitable, Callable, Hashable, TypeVar
+
+__all__ = (
+    'SingleFlight',
+    'single_flight',
+)
+
+T = TypeVar('T')
+
+
+class SingleFlight:
+    """Coalesces concurrent calls with the same key into one in-flight call.
+
+    The first caller starts the call, the others await its result or exception.
+    Call runs in a separate task, so cancellation of one of the callers doesn't affect the others.
+    """
+
+    def __init__(self):
+        self._key_to_task: dict[Hashable, asyncio.Task] = {}
+
+    async def do(self, key: Hashable, func: Callable[[], Awaitable[T]]) -> T:
+        try:
+            task = self._key_to_task[key]
+        except KeyError:
+            task = asyncio.create_task(func())
+            self._key_to_task[key] = task
+            task.add_done_callback(lambda done_task: self._forget(key, done_task))
+        return await asyncio.shield(task)
+
+    def _forget(self, key: Hashable, done_task: asyncio.Task):
+        if self._key_to_task.get(key) is done_task:
+            del self._key_to_task[key]
+        # Mark exception as retrieved in case all callers have been cancelled.
+        if not done_task.cancelled():
+            done_task.exception()
+
+    def __len__(self) -> int:
+        return len(self._key_to_task)
+
+
+single_flight = SingleFlight()
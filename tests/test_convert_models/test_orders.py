@@ -0,0 +1,44 @@
+from datetime import datetime
+
+import pytest
+
+import models
+from services.api.dodo_is_api.restaurant_orders import to_unit_restaurant_orders
+from services.convert_models.orders import (
+    restaurant_orders_to_bonus_system_statistics,
+    restaurant_orders_to_cheated_orders,
+)
+
+
+@pytest.fixture
+def unit_orders() -> models.UnitRestaurantOrders:
+    return to_unit_restaurant_orders(
+        'Москва 4-1',
+        numbers=['12-1', '13-1', '14-1', '15-1'],
+        created_at=['13.07.2022 10:05', '13.07.2022 10:40', '13.07.2022 11:15', '13.07.2022 12:00'],
+        phone_numbers=['79991112233', '', '79991112233', '79994445566'],
+    )
+
+
+def test_restaurant_orders_to_bonus_system_statistics(unit_orders):
+    assert restaurant_orders_to_bonus_system_statistics([unit_orders]) == [
+        models.UnitBonusSystem(
+            unit_name='Москва 4-1',
+            orders_with_phone_numbers_count=3,
+            orders_with_phone_numbers_percent=75,
+            total_orders_count=4,
+        ),
+    ]
+
+
+def test_restaurant_orders_to_cheated_orders(unit_orders):
+    assert restaurant_orders_to_cheated_orders([unit_orders], repeated_phone_number_count_threshold=2) == [
+        models.CheatedOrders(
+            unit_name='Москва 4-1',
+            phone_number='79991112233',
+            orders=[
+                models.CheatedOrder(number='12-1', created_at=datetime(2022, 7, 13, 10, 5)),
+                models.CheatedOrder(number='14-1', created_at=datetime(2022, 7, 13, 11, 15)),
+            ],
+        ),
+    ]
@@ -0,0 +1,14 @@
+import pytest
+from fakeredis import aioredis
+
+from db import redis_db
+from db.local_cache import local_cache
+
+
+@pytest.fixture(autouse=True)
+def redis_connection(monkeypatch):
+    connection = aioredis.FakeRedis()
+    monkeypatch.setattr(redis_db, 'connection', connection)
+    local_cache.clear()
+    yield connection
+    local_cache.clear()
@@ -0,0 +1,97 @@
+import asyncio
+import time
+
+import pytest
+
+from core.config import app_settings
+from db.local_cache import local_cache
+from db.cache import (
+    CacheEntry, get_expire_time, get_or_fetch_many, set_many, response_age, ResponseAge, refresh_tasks, refresh_ahead_time,
+)
+
+
+@pytest.mark.parametrize(
+    'name,expected',
+    [
+        ('kitchen_statistics@389', app_settings.cache_ttl['kitchen_statistics']),
+        ('being_late_certificates_week_before@389', app_settings.cache_ttl['being_late_certificates_week_before']),
+        ('unknown_dataset@389', app_settings.default_cache_ttl),
+        ('unknown_dataset', app_settings.default_cache_ttl),
+    ]
+)
+def test_get_expire_time(name, expected):
+    assert get_expire_time(name) == expected
+
+
+def test_stale_object_is_returned_and_refreshed_in_background(monkeypatch):
+    monkeypatch.setitem(app_settings.cache_ttl, 'test_statistics', 1)
+    monkeypatch.setitem(app_settings.cache_stale_ttl, 'test_statistics', 60)
+    fetches_count = 0
+
+    async def fetch(unit_ids: list[int]) -> dict[str, int]:
+        nonlocal fetches_count
+        fetches_count += 1
+        return {f'test_statistics@{unit_id}': fetches_count for unit_id in unit_ids}
+
+    async def main():
+        current_response_age = ResponseAge()
+        response_age.set(current_response_age)
+        await set_many({'test_statistics@389': 0})
+        monkeypatch.setattr(time, 'time', lambda: real_time() + 2)
+        stale = await get_or_fetch_many({389: 'test_statistics@389'}, fetch)
+        await asyncio.gather(*refresh_tasks)
+        fresh = await get_or_fetch_many({389: 'test_statistics@389'}, fetch)
+        return stale, fresh, current_response_age.max_age
+
+    real_time = time.time
+    stale, fresh, max_age = asyncio.run(main())
+    assert stale == {'test_statistics@389': 0}
+    assert fresh == {'test_statistics@389': 1}
+    assert fetches_count == 1
+    assert max_age >= 2
+
+
+def test_object_expiring_soon_is_refreshed_ahead(monkeypatch):
+    monkeypatch.setitem(app_settings.cache_ttl, 'test_statistics', 60)
+
+    async def fetch(unit_ids: list[int]) -> dict[str, int]:
+        return {f'test_statistics@{unit_id}': 1 for unit_id in unit_ids}
+
+    async def main():
+        await set_many({'test_statistics@389': 0})
+        not_expiring = await get_or_fetch_many({389: 'test_statistics@389'}, fetch)
+        refresh_ahead_time.set(60)
+        expiring = await get_or_fetch_many({389: 'test_statistics@389'}, fetch)
+        refresh_ahead_time.set(0)
+        refreshed = await get_or_fetch_many({389: 'test_statistics@389'}, fetch)
+        return not_expiring, expiring, refreshed
+
+    assert asyncio.run(main()) == (
+        {'test_statistics@389': 0},
+        {'test_statistics@389': 0},
+        {'test_statistics@389': 1},
+    )
+    assert not refresh_tasks
+
+
+def test_object_refreshed_by_another_worker_is_not_fetched_again(monkeypatch):
+    monkeypatch.setitem(app_settings.cache_ttl, 'test_statistics', 60)
+    monkeypatch.setitem(app_settings.cache_stale_ttl, 'test_statistics', 60)
+    fetched_unit_ids: list[list[int]] = []
+
+    async def fetch(unit_ids: list[int]) -> dict[str, int]:
+        fetched_unit_ids.append(unit_ids)
+        return {f'test_statistics@{unit_id}': 2 for unit_id in unit_ids}
+
+    async def main():
+        # In-process cache of this worker still holds stale object,
+        # while another worker has already refreshed it in Redis.
+        await set_many({'test_statistics@389': 1})
+        stale_entry = CacheEntry(value=0, created_at=time.time() - 120, fresh_until=time.time() - 60)
+        local_cache.set('test_statistics@389', stale_entry, size=1, expire_time=5)
+        stale = await get_or_fetch_many({389: 'test_statistics@389'}, fetch)
+        await asyncio.gather(*refresh_tasks)
+        return stale, await get_or_fetch_many({389: 'test_statistics@389'}, fetch)
+
+    assert asyncio.run(main()) == ({'test_statistics@389': 0}, {'test_statistics@389': 1})
+    assert fetched_unit_ids == []
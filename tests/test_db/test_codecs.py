@@ -0,0 +1,72 @@
+import pickle
+
+import numpy as np
+import pytest
+
+import models
+from db import codecs
+
+
+@pytest.fixture
+def kitchen_statistics() -> models.KitchenWorkPartial:
+    return models.KitchenWorkPartial(
+        unit_id=389,
+        revenue={'per_hour': 5400, 'delta_from_week_before': 12},
+        product_spending={'per_hour': 3.5, 'delta_from_week_before': -4},
+        average_cooking_time=421,
+        tracking={'postponed': 0, 'in_queue': 2, 'in_work': 5},
+    )
+
+
+def test_pydantic_model_round_trip(kitchen_statistics):
+    obj_bytes = codecs.encode('kitchen_statistics@389', kitchen_statistics, created_at=1.0, fresh_until=61.0)
+    assert codecs.decode('kitchen_statistics@389', obj_bytes) == (kitchen_statistics, 1.0, 61.0)
+
+
+def test_restaurant_orders_round_trip():
+    unit_orders = models.UnitRestaurantOrders(
+        unit_name='Москва 4-1',
+        numbers=models.PackedStrings.pack(['12-1', '13-1', '14-1']),
+        created_at=np.array(['2022-07-13T10:05', '2022-07-13T10:40', '2022-07-13T11:15'], dtype='datetime64[s]'),
+        phone_numbers=models.PackedStrings.pack(['79991112233', None, '79991112233']),
+    )
+    obj_bytes = codecs.encode('restaurant_orders@389', unit_orders, created_at=1.0, fresh_until=61.0)
+    decoded, _, _ = codecs.decode('restaurant_orders@389', obj_bytes)
+    assert decoded.unit_name == 'Москва 4-1'
+    assert [decoded.numbers[i] for i in range(3)] == ['12-1', '13-1', '14-1']
+    assert [decoded.phone_numbers[i] for i in range(3)] == ['79991112233', None, '79991112233']
+    np.testing.assert_array_equal(decoded.created_at, unit_orders.created_at)
+    assert not decoded.created_at.flags.owndata
+
+
+def test_schema_version_mismatch_is_rejected(kitchen_statistics, monkeypatch):
+    obj_bytes = codecs.encode('kitchen_statistics@389', kitchen_statistics, created_at=1.0, fresh_until=61.0)
+    monkeypatch.setattr(codecs.DATASET_CODECS['kitchen_statistics'], 'version', 0)
+    with pytest.raises(ValueError):
+        codecs.decode('kitchen_statistics@389', obj_bytes)
+
+
+def test_pickled_object_is_rejected(kitchen_statistics):
+    with pytest.raises(ValueError):
+        codecs.decode('kitchen_statistics@389', pickle.dumps(kitchen_statistics))
+
+
+def test_empty_restaurant_orders_round_trip():
+    unit_orders = models.UnitRestaurantOrders.new_empty('Москва 4-1')
+    obj_bytes = codecs.encode('restaurant_orders_archive@389@2022-07-13', unit_orders, created_at=1.0, fresh_until=61.0)
+    decoded, _, _ = codecs.decode('restaurant_orders_archive@389@2022-07-13', obj_bytes)
+    assert decoded.unit_name == 'Москва 4-1'
+    assert len(decoded) == 0
+
+
+@pytest.mark.parametrize('size', [codecs.HEADER.size, codecs.HEADER.size + 8, -10])
+def test_truncated_restaurant_orders_are_rejected(size):
+    unit_orders = models.UnitRestaurantOrders(
+        unit_name='Москва 4-1',
+        numbers=models.PackedStrings.pack(['12-1', '13-1']),
+        created_at=np.array(['2022-07-13T10:05', '2022-07-13T10:40'], dtype='datetime64[s]'),
+        phone_numbers=models.PackedStrings.pack(['+79991234567', None]),
+    )
+    obj_bytes = codecs.encode('restaurant_orders@389@2022-07-13', unit_orders, created_at=1.0, fresh_until=61.0)
+    with pytest.raises(ValueError):
+        codecs.decode('restaurant_orders@389@2022-07-13', obj_bytes[:size])
@@ -0,0 +1,45 @@
+import time
+
+import pytest
+
+from db.local_cache import LocalCache
+
+
+def test_expired_entry_is_missing():
+    cache = LocalCache(max_entries=10, max_bytes=1024, ttl=60)
+    cache.set('kitchen_statistics@389', 'value', size=5, expire_time=0.01)
+    time.sleep(0.02)
+    with pytest.raises(KeyError):
+        cache.get('kitchen_statistics@389')
+    assert cache.stats()['misses'] == 1
+
+
+def test_ttl_does_not_exceed_redis_ttl():
+    cache = LocalCache(max_entries=10, max_bytes=1024, ttl=0.01)
+    cache.set('kitchen_statistics@389', 'value', size=5, expire_time=60)
+    time.sleep(0.02)
+    with pytest.raises(KeyError):
+        cache.get('kitchen_statistics@389')
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = LocalCache(max_entries=2, max_bytes=1024, ttl=60)
+    cache.set('a', 1, size=1, expire_time=60)
+    cache.set('b', 2, size=1, expire_time=60)
+    assert cache.get('a') == 1
+    cache.set('c', 3, size=1, expire_time=60)
+    with pytest.raises(KeyError):
+        cache.get('b')
+    assert cache.get('a') == 1
+    assert cache.get('c') == 3
+    assert cache.stats()['evictions'] == 1
+
+
+def test_memory_cap_is_respected():
+    cache = LocalCache(max_entries=10, max_bytes=10, ttl=60)
+    cache.set('a', 1, size=6, expire_time=60)
+    cache.set('b', 2, size=6, expire_time=60)
+    cache.set('c', 3, size=11, expire_time=60)
+    assert cache.stats()['entries'] == 1
+    assert cache.stats()['bytes'] == 6
+    assert cache.get('b') == 2
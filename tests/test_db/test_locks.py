@@ -0,0 +1,116 @@
+import asyncio
+import time
+
+from db import cache
+from db.local_cache import local_cache
+from db.locks import acquire_fetch_leases, release_fetch_leases, FetchLease
+
+
+def test_lease_is_exclusive():
+
+    async def main():
+        first = await acquire_fetch_leases(['test_statistics@389'], lease_time=10)
+        second = await acquire_fetch_leases(['test_statistics@389', 'test_statistics@390'], lease_time=10)
+        return first, second
+
+    first, second = asyncio.run(main())
+    assert list(first) == ['test_statistics@389']
+    assert list(second) == ['test_statistics@390']
+    assert second['test_statistics@390'].token > first['test_statistics@389'].token
+
+
+def test_lease_is_released_only_by_its_holder(redis_connection):
+
+    async def main():
+        lease = (await acquire_fetch_leases(['test_statistics@389'], lease_time=10))['test_statistics@389']
+        await release_fetch_leases([FetchLease(name=lease.name, token=lease.token + 1)])
+        is_held_after_foreign_release = await redis_connection.exists(lease.lock_name)
+        await release_fetch_leases([lease])
+        is_held_after_release = await redis_connection.exists(lease.lock_name)
+        return is_held_after_foreign_release, is_held_after_release
+
+    assert asyncio.run(main()) == (1, 0)
+
+
+def test_expired_lease_can_be_acquired_again():
+
+    async def main():
+        await acquire_fetch_leases(['test_statistics@389'], lease_time=0.01)
+        await asyncio.sleep(0.05)
+        return await acquire_fetch_leases(['test_statistics@389'], lease_time=10)
+
+    assert 'test_statistics@389' in asyncio.run(main())
+
+
+def test_only_one_worker_fetches_missing_key():
+    fetched_unit_ids: list[list[int]] = []
+
+    async def fetch(unit_ids: list[int]) -> dict[str, int]:
+        fetched_unit_ids.append(unit_ids)
+        await asyncio.sleep(0.1)
+        return {f'test_statistics@{unit_id}': unit_id for unit_id in unit_ids}
+
+    async def worker() -> dict[str, int]:
+        # Every worker has its own in-process cache.
+        local_cache.clear()
+        return await cache.get_or_fetch_many({389: 'test_statistics@389', 390: 'test_statistics@390'}, fetch)
+
+    async def main():
+        return await asyncio.gather(*[worker() for _ in range(5)])
+
+    results = asyncio.run(main())
+    assert fetched_unit_ids == [[389, 390]]
+    assert all(result == {'test_statistics@389': 389, 'test_statistics@390': 390} for result in results)
+
+
+def test_waiting_worker_fetches_key_after_wait_timeout(monkeypatch):
+    monkeypatch.setattr(cache.app_settings, 'fetch_lock_wait_timeout', 0.1)
+    fetched_unit_ids: list[list[int]] = []
+
+    async def fetch(unit_ids: list[int]) -> dict[str, int]:
+        fetched_unit_ids.append(unit_ids)
+        return {f'test_statistics@{unit_id}': unit_id for unit_id in unit_ids}
+
+    async def main():
+        # Lease is held by a worker that never fills the key.
+        await acquire_fetch_leases(['test_statistics@389'], lease_time=10)
+        return await cache.get_or_fetch_many({389: 'test_statistics@389'}, fetch)
+
+    assert asyncio.run(main()) == {'test_statistics@389': 389}
+    assert fetched_unit_ids == [[389]]
+
+
+def test_waiting_worker_fetches_key_once_lease_is_released_without_filling_it(monkeypatch):
+    monkeypatch.setattr(cache.app_settings, 'fetch_lock_wait_timeout', 10)
+    fetched_unit_ids: list[list[int]] = []
+
+    async def fetch(unit_ids: list[int]) -> dict[str, int]:
+        fetched_unit_ids.append(unit_ids)
+        return {f'test_statistics@{unit_id}': unit_id for unit_id in unit_ids}
+
+    async def main():
+        # Lease is held by a worker whose fetch fails.
+        leases = await acquire_fetch_leases(['test_statistics@389'], lease_time=10)
+        asyncio.get_running_loop().call_later(0.1, asyncio.create_task, release_fetch_leases(leases.values()))
+        started_at = time.monotonic()
+        result = await cache.get_or_fetch_many({389: 'test_statistics@389'}, fetch)
+        return result, time.monotonic() - started_at
+
+    result, duration = asyncio.run(main())
+    assert result == {'test_statistics@389': 389}
+    assert fetched_unit_ids == [[389]]
+    assert duration < 1
+
+
+def test_object_is_not_written_under_expired_lease():
+
+    async def main():
+        expired_lease = (await acquire_fetch_leases(['test_statistics@389'], lease_time=0.01))['test_statistics@389']
+        await asyncio.sleep(0.05)
+        lease = (await acquire_fetch_leases(['test_statistics@389'], lease_time=10))['test_statistics@389']
+        await cache.set_many({'test_statistics@389': 2}, leases={'test_statistics@389': lease})
+        await cache.set_many({'test_statistics@389': 1}, leases={'test_statistics@389': expired_lease})
+        local_cache.clear()
+        return await cache.get_many(['test_statistics@389'])
+
+    assert asyncio.run(main()) == {'test_statistics@389': 2}
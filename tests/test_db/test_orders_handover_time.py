@@ -0,0 +1,68 @@
+import asyncio
+import uuid
+from datetime import date, datetime
+
+import models
+from db import orders_handover_time
+
+UNIT_UUID = uuid.UUID('000d3a24-0c71-9a87-11e6-8aba13f80da9')
+BUSINESS_DATE = date(2022, 7, 13)
+
+
+def new_order(sales_channel: models.SalesChannel, cooking_time: int, order_id: uuid.UUID | None = None):
+    return models.OrdersHandoverTime(
+        unitId=UNIT_UUID,
+        unitName='Москва 4-1',
+        orderId=order_id or uuid.uuid4(),
+        orderNumber='1-1',
+        salesChannel=sales_channel.value,
+        orderTrackingStartAt=datetime(2022, 7, 13, 10),
+        trackingPendingTime=10,
+        cookingTime=cooking_time,
+        heatedShelfTime=30,
+    )
+
+
+def test_overlapping_orders_are_added_once():
+    order_id = uuid.uuid4()
+
+    async def main():
+        await orders_handover_time.add_orders_handover_time(
+            [UNIT_UUID], BUSINESS_DATE, [new_order(models.SalesChannel.DELIVERY, 100, order_id)],
+            datetime(2022, 7, 13, 11), 60)
+        await orders_handover_time.add_orders_handover_time(
+            [UNIT_UUID], BUSINESS_DATE, [new_order(models.SalesChannel.DELIVERY, 100, order_id),
+                                         new_order(models.SalesChannel.DELIVERY, 200)],
+            datetime(2022, 7, 13, 12), 60)
+        return (
+            await orders_handover_time.get_fetched_until([UNIT_UUID], BUSINESS_DATE),
+            await orders_handover_time.get_units_orders_handover_time(
+                [UNIT_UUID], BUSINESS_DATE, [models.SalesChannel.DELIVERY]),
+        )
+
+    fetched_until, units_orders_handover_time = asyncio.run(main())
+    assert fetched_until == {UNIT_UUID: datetime(2022, 7, 13, 12)}
+    assert [unit.average_cooking_time for unit in units_orders_handover_time] == [150]
+
+
+def test_averages_are_calculated_for_sales_channels():
+    unit_uuids = [UNIT_UUID, uuid.uuid4()]
+
+    async def main():
+        await orders_handover_time.add_orders_handover_time(
+            [UNIT_UUID], BUSINESS_DATE, [
+                new_order(models.SalesChannel.DELIVERY, 100),
+                new_order(models.SalesChannel.DINE_IN, 200),
+                new_order(models.SalesChannel.TAKEAWAY, 600),
+            ],
+            datetime(2022, 7, 13, 11), 60)
+        return await asyncio.gather(*(
+            orders_handover_time.get_units_orders_handover_time(unit_uuids, BUSINESS_DATE, sales_channels)
+            for sales_channels in ([models.SalesChannel.DELIVERY, models.SalesChannel.DINE_IN],
+                                   [models.SalesChannel.TAKEAWAY])
+        ))
+
+    delivery_and_dine_in, takeaway = asyncio.run(main())
+    assert [(unit.unit_uuid, unit.unit_name, unit.average_cooking_time) for unit in delivery_and_dine_in] == [
+        (UNIT_UUID, 'Москва 4-1', 150)]
+    assert [unit.average_cooking_time for unit in takeaway] == [600]
@@ -43,3 +43,17 @@ def test_no_being_late_certificates(units):
         html = file.read()
     result: list = BeingLateCertificatesParser(html, None, units).parse()
     assert result == []
+
+
+def test_being_late_certificates_are_counted_per_unit(units):
+    with open(HTML_FILES_PATH / 'multiple_being_late_certificates.html', encoding='utf-8') as file:
+        html = file.read()
+    result = BeingLateCertificatesParser(html, None, units).parse()
+    assert [(i.unit_id, i.being_late_certificates_count) for i in result] == [
+        (389, 1), (717, 1), (719, 4), (970, 2), (652, 1),
+    ]
+
+
+def test_unexpected_being_late_certificates_page(units):
+    with pytest.raises(ValueError):
+        BeingLateCertificatesParser('Сервис недоступен', None, units).parse()
@@ -0,0 +1,57 @@
+import pathlib
+
+import pytest
+
+from core.config import ROOT_PATH
+from services.parsers import html as beautifulsoup_parsers
+from services.parsers import lxml_html as lxml_parsers
+
+HTML_FILES_PATH = pathlib.Path.joinpath(ROOT_PATH, 'tests', 'test_parsers', 'html')
+
+CASES = [
+    ('KitchenStatisticsParser', 'kitchen_work_partial.html', (389,)),
+    ('DeliveryStatisticsHTMLParser', 'delivery_work_partial.html', (389,)),
+    ('StockBalanceHTMLParser', 'stock_balance.html', (389,)),
+    ('SectorStopSalesHTMLParser', 'sector_stop_sales.html', ()),
+    ('StreetStopSalesHTMLParser', 'street_stop_sales.html', ()),
+]
+
+
+def read_html(file_name: str) -> str:
+    with open(HTML_FILES_PATH / file_name, encoding='utf-8') as file:
+        return file.read()
+
+
+@pytest.mark.parametrize('parser_name, file_name, args', CASES)
+def test_lxml_parser_output_is_identical_to_beautifulsoup_parser(parser_name, file_name, args):
+    html = read_html(file_name)
+    expected = getattr(beautifulsoup_parsers, parser_name)(html, *args).parse()
+    assert getattr(lxml_parsers, parser_name)(html, *args).parse() == expected
+
+
+def test_lxml_kitchen_statistics_parser():
+    kitchen = lxml_parsers.KitchenStatisticsParser(read_html('kitchen_work_partial.html'), 389).parse()
+    assert kitchen.revenue.per_hour == 3452
+    assert kitchen.revenue.delta_from_week_before == -7
+    assert kitchen.product_spending.per_hour == 5.6
+    assert kitchen.average_cooking_time == 727
+    assert (kitchen.tracking.postponed, kitchen.tracking.in_queue, kitchen.tracking.in_work) == (2, 14, 5)
+
+
+def test_lxml_stock_balance_parser():
+    stocks = lxml_parsers.StockBalanceHTMLParser(read_html('stock_balance.html'), 389).parse()
+    assert [(stock.ingredient_name, stock.days_left) for stock in stocks] == [
+        ('Сыр моцарелла', 1),
+        ('Соус томатный, Pizza', 7),
+        ('Пепперони', 2),
+    ]
+
+
+def test_lxml_stop_sales_parsers():
+    by_sectors = lxml_parsers.SectorStopSalesHTMLParser(read_html('sector_stop_sales.html')).parse()
+    by_streets = lxml_parsers.StreetStopSalesHTMLParser(read_html('street_stop_sales.html')).parse()
+    assert [stop_sale.sector for stop_sale in by_sectors] == ['Сектор 5', 'Южный']
+    assert by_sectors[0].staff_name_who_resumed is None
+    assert by_sectors[1].staff_name_who_resumed == 'Петрова Анна'
+    assert [stop_sale.street for stop_sale in by_streets] == ['ул. Ленина', 'пр-т Мира, д. 1-15']
+
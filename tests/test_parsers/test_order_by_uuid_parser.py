@@ -0,0 +1,56 @@
+import pathlib
+import uuid
+from datetime import datetime
+
+import pytest
+
+from core.config import ROOT_PATH
+from services.parsers.fragments import find_element_html, get_start_tag_pattern
+from services.parsers.html import OrderByUUIDParser
+
+HTML_FILES_PATH = pathlib.Path.joinpath(ROOT_PATH, 'tests', 'test_parsers', 'html')
+
+ORDER_UUID = uuid.UUID('0a1b2c3d-4e5f-6789-abcd-ef0123456789')
+
+
+def read_order_by_uuid() -> str:
+    with open(HTML_FILES_PATH / 'order_by_uuid.html', encoding='utf-8') as file:
+        return file.read()
+
+
+def test_order_by_uuid_parser():
+    order = OrderByUUIDParser(read_order_by_uuid(), ORDER_UUID, 789, 'Доставка').parse()
+    assert order.number == '64-3'
+    assert order.unit_name == 'Москва 4-1'
+    assert order.created_at == datetime(2023, 3, 14, 10, 31, 12)
+    assert order.receipt_printed_at == datetime(2023, 3, 14, 10, 36, 2)
+
+
+def test_order_without_refund_receipt():
+    html = read_order_by_uuid().replace('Закрыт чек на возврат', 'Заказ отменен')
+    order = OrderByUUIDParser(html, ORDER_UUID, 789, 'Доставка').parse()
+    assert order.receipt_printed_at is None
+
+
+def test_order_page_without_history():
+    html = read_order_by_uuid().replace('id="history"', 'id="comments"')
+    with pytest.raises(ValueError):
+        OrderByUUIDParser(html, ORDER_UUID, 789, 'Доставка').parse()
+
+
+def test_element_is_found_with_nested_elements_of_the_same_tag():
+    html = (
+        '<div data-id="history">decoy</div>'
+        '<div class="panel" id=history><div><div>first</div></div><div>second</div></div>'
+        '<div>after</div>'
+    )
+    assert find_element_html(html, 'div', get_start_tag_pattern('div', 'id', 'history')) == (
+        '<div class="panel" id=history><div><div>first</div></div><div>second</div></div>'
+    )
+
+
+def test_element_is_found_by_one_of_classes():
+    html = '<div class="headerDepartment-icon"></div><div class="header headerDepartment big">Москва 4-1</div>'
+    pattern = get_start_tag_pattern('div', 'class', 'headerDepartment')
+    assert find_element_html(html, 'div', pattern) == '<div class="header headerDepartment big">Москва 4-1</div>'
+    assert find_element_html(html, 'span', get_start_tag_pattern('span', 'id', 'orderNumber')) is None
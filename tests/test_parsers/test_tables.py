@@ -0,0 +1,45 @@
+import pathlib
+
+import numpy as np
+import pytest
+
+from core.config import ROOT_PATH
+from services.api.dodo_is_api.restaurant_orders import parse_restaurant_orders
+from services.parsers.tables import get_column_indices, iter_table_rows
+
+HTML_FILES_PATH = pathlib.Path.joinpath(ROOT_PATH, 'tests', 'test_parsers', 'html')
+
+
+def read_html(file_name: str) -> str:
+    with open(HTML_FILES_PATH / file_name, encoding='utf-8') as file:
+        return file.read()
+
+
+def test_rows_of_table_by_index():
+    header, *rows = iter_table_rows(read_html('single_unit_being_late_certificates.html'), table_index=1)
+    assert header[:3] == ['Дата и время', '№ заказа', 'Примерный срок доставки']
+    assert len(rows) == 2
+    # Whitespace around <br> is collapsed.
+    assert rows[0][0].count(' ') == 1
+
+
+def test_missing_table():
+    with pytest.raises(ValueError):
+        list(iter_table_rows(read_html('no_being_late_certificates.html'), table_index=1))
+
+
+def test_missing_columns():
+    with pytest.raises(ValueError):
+        get_column_indices(['Отдел', '№ заказа'], ['Отдел', '№ телефона'])
+
+
+def test_restaurant_orders_are_grouped_by_unit_name():
+    units_orders = parse_restaurant_orders(read_html('restaurant_orders.html'))
+    assert [unit_orders.unit_name for unit_orders in units_orders] == ['Москва 4-1', 'Москва 4-2']
+    first_unit_orders, second_unit_orders = units_orders
+    assert [first_unit_orders.numbers[0], first_unit_orders.phone_numbers[0]] == ['13-1', None]
+    assert [second_unit_orders.numbers[i] for i in range(len(second_unit_orders))] == ['12-1', '14-1']
+    assert second_unit_orders.phone_numbers[1] == '79991112233'
+    assert second_unit_orders.created_at.tolist() == np.array(
+        ['2022-07-13T10:05', '2022-07-13T11:15'], dtype='datetime64[s]').tolist()
+    assert first_unit_orders.created_at.dtype == np.dtype('datetime64[s]')
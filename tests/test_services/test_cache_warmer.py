@@ -0,0 +1,65 @@
+import asyncio
+import time
+
+from db.cache import refresh_ahead_time
+from services.cache_warmer import CacheWarmer
+
+
+def test_registered_unit_set_is_refreshed_ahead():
+    refresh_ahead_times = []
+
+    async def refresh():
+        refresh_ahead_times.append(refresh_ahead_time.get())
+        # Requests made by warmer itself don't prolong registration.
+        cache_warmer.register('kitchen_statistics', [389, 390], {'token': 'secret'}, refresh)
+
+    async def main():
+        cache_warmer.start()
+        cache_warmer.register('kitchen_statistics', [389, 390], {'token': 'secret'}, refresh)
+        cache_warmer.register('kitchen_statistics', [390, 389], {'token': 'secret'}, refresh)
+        assert cache_warmer.stats()['jobs'] == 1
+        cache_warmer.run_pending_jobs()
+        assert cache_warmer.stats()['running_jobs'] == 0
+
+        for job in cache_warmer._key_to_job.values():
+            job.next_run_at = time.monotonic()
+        cache_warmer.run_pending_jobs()
+        await asyncio.sleep(0.01)
+        stats = cache_warmer.stats()
+        await cache_warmer.stop()
+        return stats
+
+    cache_warmer = CacheWarmer(max_concurrency=2, idle_timeout=60, refresh_ahead_ratio=0.5)
+    stats = asyncio.run(main())
+    assert refresh_ahead_times == [15]
+    assert stats == {'jobs': 1, 'running_jobs': 0, 'runs': 1, 'errors': 0}
+    assert cache_warmer.stats()['jobs'] == 0
+
+
+def test_idle_unit_set_is_unregistered():
+
+    async def refresh():
+        pass
+
+    async def main():
+        cache_warmer.start()
+        cache_warmer.register('kitchen_statistics', [389], {'token': 'secret'}, refresh)
+        for job in cache_warmer._key_to_job.values():
+            job.requested_at -= 61
+        cache_warmer.run_pending_jobs()
+        jobs_count = cache_warmer.stats()['jobs']
+        await cache_warmer.stop()
+        return jobs_count
+
+    cache_warmer = CacheWarmer(max_concurrency=2, idle_timeout=60, refresh_ahead_ratio=0.5)
+    assert asyncio.run(main()) == 0
+
+
+def test_unit_set_is_not_registered_while_warmer_is_stopped():
+
+    async def refresh():
+        pass
+
+    cache_warmer = CacheWarmer(max_concurrency=2, idle_timeout=60, refresh_ahead_ratio=0.5)
+    cache_warmer.register('kitchen_statistics', [389], {'token': 'secret'}, refresh)
+    assert cache_warmer.stats()['jobs'] == 0
@@ -0,0 +1,79 @@
+import asyncio
+
+import httpx
+import pytest
+
+from services.api import http_clients as http_clients_module
+from services.api.http_clients import OFFICE_MANAGER_URL, SHIFT_MANAGER_URL, HTTPClients, build_cookie_header
+from services.api.transports import CircuitBreaker, CircuitOpenError
+
+
+def test_one_client_per_host():
+
+    async def main():
+        http_clients = HTTPClients(limits=httpx.Limits(), timeout=5, max_concurrent_requests=10)
+        kitchen_client = http_clients.get('https://officemanager.dodopizza.ru/OfficeManager/KitchenPartial')
+        delivery_client = http_clients.get('https://officemanager.dodopizza.ru/OfficeManager/DeliveryWorkPartial')
+        shift_manager_client = http_clients.get('https://shiftmanager.dodopizza.ru/Managment/ShiftManagment/Order')
+        await http_clients.close()
+        return kitchen_client, delivery_client, shift_manager_client
+
+    kitchen_client, delivery_client, shift_manager_client = asyncio.run(main())
+    assert kitchen_client is delivery_client
+    assert kitchen_client is not shift_manager_client
+    assert kitchen_client.is_closed and shift_manager_client.is_closed
+
+
+def test_cookies_set_by_response_are_not_shared():
+    sent_cookies = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        sent_cookies.append(request.headers.get('Cookie'))
+        return httpx.Response(200, headers={'Set-Cookie': 'session=first-user; Path=/'})
+
+    async def main():
+        http_clients = HTTPClients(limits=httpx.Limits(), timeout=5, max_concurrent_requests=10,
+                                   transport=httpx.MockTransport(handler))
+        url = 'https://officemanager.dodopizza.ru/Reports/Orders/Get'
+        await http_clients.get(url).get(url, headers=build_cookie_header({'session': 'first-user'}))
+        await http_clients.get(url).get(url)
+        await http_clients.close()
+
+    asyncio.run(main())
+    assert sent_cookies == ['session=first-user', None]
+
+
+def test_http2_falls_back_to_http11_without_h2(monkeypatch):
+    monkeypatch.setattr(http_clients_module, 'is_http2_available', lambda: False)
+
+    http_clients = HTTPClients(limits=httpx.Limits(), timeout=5, max_concurrent_requests=10, http2=True)
+    assert http_clients.http2 is False
+
+
+def test_circuit_breaker_is_per_host():
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.host == 'officemanager.dodopizza.ru':
+            raise httpx.ConnectTimeout('Timed out', request=request)
+        return httpx.Response(200)
+
+    async def main():
+        http_clients = HTTPClients(
+            limits=httpx.Limits(), timeout=5, max_concurrent_requests=10, transport=httpx.MockTransport(handler),
+            breaker_factory=lambda: CircuitBreaker(failure_rate_threshold=0.5, min_calls=2, window=60, open_time=15),
+        )
+        for _ in range(2):
+            with pytest.raises(httpx.ConnectTimeout):
+                await http_clients.get(OFFICE_MANAGER_URL).get(f'{OFFICE_MANAGER_URL}/OfficeManager')
+        with pytest.raises(CircuitOpenError):
+            await http_clients.get(OFFICE_MANAGER_URL).get(f'{OFFICE_MANAGER_URL}/OfficeManager')
+        response = await http_clients.get(SHIFT_MANAGER_URL).get(f'{SHIFT_MANAGER_URL}/Managment')
+        stats = http_clients.stats()
+        await http_clients.close()
+        return response, stats
+
+    response, stats = asyncio.run(main())
+    assert response.status_code == 200
+    assert stats['officemanager.dodopizza.ru']['state'] == 'open'
+    assert stats['shiftmanager.dodopizza.ru']['state'] == 'closed'
+    assert stats['shiftmanager.dodopizza.ru']['in_flight'] == 0
@@ -0,0 +1,34 @@
+import asyncio
+
+import httpx
+
+from endpoints.v1.stocks import get_ingredient_stocks
+from repositories import OfficeManagerRepository
+from services.api.http_clients import OFFICE_MANAGER_URL, HTTPClients
+from services.api.transports import CircuitBreaker
+
+
+def test_stocks_of_units_behind_open_circuit_are_reported_as_errors():
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        raise httpx.ConnectTimeout('Timed out', request=request)
+
+    async def main():
+        http_clients = HTTPClients(
+            limits=httpx.Limits(), timeout=5, max_concurrent_requests=10, transport=httpx.MockTransport(handler),
+            breaker_factory=lambda: CircuitBreaker(failure_rate_threshold=1, min_calls=1, window=60, open_time=15),
+        )
+        office_manager = OfficeManagerRepository(http_clients.get(OFFICE_MANAGER_URL))
+        statistics = await get_ingredient_stocks(
+            unit_ids={389, 390, 391},
+            cookies={'session': 'user'},
+            office_manager=office_manager,
+        )
+        stats = http_clients.stats()
+        await http_clients.close()
+        return statistics, stats
+
+    statistics, stats = asyncio.run(main())
+    assert statistics.units == []
+    assert sorted(statistics.error_unit_ids) == [389, 390, 391]
+    assert stats['officemanager.dodopizza.ru']['state'] == 'open'
@@ -0,0 +1,54 @@
+import asyncio
+
+import pytest
+
+from services.api.pagination import paginate
+
+
+async def collect(pages) -> list:
+    return [page async for page in pages]
+
+
+def test_pages_are_fetched_concurrently_and_yielded_in_order():
+    in_flight_count = 0
+    max_in_flight_count = 0
+    requested_pages = []
+
+    async def fetch_page(page: int) -> list[int]:
+        nonlocal in_flight_count, max_in_flight_count
+        requested_pages.append(page)
+        in_flight_count += 1
+        max_in_flight_count = max(max_in_flight_count, in_flight_count)
+        # Earlier pages answer later, so that order of results differs from order of completion.
+        await asyncio.sleep(0.01 / page)
+        in_flight_count -= 1
+        return [page * 10, page * 10 + 1] if page <= 5 else []
+
+    pages = asyncio.run(collect(paginate(fetch_page, window=3)))
+    assert pages == [[10, 11], [20, 21], [30, 31], [40, 41], [50, 51]]
+    assert max_in_flight_count == 3
+    assert max(requested_pages) <= 8
+
+
+def test_errors_past_the_last_page_are_discarded():
+
+    async def fetch_page(page: int) -> list[int]:
+        if page == 2:
+            return []
+        if page > 2:
+            raise RuntimeError('Page does not exist')
+        await asyncio.sleep(0.01)
+        return [page]
+
+    assert asyncio.run(collect(paginate(fetch_page, window=4))) == [[1]]
+
+
+def test_error_of_page_is_raised():
+
+    async def fetch_page(page: int) -> list[int]:
+        if page == 2:
+            raise RuntimeError('Upstream error')
+        return [page]
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(collect(paginate(fetch_page, window=2)))
@@ -0,0 +1,82 @@
+import asyncio
+import os
+import pathlib
+from concurrent.futures.process import BrokenProcessPool
+
+import pytest
+
+from core.config import ROOT_PATH
+from services.parse_executor import ParseExecutor
+from services.parsers.html import DeliveryStatisticsHTMLParser
+
+HTML_FILES_PATH = pathlib.Path.joinpath(ROOT_PATH, 'tests', 'test_parsers', 'html')
+
+
+def read_delivery_work_partial() -> str:
+    with open(HTML_FILES_PATH / 'delivery_work_partial.html', encoding='utf-8') as file:
+        return file.read()
+
+
+def exit_once(html: str, marker_path: pathlib.Path) -> int:
+    """Kill worker on the first call, as OOM killer would."""
+    if not marker_path.exists():
+        marker_path.touch()
+        os._exit(1)
+    return len(html)
+
+
+def exit_always(html: str) -> int:
+    os._exit(1)
+
+
+def test_pool_is_recreated_after_worker_death(tmp_path):
+    html = read_delivery_work_partial()
+    parse_executor = ParseExecutor(max_workers=1, queue_size=0, inline_threshold=0)
+
+    async def main():
+        parse_executor.start()
+        try:
+            length = await parse_executor.run(exit_once, html, tmp_path / 'worker_exited')
+            with pytest.raises(BrokenProcessPool):
+                await parse_executor.run(exit_always, html)
+            result = await parse_executor.run(DeliveryStatisticsHTMLParser.parse_html, html, 389)
+            return length, result
+        finally:
+            await parse_executor.close()
+
+    length, result = asyncio.run(main())
+    assert length == len(html)
+    assert result == DeliveryStatisticsHTMLParser(html, 389).parse()
+    assert parse_executor.stats() == {'is_running': False, 'pending': 0, 'inline_runs': 0, 'pool_runs': 5,
+                                      'pool_restarts': 3}
+
+
+def test_pages_are_parsed_inline_until_executor_is_started():
+    html = read_delivery_work_partial()
+    parse_executor = ParseExecutor(max_workers=1, queue_size=0, inline_threshold=0)
+    result = asyncio.run(parse_executor.run(DeliveryStatisticsHTMLParser.parse_html, html, 389))
+    assert result == DeliveryStatisticsHTMLParser(html, 389).parse()
+    assert parse_executor.stats() == {'is_running': False, 'pending': 0, 'inline_runs': 1, 'pool_runs': 0,
+                                      'pool_restarts': 0}
+
+
+def test_large_pages_are_parsed_in_pool():
+    html = read_delivery_work_partial()
+    small_html = html[:len(html) // 2]
+    parse_executor = ParseExecutor(max_workers=1, queue_size=1, inline_threshold=len(html))
+
+    async def main():
+        parse_executor.start()
+        try:
+            return await asyncio.gather(
+                *(parse_executor.run(DeliveryStatisticsHTMLParser.parse_html, html, unit_id) for unit_id in range(4)),
+                parse_executor.run(len, small_html),
+            )
+        finally:
+            await parse_executor.close()
+
+    *results, small_html_length = asyncio.run(main())
+    assert results == [DeliveryStatisticsHTMLParser(html, unit_id).parse() for unit_id in range(4)]
+    assert small_html_length == len(small_html)
+    assert parse_executor.stats() == {'is_running': False, 'pending': 0, 'inline_runs': 1, 'pool_runs': 4,
+                                      'pool_restarts': 0}
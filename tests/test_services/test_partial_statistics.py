@@ -0,0 +1,45 @@
+import asyncio
+
+import httpx
+
+from services.api.dodo_is_api import partial_statistics
+from services.api.http_clients import HTTPClients
+
+
+class StubParser:
+
+    def __init__(self, html: str, unit_id: int):
+        self.html = html
+
+    def parse(self) -> str:
+        return self.html
+
+    @classmethod
+    def parse_html(cls, html: str, unit_id: int) -> str:
+        return cls(html, unit_id).parse()
+
+
+def test_concurrent_requests_are_coalesced_only_for_the_same_cookies(monkeypatch):
+    sent_cookies = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        sent_cookies.append(request.headers['Cookie'])
+        await asyncio.sleep(0.01)
+        return httpx.Response(200, text=request.headers['Cookie'])
+
+    url = 'https://officemanager.dodopizza.ru/OfficeManager/OperationalStatistics/KitchenPartial'
+
+    async def main():
+        http_clients = HTTPClients(limits=httpx.Limits(), timeout=5, max_concurrent_requests=10,
+                                   transport=httpx.MockTransport(handler))
+        monkeypatch.setattr(partial_statistics, 'http_clients', http_clients)
+        results = await asyncio.gather(
+            partial_statistics.request_partial_statistics({'session': 'first'}, 389, url, StubParser),
+            partial_statistics.request_partial_statistics({'session': 'first'}, 389, url, StubParser),
+            partial_statistics.request_partial_statistics({'session': 'second'}, 389, url, StubParser),
+        )
+        await http_clients.close()
+        return results
+
+    assert asyncio.run(main()) == ['session=first', 'session=first', 'session=second']
+    assert sorted(sent_cookies) == ['session=first', 'session=second']
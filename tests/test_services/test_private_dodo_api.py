@@ -0,0 +1,71 @@
+import asyncio
+import uuid
+
+import httpx
+import pytest
+from pydantic import BaseModel, Field
+
+from core.config import app_settings
+from services.api import private_dodo_api
+from services.api.http_clients import HTTPClients
+from utils import exceptions, time_utils
+
+URL = 'https://api.dodois.io/dodopizza/ru/production/stop-sales-products'
+
+
+class UnitItem(BaseModel):
+    unit_id: str = Field(alias='unitId')
+
+
+def request_units(monkeypatch, handler, unit_uuids: list[uuid.UUID]) -> private_dodo_api.ShardedResponse[UnitItem]:
+    monkeypatch.setattr(app_settings, 'private_dodo_api_shard_size', 2)
+
+    async def main():
+        http_clients = HTTPClients(limits=httpx.Limits(), timeout=5, max_concurrent_requests=10,
+                                   transport=httpx.MockTransport(handler))
+        monkeypatch.setattr(private_dodo_api, 'http_clients', http_clients)
+        try:
+            return await private_dodo_api.request_to_private_dodo_api(
+                URL, 'token', unit_uuids, time_utils.Period.new_today(), 'stopSalesByProducts', UnitItem)
+        finally:
+            await http_clients.close()
+
+    return asyncio.run(main())
+
+
+def test_units_are_requested_by_shards_and_merged(monkeypatch):
+    requested_shards = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        unit_uuids = request.url.params['units'].split(',')
+        requested_shards.append(unit_uuids)
+        return httpx.Response(200, json={'stopSalesByProducts': [{'unitId': unit_uuid} for unit_uuid in unit_uuids]})
+
+    unit_uuids = [uuid.uuid4() for _ in range(5)]
+    response = request_units(monkeypatch, handler, unit_uuids)
+    assert sorted(len(shard) for shard in requested_shards) == [1, 2, 2]
+    assert sorted(item.unit_id for item in response.items) == sorted(unit_uuid.hex for unit_uuid in unit_uuids)
+    assert response.error_unit_uuids == []
+
+
+def test_units_of_failed_shard_are_reported(monkeypatch):
+    unit_uuids = sorted(uuid.uuid4() for _ in range(4))
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if unit_uuids[0].hex in request.url.params['units']:
+            return httpx.Response(500)
+        return httpx.Response(200, json={'stopSalesByProducts': [{'unitId': unit_uuids[2].hex}]})
+
+    response = request_units(monkeypatch, handler, unit_uuids)
+    assert response.items == [UnitItem(unitId=unit_uuids[2].hex)]
+    assert response.error_unit_uuids == unit_uuids[:2]
+
+
+def test_error_is_raised_if_every_shard_has_failed(monkeypatch):
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(401)
+
+    with pytest.raises(exceptions.PrivateDodoAPIError) as error:
+        request_units(monkeypatch, handler, [uuid.uuid4() for _ in range(3)])
+    assert error.value.status_code == 401
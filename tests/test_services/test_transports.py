@@ -0,0 +1,170 @@
+import asyncio
+
+import httpx
+import pytest
+
+from services.api import transports
+from services.api.transports import (
+    CircuitBreaker,
+    CircuitBreakerTransport,
+    CircuitOpenError,
+    CircuitState,
+    ConcurrencyLimitedTransport,
+)
+
+
+class ChunkedByteStream(httpx.AsyncByteStream):
+
+    def __init__(self, chunks: list[bytes]):
+        self._chunks = chunks
+
+    async def __aiter__(self):
+        for chunk in self._chunks:
+            await asyncio.sleep(0)
+            yield chunk
+
+
+def test_requests_in_flight_are_limited():
+    in_flight_count = 0
+    max_in_flight_count = 0
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal in_flight_count, max_in_flight_count
+        in_flight_count += 1
+        max_in_flight_count = max(max_in_flight_count, in_flight_count)
+        await asyncio.sleep(0.01)
+        in_flight_count -= 1
+        return httpx.Response(200, text='ok')
+
+    async def main():
+        transport = ConcurrencyLimitedTransport(httpx.MockTransport(handler), max_concurrent_requests=3)
+        async with httpx.AsyncClient(transport=transport) as client:
+            responses = await asyncio.gather(*(client.get(f'https://example.com/{i}') for i in range(20)))
+        return transport, responses
+
+    transport, responses = asyncio.run(main())
+    assert [response.text for response in responses] == ['ok'] * 20
+    assert max_in_flight_count == 3
+    assert transport.in_flight_count == 0
+
+
+def test_slot_is_released_on_error():
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        raise httpx.ConnectError('Connection refused', request=request)
+
+    async def main():
+        transport = ConcurrencyLimitedTransport(httpx.MockTransport(handler), max_concurrent_requests=1)
+        async with httpx.AsyncClient(transport=transport) as client:
+            for _ in range(3):
+                try:
+                    await client.get('https://example.com/')
+                except httpx.ConnectError:
+                    pass
+        return transport
+
+    assert asyncio.run(main()).in_flight_count == 0
+
+
+def test_slot_is_held_until_streamed_body_is_read():
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, stream=ChunkedByteStream([b'o', b'k']))
+
+    async def main():
+        transport = ConcurrencyLimitedTransport(httpx.MockTransport(handler), max_concurrent_requests=2)
+        async with httpx.AsyncClient(transport=transport) as client:
+            async with client.stream('GET', 'https://example.com/') as response:
+                in_flight_count_while_streaming = transport.in_flight_count
+                body = await response.aread()
+            responses = await asyncio.gather(*(client.get(f'https://example.com/{i}') for i in range(10)))
+        return transport, in_flight_count_while_streaming, body, responses
+
+    transport, in_flight_count_while_streaming, body, responses = asyncio.run(main())
+    assert in_flight_count_while_streaming == 1
+    assert body == b'ok'
+    assert [response.text for response in responses] == ['ok'] * 10
+    assert transport.in_flight_count == 0
+
+
+@pytest.fixture
+def clock(monkeypatch) -> list[float]:
+    now = [1000.0]
+    monkeypatch.setattr(transports.time, 'monotonic', lambda: now[0])
+    return now
+
+
+def test_circuit_opens_on_failure_rate_and_closes_after_successful_probe(clock):
+    breaker = CircuitBreaker(failure_rate_threshold=0.5, min_calls=4, window=60, open_time=15)
+    for is_failure in (False, True, True):
+        breaker.record(breaker.allow(), is_failure)
+    assert breaker.state is CircuitState.CLOSED
+
+    breaker.record(breaker.allow(), is_failure=True)
+    assert breaker.state is CircuitState.OPEN
+    assert breaker.allow() is None
+    assert breaker.retry_after == 15
+
+    clock[0] += 15
+    probe_generation = breaker.allow()
+    assert probe_generation is not None
+    assert breaker.allow() is None, 'Only one probe is let through'
+    breaker.record(probe_generation, is_failure=False)
+    assert breaker.state is CircuitState.CLOSED
+    assert breaker.allow() is not None
+
+
+def test_failed_probe_opens_circuit_again(clock):
+    breaker = CircuitBreaker(failure_rate_threshold=1, min_calls=1, window=60, open_time=15)
+    breaker.record(breaker.allow(), is_failure=True)
+    clock[0] += 15
+    breaker.record(breaker.allow(), is_failure=True)
+    assert breaker.state is CircuitState.OPEN
+    assert breaker.retry_after == 15
+
+
+def test_outcomes_of_calls_admitted_before_circuit_opened_are_not_taken_for_probe(clock):
+    breaker = CircuitBreaker(failure_rate_threshold=1, min_calls=1, window=60, open_time=15)
+    slow_generations = [breaker.allow(), breaker.allow()]
+    breaker.record(breaker.allow(), is_failure=True)
+    clock[0] += 15
+    probe_generation = breaker.allow()
+
+    breaker.record(slow_generations[0], is_failure=False)
+    breaker.cancel(slow_generations[1])
+    assert breaker.state is CircuitState.HALF_OPEN
+    assert breaker.allow() is None, 'Probe is still in flight'
+
+    breaker.record(probe_generation, is_failure=True)
+    assert breaker.state is CircuitState.OPEN
+
+
+def test_outcomes_outside_window_are_forgotten(clock):
+    breaker = CircuitBreaker(failure_rate_threshold=0.5, min_calls=2, window=60, open_time=15)
+    breaker.record(breaker.allow(), is_failure=True)
+    clock[0] += 61
+    breaker.record(breaker.allow(), is_failure=False)
+    breaker.record(breaker.allow(), is_failure=False)
+    assert breaker.state is CircuitState.CLOSED
+    assert breaker.stats()['failure_rate'] == 0
+
+
+def test_open_circuit_fails_fast():
+    requests_count = 0
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal requests_count
+        requests_count += 1
+        return httpx.Response(503)
+
+    async def main():
+        breaker = CircuitBreaker(failure_rate_threshold=0.5, min_calls=3, window=60, open_time=15)
+        transport = CircuitBreakerTransport(httpx.MockTransport(handler), breaker)
+        async with httpx.AsyncClient(transport=transport) as client:
+            responses = [await client.get('https://officemanager.dodopizza.ru/') for _ in range(3)]
+            with pytest.raises(CircuitOpenError):
+                await client.get('https://officemanager.dodopizza.ru/')
+        return responses
+
+    assert [response.status_code for response in asyncio.run(main())] == [503] * 3
+    assert requests_count == 3
@@ -0,0 +1,111 @@
+import asyncio
+import json
+import uuid
+from datetime import datetime
+
+import pytest
+from fastapi.testclient import TestClient
+
+import models
+from app import app
+from services.statistics import orders
+from utils import exceptions, time_utils
+from utils.retry import RetryPolicy
+
+
+def new_order(order_uuid: uuid.UUID) -> models.OrderByUUID:
+    return models.OrderByUUID(
+        unit_name='Москва 4-1', created_at=datetime(2022, 7, 13, 10), receipt_printed_at=None,
+        number='1-1', type='Доставка', price=500, uuid=order_uuid,
+    )
+
+
+def new_order_partial(order_uuid: uuid.UUID) -> models.OrderPartial:
+    return models.OrderPartial(uuid=order_uuid, price=500, number='1-1', type='Доставка')
+
+
+def test_failed_orders_are_retried_once_and_reported(monkeypatch):
+    flaky_uuid, broken_uuid, ok_uuid = uuid.uuid4(), uuid.uuid4(), uuid.uuid4()
+    uuid_to_calls_count = {flaky_uuid: 0, broken_uuid: 0, ok_uuid: 0}
+
+    async def get_canceled_orders_partial(cookies, period):
+        yield [new_order_partial(flaky_uuid), new_order_partial(broken_uuid)]
+        yield [new_order_partial(ok_uuid)]
+
+    async def get_order_by_uuid(cookies, order_uuid, order_price, order_type):
+        uuid_to_calls_count[order_uuid] += 1
+        if order_uuid == broken_uuid or (order_uuid == flaky_uuid and uuid_to_calls_count[order_uuid] == 1):
+            raise exceptions.OrderByUUIDAPIError(
+                order_uuid=order_uuid, order_price=order_price, order_type=order_type, status_code=503)
+        return new_order(order_uuid)
+
+    monkeypatch.setattr(orders.dodo_is_api, 'get_canceled_orders_partial', get_canceled_orders_partial)
+    monkeypatch.setattr(orders.dodo_is_api, 'get_order_by_uuid', get_order_by_uuid)
+    monkeypatch.setattr(orders, 'order_retry_policy',
+                        RetryPolicy(max_attempts=3, base_delay=0.001, max_delay=0.001, max_total_delay=1))
+
+    canceled_orders = asyncio.run(orders.get_canceled_orders({}, time_utils.Period.new_today()))
+    assert sorted(order.uuid for order in canceled_orders.orders) == sorted([flaky_uuid, ok_uuid])
+    assert canceled_orders.error_order_uuids == [broken_uuid]
+    assert uuid_to_calls_count == {flaky_uuid: 2, broken_uuid: 3, ok_uuid: 1}
+
+
+def test_details_are_fetched_while_pages_are_arriving(monkeypatch):
+    first_order_fetched = asyncio.Event()
+
+    async def get_canceled_orders_partial(cookies, period):
+        yield [new_order_partial(uuid.uuid4())]
+        # Sequential implementation would never fetch details of the first page.
+        await asyncio.wait_for(first_order_fetched.wait(), timeout=1)
+        yield [new_order_partial(uuid.uuid4())]
+
+    async def get_order_by_uuid(cookies, order_uuid, order_price, order_type):
+        first_order_fetched.set()
+        return new_order(order_uuid)
+
+    monkeypatch.setattr(orders.dodo_is_api, 'get_canceled_orders_partial', get_canceled_orders_partial)
+    monkeypatch.setattr(orders.dodo_is_api, 'get_order_by_uuid', get_order_by_uuid)
+
+    canceled_orders = asyncio.run(orders.get_canceled_orders({}, time_utils.Period.new_today()))
+    assert len(canceled_orders.orders) == 2
+
+
+def test_pagination_error_is_raised(monkeypatch):
+
+    async def get_canceled_orders_partial(cookies, period):
+        yield [new_order_partial(uuid.uuid4()) for _ in range(5)]
+        raise exceptions.OrdersPartialAPIError
+
+    async def get_order_by_uuid(cookies, order_uuid, order_price, order_type):
+        return new_order(order_uuid)
+
+    monkeypatch.setattr(orders.dodo_is_api, 'get_canceled_orders_partial', get_canceled_orders_partial)
+    monkeypatch.setattr(orders.dodo_is_api, 'get_order_by_uuid', get_order_by_uuid)
+
+    with pytest.raises(exceptions.OrdersPartialAPIError):
+        asyncio.run(orders.get_canceled_orders({}, time_utils.Period.new_today()))
+
+
+def test_canceled_orders_are_streamed_as_ndjson(monkeypatch):
+    ok_uuid, broken_uuid = uuid.uuid4(), uuid.uuid4()
+
+    async def get_canceled_orders_partial(cookies, period):
+        yield [new_order_partial(ok_uuid), new_order_partial(broken_uuid)]
+
+    async def get_order_by_uuid(cookies, order_uuid, order_price, order_type):
+        if order_uuid == broken_uuid:
+            raise exceptions.OrderByUUIDAPIError(
+                order_uuid=order_uuid, order_price=order_price, order_type=order_type, status_code=404)
+        return new_order(order_uuid)
+
+    monkeypatch.setattr(orders.dodo_is_api, 'get_canceled_orders_partial', get_canceled_orders_partial)
+    monkeypatch.setattr(orders.dodo_is_api, 'get_order_by_uuid', get_order_by_uuid)
+
+    response = TestClient(app).post('/v1/canceled-orders/stream', json={'cookies': {}, 'date': '2022-07-13'})
+    assert response.status_code == 200
+    assert response.headers['content-type'] == 'application/x-ndjson'
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert sorted(lines, key=len) == [
+        {'error_order_uuid': str(broken_uuid)},
+        json.loads(new_order(ok_uuid).json()),
+    ]
@@ -0,0 +1,58 @@
+import asyncio
+import uuid
+from datetime import datetime
+
+import pytest
+from fakeredis import aioredis
+
+import models
+from db import redis_db
+from db.local_cache import local_cache
+from services.api import private_dodo_api
+from services.statistics import delivery
+from utils import time_utils
+
+UNIT_UUID = uuid.UUID('000d3a24-0c71-9a87-11e6-8aba13f80da9')
+ERROR_UNIT_UUID = uuid.UUID('000d3a24-0c71-9a87-11e6-8aba13f82835')
+
+
+@pytest.fixture(autouse=True)
+def redis_connection(monkeypatch):
+    monkeypatch.setattr(redis_db, 'connection', aioredis.FakeRedis())
+    local_cache.clear()
+    yield
+    local_cache.clear()
+
+
+def new_unit_delivery_statistics(unit_uuid: uuid.UUID) -> models.UnitDeliveryStatistics:
+    return models.UnitDeliveryStatistics(
+        unitId=unit_uuid,
+        unitName='Москва 4-1',
+        avgCookingTime=600,
+        avgDeliveryOrderFulfillmentTime=1800,
+        avgHeatedShelfTime=120,
+        avgOrderTripTime=900,
+        couriersShiftsDuration=36000,
+        deliveryOrdersCount=20,
+        deliverySales=20000,
+        lateOrdersCount=1,
+        ordersWithCourierAppCount=20,
+        tripsCount=10,
+        tripsDuration=18000,
+    )
+
+
+def test_units_of_failed_shards_are_reported_as_errors(monkeypatch):
+
+    async def get_delivery_statistics(token, unit_uuids, period):
+        return private_dodo_api.ShardedResponse(
+            items=[new_unit_delivery_statistics(UNIT_UUID)],
+            error_unit_uuids=[ERROR_UNIT_UUID],
+        )
+
+    monkeypatch.setattr(delivery.private_dodo_api, 'get_delivery_statistics', get_delivery_statistics)
+    period = time_utils.Period(datetime(2022, 7, 12), datetime(2022, 7, 13))
+
+    response = asyncio.run(delivery.get_delivery_statistics('token', [UNIT_UUID, ERROR_UNIT_UUID], period))
+    assert [unit.unit_id for unit in response.items] == [UNIT_UUID]
+    assert response.error_unit_uuids == [ERROR_UNIT_UUID]
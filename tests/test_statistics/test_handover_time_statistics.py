@@ -0,0 +1,84 @@
+import asyncio
+import uuid
+from datetime import datetime
+
+import pytest
+from fakeredis import aioredis
+
+import models
+from db import redis_db
+from services.api import private_dodo_api
+from services.statistics import production
+from utils import time_utils
+
+UNIT_UUID = uuid.UUID('000d3a24-0c71-9a87-11e6-8aba13f80da9')
+NEW_UNIT_UUID = uuid.UUID('000d3a24-0c71-9a87-11e6-8aba13f82835')
+
+
+@pytest.fixture(autouse=True)
+def redis_connection(monkeypatch):
+    monkeypatch.setattr(redis_db, 'connection', aioredis.FakeRedis())
+
+
+def new_order(unit_uuid: uuid.UUID, cooking_time: int) -> models.OrdersHandoverTime:
+    return models.OrdersHandoverTime(
+        unitId=unit_uuid,
+        unitName='Москва 4-1',
+        orderId=uuid.uuid4(),
+        orderNumber='1-1',
+        salesChannel='Delivery',
+        orderTrackingStartAt=datetime(2022, 7, 13, 10),
+        trackingPendingTime=10,
+        cookingTime=cooking_time,
+        heatedShelfTime=30,
+    )
+
+
+def test_only_orders_since_previous_fetch_are_fetched(monkeypatch):
+    now = datetime(2022, 7, 13, 12)
+    requests = []
+    unit_uuid_to_orders = {UNIT_UUID: [new_order(UNIT_UUID, 100)], NEW_UNIT_UUID: [new_order(NEW_UNIT_UUID, 300)]}
+
+    async def get_orders_handover_time(token, unit_uuids, period):
+        requests.append((sorted(unit_uuids), period.from_datetime))
+        return private_dodo_api.ShardedResponse(
+            items=[order for unit_uuid in unit_uuids for order in unit_uuid_to_orders[unit_uuid]],
+            error_unit_uuids=[],
+        )
+
+    monkeypatch.setattr(time_utils.Period, 'now', staticmethod(lambda: now))
+    monkeypatch.setattr(production.private_dodo_api, 'get_orders_handover_time', get_orders_handover_time)
+
+    async def get_statistics(unit_uuids: list[uuid.UUID]) -> dict[uuid.UUID, int]:
+        response = await production.get_orders_handover_time_statistics(
+            'token', unit_uuids, [models.SalesChannel.DELIVERY])
+        return {unit.unit_uuid: unit.average_cooking_time for unit in response.items}
+
+    async def main():
+        nonlocal now
+        statistics_before = await get_statistics([UNIT_UUID])
+        now = datetime(2022, 7, 13, 14)
+        unit_uuid_to_orders[UNIT_UUID] = [new_order(UNIT_UUID, 200)]
+        return statistics_before, await get_statistics([UNIT_UUID, NEW_UNIT_UUID])
+
+    statistics_before, statistics_after = asyncio.run(main())
+    assert statistics_before == {UNIT_UUID: 100}
+    assert statistics_after == {UNIT_UUID: 150, NEW_UNIT_UUID: 300}
+    assert sorted(requests[1:]) == [
+        ([UNIT_UUID], datetime(2022, 7, 13, 11)),
+        ([NEW_UNIT_UUID], datetime(2022, 7, 13)),
+    ]
+    assert requests[0] == ([UNIT_UUID], datetime(2022, 7, 13))
+
+
+def test_units_of_failed_shards_are_reported(monkeypatch):
+
+    async def get_orders_handover_time(token, unit_uuids, period):
+        return private_dodo_api.ShardedResponse(items=[new_order(UNIT_UUID, 100)], error_unit_uuids=[NEW_UNIT_UUID])
+
+    monkeypatch.setattr(production.private_dodo_api, 'get_orders_handover_time', get_orders_handover_time)
+
+    response = asyncio.run(production.get_orders_handover_time_statistics(
+        'token', [UNIT_UUID, NEW_UNIT_UUID], [models.SalesChannel.DELIVERY]))
+    assert [unit.unit_uuid for unit in response.items] == [UNIT_UUID]
+    assert response.error_unit_uuids == [NEW_UNIT_UUID]
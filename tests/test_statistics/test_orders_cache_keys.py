@@ -0,0 +1,28 @@
+from datetime import date, datetime
+
+import pytest
+
+from services.statistics.orders import get_being_late_certificates_key, get_restaurant_orders_key
+from utils import time_utils
+
+
+@pytest.mark.parametrize(
+    'business_date,expected',
+    [
+        (date(2022, 7, 13), 'restaurant_orders@389@2022-07-13'),
+        (date(2022, 7, 12), 'restaurant_orders_archive@389@2022-07-12'),
+    ]
+)
+def test_get_restaurant_orders_key(business_date, expected, monkeypatch):
+    monkeypatch.setattr(time_utils.Period, 'now', staticmethod(lambda: datetime(2022, 7, 13, 15, 30)))
+    assert get_restaurant_orders_key(389, business_date) == expected
+
+
+def test_get_being_late_certificates_key_includes_period_date(monkeypatch):
+    monkeypatch.setattr(time_utils.Period, 'now', staticmethod(lambda: datetime(2022, 7, 13, 15, 30)))
+    assert get_being_late_certificates_key(
+        'being_late_certificates_today', 389, time_utils.Period.new_today(),
+    ) == 'being_late_certificates_today@389@2022-07-13'
+    assert get_being_late_certificates_key(
+        'being_late_certificates_week_before', 389, time_utils.Period.new_week_ago(),
+    ) == 'being_late_certificates_week_before@389@2022-07-06'
@@ -0,0 +1,68 @@
+import asyncio
+import json
+
+import pytest
+
+from utils.json_stream import iter_array_items
+
+
+async def split(document: str, chunk_size: int):
+    data = document.encode('utf-8')
+    for i in range(0, len(data), chunk_size):
+        yield data[i:i + chunk_size]
+
+
+def decode(document: str, key: str, chunk_size: int = 1) -> list:
+
+    async def main():
+        return [item async for item in iter_array_items(split(document, chunk_size), key)]
+
+    return asyncio.run(main())
+
+
+@pytest.mark.parametrize('chunk_size', [1, 2, 7, 1024])
+def test_items_are_decoded_from_chunks(chunk_size):
+    document = {
+        'total': 12345,
+        'meta': {'items': [0, 1], 'name': 'Москва, "4-1" [центр]'},
+        'ordersHandoverTime': [
+            {'unitName': 'Москва 4-1', 'cookingTime': 1234567, 'tags': ['a', 'б']},
+            {'unitName': 'Вологда', 'cookingTime': -1.5e3, 'tags': []},
+            12345,
+            None,
+        ],
+        'isEndOfListReached': True,
+    }
+    text = json.dumps(document, ensure_ascii=False, indent=2)
+    assert decode(text, 'ordersHandoverTime', chunk_size) == document['ordersHandoverTime']
+
+
+def test_document_split_at_any_byte_is_decoded_the_same():
+    document = {
+        'total': 12.5,
+        'ordersHandoverTime': [1.5, -2.25e-3, 1234567, True, False, None, 'Москва 4-1', {'cookingTime': 10.75}],
+        'isEndOfListReached': True,
+    }
+    data = json.dumps(document, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+    async def chunks(offset: int):
+        yield data[:offset]
+        yield data[offset:]
+
+    async def main(offset: int):
+        return [item async for item in iter_array_items(chunks(offset), 'ordersHandoverTime')]
+
+    for offset in range(len(data) + 1):
+        assert asyncio.run(main(offset)) == document['ordersHandoverTime'], offset
+
+
+def test_empty_and_missing_arrays():
+    assert decode('{"ordersHandoverTime": []}', 'ordersHandoverTime') == []
+    assert decode('{"stopSalesByProducts": [1, 2]}', 'ordersHandoverTime') == []
+    assert decode('{}', 'ordersHandoverTime') == []
+
+
+@pytest.mark.parametrize('document', ['[1, 2]', '{"ordersHandoverTime": [1, 2}', '{"ordersHandoverTime": [1'])
+def test_invalid_document_is_rejected(document):
+    with pytest.raises(ValueError):
+        decode(document, 'ordersHandoverTime')
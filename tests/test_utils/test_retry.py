@@ -0,0 +1,110 @@
+import asyncio
+import time
+from email.utils import formatdate
+
+import pytest
+
+from utils import retry
+from utils.retry import RetryPolicy, parse_retry_after
+
+
+class FlakyError(Exception):
+
+    def __init__(self, retry_after: float | None = None):
+        super().__init__()
+        self.retry_after = retry_after
+
+
+def is_flaky_error(error: Exception) -> bool:
+    return isinstance(error, FlakyError)
+
+
+@pytest.fixture
+def delays(monkeypatch) -> list[float]:
+    delays = []
+
+    async def sleep(delay: float):
+        delays.append(delay)
+
+    monkeypatch.setattr(retry.asyncio, 'sleep', sleep)
+    return delays
+
+
+def test_only_failed_items_are_retried(delays):
+    item_to_calls_count = {item: 0 for item in range(5)}
+
+    async def call(item: int) -> int:
+        item_to_calls_count[item] += 1
+        if item % 2 and item_to_calls_count[item] < 3:
+            raise FlakyError
+        return item
+
+    policy = RetryPolicy(max_attempts=3, base_delay=0.1, max_delay=1, max_total_delay=10)
+    results, failed = asyncio.run(policy.run_many(range(5), call, is_flaky_error))
+    assert sorted(results) == [0, 1, 2, 3, 4]
+    assert failed == []
+    assert item_to_calls_count == {0: 1, 1: 3, 2: 1, 3: 3, 4: 1}
+    assert len(delays) == 2
+
+
+def test_items_failed_after_max_attempts_are_returned(delays):
+    calls_count = 0
+
+    async def call(item: int) -> int:
+        nonlocal calls_count
+        calls_count += 1
+        raise FlakyError
+
+    policy = RetryPolicy(max_attempts=3, base_delay=0.1, max_delay=1, max_total_delay=10)
+    results, failed = asyncio.run(policy.run_many([389], call, is_flaky_error))
+    assert results == []
+    assert [item for item, _ in failed] == [389]
+    assert calls_count == 3
+
+
+def test_not_retryable_error_is_not_retried(delays):
+    calls_count = 0
+
+    async def call(item: int) -> int:
+        nonlocal calls_count
+        calls_count += 1
+        raise ValueError
+
+    policy = RetryPolicy(max_attempts=3, base_delay=0.1, max_delay=1, max_total_delay=10)
+    results, failed = asyncio.run(policy.run_many([389], call, is_flaky_error))
+    assert [item for item, _ in failed] == [389]
+    assert calls_count == 1
+    assert delays == []
+
+
+def test_retry_after_is_honored_within_budget(delays):
+
+    async def call(item: float) -> int:
+        raise FlakyError(retry_after=item)
+
+    policy = RetryPolicy(max_attempts=5, base_delay=0.1, max_delay=1, max_total_delay=10)
+    results, failed = asyncio.run(policy.run_many([4], call, is_flaky_error))
+    assert delays == [4, 4]
+    assert len(failed) == 1
+
+
+def test_backoff_is_capped():
+    policy = RetryPolicy(max_attempts=10, base_delay=0.5, max_delay=2, max_total_delay=60)
+    assert all(0 <= policy.get_delay(1) <= 0.5 for _ in range(100))
+    assert all(0 <= policy.get_delay(8) <= 2 for _ in range(100))
+
+
+@pytest.mark.parametrize(
+    'value,expected',
+    [
+        (None, None),
+        ('120', 120),
+        ('soon', None),
+    ]
+)
+def test_parse_retry_after(value, expected):
+    assert parse_retry_after(value) == expected
+
+
+def test_parse_retry_after_http_date():
+    assert 25 < parse_retry_after(formatdate(time.time() + 30, usegmt=True)) <= 30
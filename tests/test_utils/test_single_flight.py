@@ -0,0 +1,56 @@
+import asyncio
+
+import pytest
+
+from utils.single_flight import SingleFlight
+
+
+def test_concurrent_calls_are_coalesced():
+    calls_count = 0
+
+    async def fetch():
+        nonlocal calls_count
+        calls_count += 1
+        await asyncio.sleep(0.01)
+        return calls_count
+
+    async def main():
+        single_flight = SingleFlight()
+        results = await asyncio.gather(*[single_flight.do(('kitchen_statistics', 389), fetch) for _ in range(20)])
+        assert len(single_flight) == 0
+        return results
+
+    assert asyncio.run(main()) == [1] * 20
+    assert calls_count == 1
+
+
+def test_exception_is_propagated_to_all_callers():
+
+    async def fetch():
+        await asyncio.sleep(0.01)
+        raise ValueError
+
+    async def main():
+        single_flight = SingleFlight()
+        return await asyncio.gather(*[single_flight.do('key', fetch) for _ in range(3)], return_exceptions=True)
+
+    assert all(isinstance(result, ValueError) for result in asyncio.run(main()))
+
+
+def test_cancelled_caller_does_not_cancel_call():
+
+    async def fetch():
+        await asyncio.sleep(0.02)
+        return 'done'
+
+    async def main():
+        single_flight = SingleFlight()
+        first = asyncio.create_task(single_flight.do('key', fetch))
+        second = asyncio.create_task(single_flight.do('key', fetch))
+        await asyncio.sleep(0.005)
+        first.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        return await second
+
+    assert asyncio.run(main()) == 'done'